@@ -11,9 +11,10 @@ import json
 import re
 import hashlib
 import logging
+import threading
 from pathlib import Path
 from typing import Any
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, OrderedDict
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,9 @@ GROUND_TRUTH_PATH = ROOT / "backend" / "data" / "ground_truth.jsonl"
 # Text normalization
 WS_RE = re.compile(r"\s+")
 
+# Recent queries kept per retriever (chunk retries, repeated invalid-tag texts)
+QUERY_CACHE_SIZE = 256
+
 
 class GroundedRetriever:
     """
@@ -44,6 +48,10 @@ class GroundedRetriever:
         self.idf_scores: dict[str, float] = {}
         self.example_vectors: list[dict[str, float]] = []
 
+        # LRU of recent query results; classifier chunks may query concurrently
+        self._query_cache: OrderedDict[tuple, list[dict[str, Any]]] = OrderedDict()
+        self._query_lock = threading.Lock()
+
         self._load_dataset()
         self._build_index()
 
@@ -203,6 +211,93 @@ class GroundedRetriever:
             logger.warning("No ground truth examples loaded")
             return []
 
+        key = self._query_key(text, k, doc_id, zone, canonical_tag)
+        cached = self._cached_query(key)
+        if cached is None:
+            cached = self._search(text, k, doc_id, zone, canonical_tag)
+            self._store_query(key, cached)
+
+        # Callers get their own copies, as from a fresh search
+        return [example.copy() for example in cached]
+
+    def retrieve_examples_batch(
+        self,
+        texts: list[str],
+        zones: list[str | None] | None = None,
+        k: int = 8,
+        doc_id: str | None = None
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Retrieve top-k examples for several texts at once.
+
+        Same results as calling retrieve_examples() per text, but identical
+        (text, zone) queries are searched once and all cache misses are scored
+        in a single pass over the dataset.
+
+        Args:
+            texts: Target texts
+            zones: Optional zone filter per text (same length as texts)
+            k: Number of examples to retrieve per text
+            doc_id: Optional document ID for same-book preference
+
+        Returns:
+            One list of similar examples per text, in input order
+        """
+        if not self.examples:
+            logger.warning("No ground truth examples loaded")
+            return [[] for _ in texts]
+
+        zones = zones if zones is not None else [None] * len(texts)
+        found: dict[tuple, list[dict[str, Any]]] = {}
+        misses: dict[tuple, tuple[str, str | None]] = {}
+        for text, zone in zip(texts, zones):
+            key = self._query_key(text, k, doc_id, zone, None)
+            if key in found or key in misses:
+                continue
+            cached = self._cached_query(key)
+            if cached is None:
+                misses[key] = (text, zone)
+            else:
+                found[key] = cached
+
+        if misses:
+            searched = self._search_many(list(misses.values()), k, doc_id)
+            for key, cached in zip(misses, searched):
+                self._store_query(key, cached)
+                found[key] = cached
+
+        return [
+            [example.copy() for example in found[self._query_key(text, k, doc_id, zone, None)]]
+            for text, zone in zip(texts, zones)
+        ]
+
+    @staticmethod
+    def _query_key(text: str, k: int, doc_id: str | None, zone: str | None, canonical_tag: str | None) -> tuple:
+        text_hash = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        return (text_hash, k, doc_id, zone, canonical_tag)
+
+    def _cached_query(self, key: tuple) -> list[dict[str, Any]] | None:
+        with self._query_lock:
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+        return cached
+
+    def _store_query(self, key: tuple, cached: list[dict[str, Any]]) -> None:
+        with self._query_lock:
+            self._query_cache[key] = cached
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+
+    def _search(
+        self,
+        text: str,
+        k: int,
+        doc_id: str | None,
+        zone: str | None,
+        canonical_tag: str | None
+    ) -> list[dict[str, Any]]:
+        """Similarity search behind retrieve_examples (uncached)."""
         # Build query vector
         query_vec = self._build_query_vector(text)
 
@@ -246,6 +341,61 @@ class GroundedRetriever:
 
         return results
 
+    def _search_many(
+        self,
+        queries: list[tuple[str, str | None]],
+        k: int,
+        doc_id: str | None
+    ) -> list[list[dict[str, Any]]]:
+        """
+        _search() for several (text, zone) queries in one pass over the examples.
+
+        Each example's vector magnitude and same-book boost are computed once
+        for all queries instead of once per query.
+        """
+        query_vecs = [self._build_query_vector(text) for text, _ in queries]
+        query_mags = [sum(v * v for v in vec.values()) ** 0.5 for vec in query_vecs]
+        active = [i for i, vec in enumerate(query_vecs) if vec]
+        similarities: list[list[tuple[float, int]]] = [[] for _ in queries]
+        book = doc_id.split("_")[0] if doc_id else None
+
+        for i, example in enumerate(self.examples):
+            example_vec = self.example_vectors[i]
+            example_mag = sum(v * v for v in example_vec.values()) ** 0.5
+            same_book = book is not None and example.get("doc_id", "").startswith(book)
+            example_zone = example.get("zone")
+            for q in active:
+                zone = queries[q][1]
+                if zone and example_zone != zone:
+                    continue
+                query_vec = query_vecs[q]
+                if not example_vec or query_mags[q] == 0 or example_mag == 0:
+                    score = 0.0
+                else:
+                    dot_product = sum(
+                        query_vec.get(token, 0.0) * example_vec.get(token, 0.0)
+                        for token in query_vec.keys() & example_vec.keys()
+                    )
+                    score = dot_product / (query_mags[q] * example_mag)
+                if same_book:
+                    score *= 1.2  # 20% boost for same book
+                similarities[q].append((score, i))
+
+        results = []
+        for q, vec in enumerate(query_vecs):
+            if not vec:
+                # Fallback to random diverse examples
+                results.append(self._get_diverse_examples(k))
+                continue
+            top_k = sorted(similarities[q], reverse=True)[:k]
+            found = []
+            for score, idx in top_k:
+                example = self.examples[idx].copy()
+                example["similarity_score"] = round(score, 4)
+                found.append(example)
+            results.append(found)
+        return results
+
     def _get_diverse_examples(self, k: int) -> list[dict[str, Any]]:
         """Get diverse examples when no good matches found."""
         if not self.examples:
@@ -11,6 +11,9 @@ import hashlib
 import json
 import logging
 import re
+import sqlite3
+import threading
+import time
 from pathlib import Path
 from typing import Any
 from datetime import datetime, timedelta
@@ -21,6 +24,9 @@ logger = logging.getLogger(__name__)
 ROOT = Path(__file__).resolve().parents[3]
 CACHE_DIR = ROOT / "backend" / "data" / "_prediction_cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
+CONTENT_DB_NAME = "content_cache.sqlite3"
+# Keys per SELECT ... IN (...) (stays under SQLite's host parameter limit)
+CONTENT_QUERY_BATCH = 500
 
 # Text normalization for cache keys
 WS_RE = re.compile(r"\s+")
@@ -31,8 +37,13 @@ class PredictionCache:
     """
     Simple file-based cache for LLM predictions.
 
-    Cache key: hash(doc_id + para_index + normalized_text + zone)
+    Cache key: hash(doc_id + para_index + text_hash + zone), where text_hash
+    is a 64-bit digest of the normalized text
     Cache value: {tag, confidence, timestamp}
+
+    A second, content-addressed layer (sqlite) is keyed only on zone,
+    normalized text and list/table signature, so boilerplate repeated
+    across documents (copyright lines, running heads) is classified once.
     """
 
     def __init__(self, cache_dir: Path | None = None, ttl_days: int = 30):
@@ -50,9 +61,14 @@ class PredictionCache:
         # In-memory cache for current session
         self.memory_cache: dict[str, dict[str, Any]] = {}
 
+        # Content-addressed store, opened on first use
+        self._content_db: sqlite3.Connection | None = None
+        self._content_lock = threading.Lock()
+
         # Stats
         self.hits = 0
         self.misses = 0
+        self.content_hits = 0
 
         logger.info(f"Initialized prediction cache at {self.cache_dir} (TTL: {ttl_days} days)")
 
@@ -64,18 +80,26 @@ class PredictionCache:
         text = WS_RE.sub(" ", text).strip().lower()
         return text
 
+    def text_hash(self, text: str) -> str:
+        """
+        Fixed-size digest of the normalized text (8-byte blake2b, hex).
+
+        Both cache layers key on this digest instead of the text itself;
+        callers that look up and then store the same paragraph compute it
+        once and pass it to the batch methods.
+        """
+        return hashlib.blake2b(self._normalize_text(text).encode(), digest_size=8).hexdigest()
+
     def _generate_key(
         self,
         doc_id: str,
         para_index: int,
-        text: str,
+        text_hash: str,
         zone: str = "BODY"
     ) -> str:
         """Generate cache key from inputs."""
-        normalized = self._normalize_text(text)
-
         # Create composite key
-        key_data = f"{doc_id}:{para_index}:{normalized}:{zone}"
+        key_data = f"{doc_id}:{para_index}:{text_hash}:{zone}"
 
         # Hash for compact key
         key_hash = hashlib.sha256(key_data.encode()).hexdigest()[:16]
@@ -95,7 +119,17 @@ class PredictionCache:
         Returns:
             Cached prediction dict or None if not found/expired
         """
-        key = self._generate_key(doc_id, para_index, text, zone)
+        return self._get(doc_id, para_index, self.text_hash(text), zone)
+
+    def _get(
+        self,
+        doc_id: str,
+        para_index: int,
+        text_hash: str,
+        zone: str
+    ) -> dict[str, Any] | None:
+        """Look up one entry by its text digest."""
+        key = self._generate_key(doc_id, para_index, text_hash, zone)
 
         # Check memory cache first
         if key in self.memory_cache:
@@ -130,6 +164,22 @@ class PredictionCache:
         self.misses += 1
         return None
 
+    def get_many(
+        self,
+        keys: list[tuple[str, int, str, str]]
+    ) -> list[dict[str, Any] | None]:
+        """
+        Get cached predictions for several paragraphs.
+
+        Args:
+            keys: (doc_id, para_index, text_hash, zone) tuples, with
+                text_hash from text_hash()
+
+        Returns:
+            One cached prediction (or None) per key, in order
+        """
+        return [self._get(doc_id, para_index, text_hash, zone) for doc_id, para_index, text_hash, zone in keys]
+
     def set(
         self,
         doc_id: str,
@@ -148,27 +198,160 @@ class PredictionCache:
             prediction: Prediction dict with tag, confidence, etc.
             zone: Context zone
         """
-        key = self._generate_key(doc_id, para_index, text, zone)
+        self.set_many([(doc_id, para_index, self.text_hash(text), prediction, zone)])
 
-        entry = {
-            "prediction": prediction,
-            "timestamp": datetime.now().isoformat(),
-            "doc_id": doc_id,
-            "para_index": para_index,
-            "zone": zone
-        }
+    def set_many(self, entries: list[tuple[str, int, str, dict[str, Any], str]]):
+        """
+        Cache several predictions.
+
+        Args:
+            entries: (doc_id, para_index, text_hash, prediction, zone) tuples,
+                with text_hash from text_hash()
+        """
+        timestamp = datetime.now().isoformat()
+        for doc_id, para_index, text_hash, prediction, zone in entries:
+            key = self._generate_key(doc_id, para_index, text_hash, zone)
+            entry = {
+                "prediction": prediction,
+                "timestamp": timestamp,
+                "doc_id": doc_id,
+                "para_index": para_index,
+                "zone": zone
+            }
+
+            # Save to memory cache
+            self.memory_cache[key] = entry
+
+            # Save to disk cache
+            cache_file = self.cache_dir / f"{key}.json"
+            try:
+                with open(cache_file, "w", encoding="utf-8") as f:
+                    json.dump(entry, f, ensure_ascii=False)
+                logger.debug(f"Cached prediction for {doc_id}:{para_index}")
+            except Exception as e:
+                logger.warning(f"Failed to write cache entry {key}: {e}")
+
+    def _content_key(self, text_hash: str, zone: str, metadata: dict | None) -> str:
+        """Generate a document-independent key from text digest, zone and list/table signature."""
+        meta = metadata or {}
+        signature = (
+            f"{int(bool(meta.get('has_bullet')))}"
+            f"{int(bool(meta.get('has_numbering')))}"
+            f"{int(bool(meta.get('is_table')))}"
+            f":{meta.get('list_position') or ''}"
+        )
+        key_data = f"{zone}|{text_hash}|{signature}"
+        return hashlib.blake2b(key_data.encode(), digest_size=16).hexdigest()
+
+    def _content_conn(self) -> sqlite3.Connection:
+        """Open (once) the sqlite content store."""
+        if self._content_db is None:
+            conn = sqlite3.connect(
+                str(self.cache_dir / CONTENT_DB_NAME), check_same_thread=False
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, tag TEXT, confidence INTEGER, created REAL)"
+            )
+            self._content_db = conn
+        return self._content_db
+
+    def get_by_content(
+        self,
+        text: str,
+        zone: str = "BODY",
+        metadata: dict | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Look up a prediction for identical content from any document.
+
+        Returns:
+            {tag, confidence} or None if not found/expired
+        """
+        return self.get_many_by_content([(self.text_hash(text), zone, metadata)])[0]
 
-        # Save to memory cache
-        self.memory_cache[key] = entry
+    def get_many_by_content(
+        self,
+        entries: list[tuple[str, str, dict | None]]
+    ) -> list[dict[str, Any] | None]:
+        """
+        Look up several paragraphs by content with batched queries.
 
-        # Save to disk cache
-        cache_file = self.cache_dir / f"{key}.json"
+        Args:
+            entries: (text_hash, zone, metadata) tuples
+
+        Returns:
+            One {tag, confidence} (or None) per entry, in order
+        """
+        keys = [self._content_key(text_hash, zone, metadata) for text_hash, zone, metadata in entries]
+        unique_keys = list(dict.fromkeys(keys))
+        rows: dict[str, tuple] = {}
         try:
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(entry, f, ensure_ascii=False)
-            logger.debug(f"Cached prediction for {doc_id}:{para_index}")
-        except Exception as e:
-            logger.warning(f"Failed to write cache entry {key}: {e}")
+            with self._content_lock:
+                conn = self._content_conn()
+                for start in range(0, len(unique_keys), CONTENT_QUERY_BATCH):
+                    batch = unique_keys[start:start + CONTENT_QUERY_BATCH]
+                    placeholders = ",".join("?" * len(batch))
+                    for key, tag, confidence, created in conn.execute(
+                        f"SELECT key, tag, confidence, created FROM cache WHERE key IN ({placeholders})",
+                        batch,
+                    ):
+                        rows[key] = (tag, confidence, created)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read content cache: {e}")
+            return [None] * len(entries)
+
+        cutoff = time.time() - self.ttl_days * 86400
+        found: list[dict[str, Any] | None] = []
+        for key in keys:
+            row = rows.get(key)
+            if row is None or row[2] <= cutoff:
+                found.append(None)
+                continue
+            self.content_hits += 1
+            found.append({"tag": row[0], "confidence": row[1]})
+        return found
+
+    def set_by_content(
+        self,
+        text: str,
+        prediction: dict[str, Any],
+        zone: str = "BODY",
+        metadata: dict | None = None
+    ):
+        """Store a prediction under its content key."""
+        self.set_many_by_content([(self.text_hash(text), prediction, zone, metadata)])
+
+    def set_many_by_content(self, entries: list[tuple[str, dict[str, Any], str, dict | None]]):
+        """
+        Store several predictions under their content keys in one transaction.
+
+        Args:
+            entries: (text_hash, prediction, zone, metadata) tuples
+        """
+        now = time.time()
+        rows = [
+            (
+                self._content_key(text_hash, zone, metadata),
+                prediction["tag"],
+                int(prediction.get("confidence", 0) or 0),
+                now,
+            )
+            for text_hash, prediction, zone, metadata in entries
+            if prediction.get("tag")
+        ]
+        if not rows:
+            return
+        try:
+            with self._content_lock:
+                conn = self._content_conn()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, tag, confidence, created) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write content cache: {e}")
 
     def _is_valid(self, entry: dict[str, Any]) -> bool:
         """Check if cache entry is still valid (not expired)."""
@@ -188,6 +371,15 @@ class PredictionCache:
         # Clear memory
         self.memory_cache.clear()
 
+        # Clear content store
+        try:
+            with self._content_lock:
+                conn = self._content_conn()
+                conn.execute("DELETE FROM cache")
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to clear content cache: {e}")
+
         # Clear disk
         for cache_file in self.cache_dir.glob("*.json"):
             try:
@@ -207,6 +399,7 @@ class PredictionCache:
         return {
             "hits": self.hits,
             "misses": self.misses,
+            "content_hits": self.content_hits,
             "total_queries": total,
             "hit_rate": f"{hit_rate:.1f}%",
             "memory_entries": len(self.memory_cache),
@@ -24,6 +24,8 @@ _XML_TAG_RE = re.compile(r"</?[A-Za-z][A-Za-z0-9_-]*>")
 
 def _strip_tags(text: str) -> str:
     """Strip XML-like formatting tags from text for heading matching."""
+    if "<" not in text:
+        return text.strip()
     return _XML_TAG_RE.sub("", text).strip()
 
 
@@ -40,6 +42,11 @@ HEADING_MATCHES = {
     "cited references",
 }
 
+# Any heading token appearing inside a compact heading line (longest first)
+_HEADING_SUBSTR_RE = re.compile(
+    "|".join(re.escape(t) for t in sorted(HEADING_MATCHES, key=len, reverse=True))
+)
+
 # Secondary headings that suggest reference zone (must be near end of document)
 SECONDARY_HEADINGS = {
     "sources",
@@ -55,6 +62,10 @@ CITATION_START_PATTERNS = [
     re.compile(r"^\s*[A-Z][a-z]+\s+et\s+al\.?\s*\(?\d{4}\)?"),  # Smith et al. (2020)
 ]
 
+# Every citation start pattern begins with "[", a digit, or a capital letter
+# after leading whitespace; used to skip the regexes for other lines.
+_CITATION_FIRST_CHARS = frozenset("[0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
 # Reference content patterns (must have multiple to count as citation)
 REFERENCE_FEATURES = [
     (re.compile(r"\bet\s+al\.?\b"), "has_et_al"),
@@ -66,13 +77,15 @@ REFERENCE_FEATURES = [
 ]
 
 # Patterns for detecting zone exit (non-reference structural elements)
-# Opening tags for headings, boxes, tables signal a new section
-_ZONE_EXIT_TAG_RE = re.compile(
-    r"<(?!/)(H[1-6]|BX|NBX|TAB)",
+# Opening tags for headings, boxes, tables (H1-H6, BX, NBX, TAB) signal a new
+# section; reference-related tags (REF, SR, BIBLIO) should NOT trigger zone
+# exit.  Both families share one alternation so a block is scanned once; no
+# alternative is a prefix of another (BIBLIO and BX part at the second
+# letter), so each "<" matches at most one.
+_STRUCTURAL_TAG_RE = re.compile(
+    r"<(?!/)(?:(?P<ref>REF|SR|BIBLIO)|(?P<exit>H[1-6]|BX|NBX|TAB))",
     re.IGNORECASE,
 )
-# Reference-related tags should NOT trigger zone exit
-_REF_ZONE_TAG_RE = re.compile(r"<(?!/)(REF|SR|BIBLIO)", re.IGNORECASE)
 
 
 def _looks_like_citation(text: str, strict: bool = True) -> bool:
@@ -90,8 +103,10 @@ def _looks_like_citation(text: str, strict: bool = True) -> bool:
     if not t or len(t) < 20:  # Citations are typically longer
         return False
 
-    # Check for citation start patterns
-    has_citation_start = any(pat.search(t) for pat in CITATION_START_PATTERNS)
+    # Check for citation start patterns (cheap first-char gate before regex)
+    has_citation_start = t[0] in _CITATION_FIRST_CHARS and any(
+        pat.search(t) for pat in CITATION_START_PATTERNS
+    )
 
     # Count reference features present
     feature_count = sum(1 for pat, _ in REFERENCE_FEATURES if pat.search(t))
@@ -141,7 +156,7 @@ def _is_heading_start(text: str) -> bool:
         return False
     if re.search(r"[.!?;:]\s*$", cleaned):
         return False
-    return any(token in cleaned for token in HEADING_MATCHES)
+    return _HEADING_SUBSTR_RE.search(cleaned) is not None
 
 
 def _is_secondary_heading(text: str) -> bool:
@@ -156,13 +171,15 @@ def _signals_zone_exit(text: str) -> bool:
     Detects opening XML tags for headings (H1-H6), boxes (BX, NBX), and
     tables (TAB) that are NOT reference-related (REF, SR, BIBLIO).
     """
-    stripped = text.strip()
-    if not stripped:
+    if "<" not in text:
         return False
-    # Has a non-reference structural opening tag
-    if _ZONE_EXIT_TAG_RE.search(stripped) and not _REF_ZONE_TAG_RE.search(stripped):
-        return True
-    return False
+    # Has a non-reference structural opening tag and no reference tag
+    has_exit_tag = False
+    for m in _STRUCTURAL_TAG_RE.finditer(text):
+        if m.lastgroup == "ref":
+            return False
+        has_exit_tag = True
+    return has_exit_tag
 
 
 def _has_any_reference_feature(text: str) -> bool:
@@ -205,9 +222,17 @@ def _find_zone_end(blocks: list[dict], start_idx: int, strong_trigger: bool = Fa
     non_citation_streak = 0
     streak_threshold = 15 if strong_trigger else 12
 
+    # Resolve the per-block check once instead of branching on every block:
+    # strong triggers use the lenient feature check, weak triggers the full
+    # citation-pattern check.
+    if strong_trigger:
+        is_ref_like_fn = _has_any_reference_feature
+    else:
+        def is_ref_like_fn(t: str) -> bool:
+            return _looks_like_citation(t, strict=False)
+
     for idx in range(start_idx + 1, total):
-        text = blocks[idx].get("text", "")
-        stripped = text.strip()
+        stripped = blocks[idx].get("text", "").strip()
 
         # Primary signal: structural break via XML tags
         if _signals_zone_exit(stripped):
@@ -221,14 +246,7 @@ def _find_zone_end(blocks: list[dict], start_idx: int, strong_trigger: bool = Fa
         if not stripped or len(stripped) < 10:
             continue
 
-        # For strong triggers, use lenient feature check;
-        # for weak triggers, use full citation-pattern check
-        if strong_trigger:
-            is_ref_like = _has_any_reference_feature(stripped)
-        else:
-            is_ref_like = _looks_like_citation(stripped, strict=False)
-
-        if is_ref_like:
+        if is_ref_like_fn(stripped):
             seen_citations += 1
             non_citation_streak = 0
         else:
@@ -271,6 +289,9 @@ def detect_reference_zone(blocks: list[dict]) -> tuple[set[int], str, int | None
     total = len(blocks)
 
     # STRATEGY 1: Explicit heading match (highly reliable)
+    # Secondary heading positions are recorded on the same pass so that
+    # STRATEGY 2 only has to validate those indices.
+    secondary_indices: list[int] = []
     for idx, b in enumerate(blocks):
         text = b.get("text", "")
         if _is_heading_start(text):
@@ -278,27 +299,29 @@ def detect_reference_zone(blocks: list[dict]) -> tuple[set[int], str, int | None
             trigger_reason = "heading_match"
             logger.info(f"Reference zone triggered by heading at index {idx}: '{text.strip()}'")
             break
+        if _is_secondary_heading(text):
+            secondary_indices.append(idx)
 
     # STRATEGY 2: Secondary heading + validation (near end of document)
     if start_idx is None and total > 0:
         min_start = int(total * 0.75)  # Only look in last 25% of document
 
-        for idx in range(min_start, total):
-            text = blocks[idx].get("text", "")
-
-            if _is_secondary_heading(text):
-                # Found secondary heading, validate next few blocks
-                next_blocks = blocks[idx + 1:min(idx + 6, total)]
-                citation_count = sum(
-                    1 for b in next_blocks
-                    if _looks_like_citation(b.get("text", ""), strict=True)
-                )
-
-                if citation_count >= 3:  # At least 3 of next 5 blocks look like citations
-                    start_idx = idx
-                    trigger_reason = "secondary_heading_validated"
-                    logger.info(f"Reference zone triggered by secondary heading at index {idx}: '{text.strip()}'")
-                    break
+        for idx in secondary_indices:
+            if idx < min_start:
+                continue
+            # Found secondary heading, validate next few blocks
+            next_blocks = blocks[idx + 1:min(idx + 6, total)]
+            citation_count = sum(
+                1 for b in next_blocks
+                if _looks_like_citation(b.get("text", ""), strict=True)
+            )
+
+            if citation_count >= 3:  # At least 3 of next 5 blocks look like citations
+                start_idx = idx
+                trigger_reason = "secondary_heading_validated"
+                text = blocks[idx].get("text", "")
+                logger.info(f"Reference zone triggered by secondary heading at index {idx}: '{text.strip()}'")
+                break
 
     # STRATEGY 3: Strict pattern matching (very conservative, only as last resort)
     # DISABLED by default to avoid false positives
@@ -4,10 +4,35 @@ Reviewer bundle export.
 
 from __future__ import annotations
 
+import heapq
 import json
+import shutil
 import zipfile
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _dump_json(payload) -> bytes | str:
+    """Serialize *payload* as indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, indent=2)
+
+
+_COPY_BUFSIZE = 1 << 20
+
+
+def _write_stored(zf: zipfile.ZipFile, src_path: str, arcname: str) -> None:
+    """Stream *src_path* into *zf* uncompressed using a 1 MiB copy buffer."""
+    zinfo = zipfile.ZipInfo.from_file(src_path, arcname)
+    zinfo.compress_type = zipfile.ZIP_STORED
+    with open(src_path, "rb", buffering=_COPY_BUFSIZE) as src, zf.open(zinfo, "w") as dst:
+        shutil.copyfileobj(src, dst, length=_COPY_BUFSIZE)
+
 
 def _decision_preview(text: str, limit: int = 160) -> str:
     text = (text or "").strip()
@@ -41,24 +66,26 @@ def create_review_bundle(
 
     quality_payload = quality_metrics
 
-    suspicious = sorted(
+    suspicious = heapq.nsmallest(
+        50,
         decisions_payload,
         key=lambda x: (x.get("confidence", 1), 0 if x.get("tag") == "TXT" else 1),
-    )[:50]
-
-    diff_hint_lines = []
-    for item in suspicious:
-        diff_hint_lines.append(
-            f"{item.get('id')}\t{item.get('tag')}\t{item.get('confidence')}\t{item.get('repair_reason')}\t{item.get('text_preview')}"
-        )
+    )
 
-    diff_hint_text = "\n".join(diff_hint_lines)
+    diff_hint_text = "\n".join(
+        f"{item.get('id')}\t{item.get('tag')}\t{item.get('confidence')}\t{item.get('repair_reason')}\t{item.get('text_preview')}"
+        for item in suspicious
+    )
 
-    with zipfile.ZipFile(bundle_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        zf.write(input_docx_path, "input_original.docx")
-        zf.write(output_docx_path, "output_tagged.docx")
-        zf.writestr("decisions.json", json.dumps(decisions_payload, indent=2))
-        zf.writestr("quality_report.json", json.dumps(quality_payload, indent=2))
+    # DOCX files are already deflated zip archives, so store them as-is;
+    # text entries get a fast, light deflate.
+    with zipfile.ZipFile(
+        bundle_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1
+    ) as zf:
+        _write_stored(zf, input_docx_path, "input_original.docx")
+        _write_stored(zf, output_docx_path, "output_tagged.docx")
+        zf.writestr("decisions.json", _dump_json(decisions_payload))
+        zf.writestr("quality_report.json", _dump_json(quality_payload))
         zf.writestr("diff_hint.txt", diff_hint_text)
 
     return str(bundle_path)
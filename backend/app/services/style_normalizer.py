@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import re
+import sys
 import json
+from functools import lru_cache
 from pathlib import Path
 from difflib import SequenceMatcher
 
@@ -18,8 +20,20 @@ VENDOR_BX_RE = re.compile(r"^[A-Z]{2,}[-_]?BX[-_](.+)$")
 
 # Illegal prefixes that should be stripped (except SK_H1-SK_H6 and TBL-H1-TBL-H6 which map to TH1-TH6)
 ILLEGAL_PREFIXES = ["BX4-", "NBX1-"]
-SK_H_PATTERN = re.compile(r"^SK_H([1-6])$")
-TBL_H_PATTERN = re.compile(r"^TBL-H([1-6])$")
+HEADING_LEVEL_DIGITS = "123456"
+# Distinct (name, box_prefix) inputs per run are few: model tags and source
+# style names.  Cached because membership enforcement scores every allowed style.
+NORMALIZE_CACHE_SIZE = 4096
+
+
+def _is_sk_h(text: str) -> bool:
+    """True for SK_H1-SK_H6 (plain length/prefix/char test, no regex)."""
+    return len(text) == 5 and text.startswith("SK_H") and text[4] in HEADING_LEVEL_DIGITS
+
+
+def _is_tbl_h(text: str) -> bool:
+    """True for TBL-H1-TBL-H6 (plain length/prefix/char test, no regex)."""
+    return len(text) == 6 and text.startswith("TBL-H") and text[5] in HEADING_LEVEL_DIGITS
 
 
 def _load_aliases() -> dict[str, str]:
@@ -137,7 +151,15 @@ def normalize_style(name: str, meta: dict | None = None, enforce_membership: boo
     """
     if name is None:
         return ""
-    text = str(name).strip().replace(NBSP, " ")
+    # Only box_prefix is read from meta, so it is the only part of the cache key
+    box_prefix = meta.get("box_prefix") if meta and isinstance(meta, dict) else None
+    return _normalize_style_cached(str(name), box_prefix, enforce_membership)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_style_cached(name: str, box_prefix: str | None, enforce_membership: bool) -> str:
+    """normalize_style() proper, memoized on its effective inputs."""
+    text = name.strip().replace(NBSP, " ")
     # Collapse internal whitespace
     text = re.sub(r"\s+", " ", text)
 
@@ -153,21 +175,19 @@ def normalize_style(name: str, meta: dict | None = None, enforce_membership: boo
         text = text.upper()
 
     # Strip vendor prefixes like EFP_, EYU_, etc. (non-BX)
-    if not re.match(r"^SK_H[1-6]$", text):
+    if not _is_sk_h(text):
         vendor_match = VENDOR_PREFIX_RE.match(text)
         if vendor_match:
             text = vendor_match.group(1)
 
     # Strip illegal prefixes and map special heading patterns
     # SK_H1-SK_H6 → TH1-TH6 (table headings)
-    sk_h_match = SK_H_PATTERN.match(text)
-    if sk_h_match:
-        text = f"TH{sk_h_match.group(1)}"
+    if _is_sk_h(text):
+        text = f"TH{text[4]}"
     else:
         # TBL-H1-TBL-H6 → TH1-TH6 (table headings)
-        tbl_h_match = TBL_H_PATTERN.match(text)
-        if tbl_h_match:
-            text = f"TH{tbl_h_match.group(1)}"
+        if _is_tbl_h(text):
+            text = f"TH{text[5]}"
         else:
             # Strip other illegal prefixes
             for prefix in ILLEGAL_PREFIXES:
@@ -180,12 +200,7 @@ def normalize_style(name: str, meta: dict | None = None, enforce_membership: boo
 
     # Apply box prefix expansion if provided
     if text.startswith("BX-"):
-        box_prefix = None
-        if meta and isinstance(meta, dict):
-            box_prefix = meta.get("box_prefix")
-        if not box_prefix:
-            box_prefix = DEFAULT_BOX_PREFIX
-        text = f"{box_prefix}-{text[3:]}"
+        text = f"{box_prefix or DEFAULT_BOX_PREFIX}-{text[3:]}"
 
     # Remove illegal list-position suffixes on non-list bases
     for suffix in LIST_SUFFIXES:
@@ -200,7 +215,8 @@ def normalize_style(name: str, meta: dict | None = None, enforce_membership: boo
         if text not in _ALLOWED_STYLES:
             text = _find_closest_style(text, _ALLOWED_STYLES)
 
-    return text
+    # Intern: the result is one of a small set of style names reused per paragraph
+    return sys.intern(text)
 
 
 def normalize_tag(tag: str, meta: dict | None = None) -> str:
@@ -6,10 +6,15 @@ Builds block-level records with structural features for lists, tables, captions,
 from __future__ import annotations
 
 import re
+import sys
+from collections import namedtuple
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 
 from .ingestion import extract_document, BOX_TYPE_MAPPING, BOX_START_PATTERNS, BOX_END_PATTERNS
+from .regex_registry import compile_pattern
 
 
 FIGURE_CAPTION_PATTERNS = [
@@ -43,56 +48,129 @@ BOX_TITLE_PATTERNS = [
 ]
 
 
-def _is_box_marker(text: str) -> Optional[str]:
-    text_lower = text.lower().strip()
-    for pattern in BOX_START_PATTERNS:
-        if re.match(pattern, text_lower, re.IGNORECASE):
-            return "start"
-    for pattern in BOX_END_PATTERNS:
-        if re.match(pattern, text_lower, re.IGNORECASE):
-            return "end"
-    return None
-
-
-def _detect_caption_type(text: str) -> Optional[str]:
-    text_lower = text.lower().strip()
-    for pattern in FIGURE_CAPTION_PATTERNS:
-        if re.match(pattern, text_lower, re.IGNORECASE):
-            return "figure"
-    for pattern in TABLE_CAPTION_PATTERNS:
-        if re.match(pattern, text_lower, re.IGNORECASE):
-            return "table"
-    return None
-
+_REGEX_METACHARS = frozenset(r".^$*+?{}[]\|()")
 
-def _detect_source_line(text: str) -> bool:
-    text_lower = text.lower().strip()
-    return any(re.match(p, text_lower, re.IGNORECASE) for p in SOURCE_LINE_PATTERNS)
+# Detection categories in priority order.  The patterns of different
+# categories never match the same text, so one scan can report the single
+# category that applies.
+_CATEGORY_PATTERNS = (
+    ("figure", FIGURE_CAPTION_PATTERNS),
+    ("table", TABLE_CAPTION_PATTERNS),
+    ("source", SOURCE_LINE_PATTERNS),
+    ("box_title", BOX_TITLE_PATTERNS),
+    ("box_start", BOX_START_PATTERNS),
+    ("box_end", BOX_END_PATTERNS),
+)
 
 
-def _detect_box_label(text: str) -> Optional[str]:
-    text_lower = text.lower().strip()
-    for box_type in BOX_TYPE_MAPPING.keys():
-        if text_lower == box_type:
-            return box_type
-    return None
-
+def _split_patterns(patterns: list[str]) -> tuple[tuple[str, ...], list[str]]:
+    """
+    Split anchored patterns into plain literal prefixes (checked with
+    str.startswith) and the ones that still need regex.
+    """
+    prefixes: list[str] = []
+    regexes: list[str] = []
+    for pattern in patterns:
+        body = pattern[1:]
+        if pattern.startswith("^") and not _REGEX_METACHARS.intersection(body):
+            prefixes.append(body.lower())
+        else:
+            regexes.append(pattern)
+    return tuple(prefixes), regexes
 
-def _detect_box_title(text: str) -> bool:
-    text_lower = text.lower().strip()
-    return any(re.match(p, text_lower, re.IGNORECASE) for p in BOX_TITLE_PATTERNS)
 
+def _build_lexer() -> tuple[dict[str, tuple[tuple[str, str], ...]], Optional[frozenset], re.Pattern]:
+    """
+    Build the single-scan lexer used by _match_category.
 
-def _is_list_item(metadata: dict, text: str) -> bool:
-    if metadata.get("has_bullet") or metadata.get("has_numbering") or metadata.get("has_xml_list"):
-        return True
-    # Mnemonic / lettered list heuristic: single capital letter + tab/space + text
-    if re.match(r"^[A-Z]\s+.+", text.strip()):
-        return True
-    return False
+    Returns:
+        - literal prefix table indexed by first character; each entry is an
+          ordered tuple of (prefix, category) in category priority order
+        - first characters any regex pattern can start with (None if unknown)
+        - one master regex with a named group per category
+    """
+    token_table: dict[str, list[tuple[str, str]]] = {}
+    regex_first_chars: Optional[set[str]] = set()
+    groups = []
+    for name, patterns in _CATEGORY_PATTERNS:
+        prefixes, regexes = _split_patterns(patterns)
+        for prefix in prefixes:
+            token_table.setdefault(prefix[:1], []).append((prefix, name))
+        if regexes:
+            groups.append(f"(?P<{name}>" + "|".join(f"(?:{p})" for p in regexes) + ")")
+            for pattern in regexes:
+                first = pattern[1:2] if pattern.startswith("^") else ""
+                if regex_first_chars is None or not first or first in _REGEX_METACHARS:
+                    regex_first_chars = None
+                else:
+                    regex_first_chars.add(first.lower())
+    index = {first: tuple(entries) for first, entries in token_table.items()}
+    first_chars = frozenset(regex_first_chars) if regex_first_chars is not None else None
+    return index, first_chars, compile_pattern("|".join(groups), re.IGNORECASE)
+
+
+# Compiled once at import
+_TOKEN_INDEX, _REGEX_FIRST_CHARS, _MASTER_BLOCK_RE = _build_lexer()
+
+# Mnemonic / lettered list heuristic: single capital letter + tab/space + text
+_SINGLE_CAP_RE = compile_pattern(r"^[A-Z]\s+.+")
+
+# Detection is a pure function of the lowered text; documents repeat many
+# short structural lines (captions, markers), so memoize the results.
+_DETECTOR_CACHE_SIZE = 4096
+
+# Feature values are shared interned strings, so the metadata of every block
+# references one object per value instead of a fresh string per paragraph.
+_CAPTION_FIGURE = sys.intern("figure")
+_CAPTION_TABLE = sys.intern("table")
+_BOX_START = sys.intern("start")
+_BOX_END = sys.intern("end")
+
+# category -> (caption_type, box_marker)
+_CATEGORY_FEATURES = {
+    "figure": (_CAPTION_FIGURE, None),
+    "table": (_CAPTION_TABLE, None),
+    "box_start": (None, _BOX_START),
+    "box_end": (None, _BOX_END),
+}
+_BOX_LABELS = {label: sys.intern(label) for label in BOX_TYPE_MAPPING}
+
+# Shared read-only stand-in for paragraphs without metadata
+_EMPTY_META = MappingProxyType({})
+
+_ParagraphFeatures = namedtuple(
+    "_ParagraphFeatures", "caption_type source_line box_marker box_label box_title"
+)
+
+
+def _match_category(text_lower: str) -> Optional[str]:
+    """Return the detection category of *text_lower*, or None."""
+    head = text_lower[:1]
+    for prefix, category in _TOKEN_INDEX.get(head, ()):
+        if text_lower.startswith(prefix):
+            return category
+    if _REGEX_FIRST_CHARS is not None and head not in _REGEX_FIRST_CHARS:
+        return None
+    m = _MASTER_BLOCK_RE.match(text_lower)
+    return m.lastgroup if m else None
+
+
+@lru_cache(maxsize=_DETECTOR_CACHE_SIZE)
+def _classify_paragraph(text_lower: str) -> _ParagraphFeatures:
+    """Detect caption, source-line and box features with a single scan."""
+    category = _match_category(text_lower)
+    caption_type, box_marker = _CATEGORY_FEATURES.get(category, (None, None))
+    return _ParagraphFeatures(
+        caption_type=caption_type,
+        source_line=category == "source",
+        box_marker=box_marker,
+        box_label=_BOX_LABELS.get(text_lower),
+        box_title=category == "box_title",
+    )
 
 
 def _list_kind(metadata: dict, text: str) -> Optional[str]:
+    """Return the list kind of a paragraph, or None if it is not a list item."""
     if metadata.get("has_bullet"):
         return "bullet"
     if metadata.get("has_numbering"):
@@ -100,7 +178,10 @@ def _list_kind(metadata: dict, text: str) -> Optional[str]:
     if metadata.get("has_xml_list"):
         # Ambiguous XML list; treat as unordered
         return "unordered"
-    if re.match(r"^[A-Z]\s+.+", text.strip()):
+    # Mnemonic / lettered list heuristic: single capital letter + tab/space + text.
+    # Only strip and run the regex when the text can start with [A-Z].
+    first = text[:1]
+    if first and ("A" <= first <= "Z" or first.isspace()) and _SINGLE_CAP_RE.match(text.strip()):
         return "unordered"
     return None
 
@@ -111,13 +192,19 @@ def _compute_list_positions(paragraphs: list[dict]) -> dict[int, dict]:
     Uses consecutive list items with the same list key.
     """
     positions: dict[int, dict] = {}
-    list_indices = []
+    # Each distinct list key tuple is interned to a small int so run detection
+    # compares ints; ids/keys are parallel lists (-1 marks a non-list paragraph).
+    key_ids: dict[tuple, int] = {}
+    key_tuples: list[tuple] = []
+    ids: list[int] = []
+    keys: list[int] = []
 
-    for idx, para in enumerate(paragraphs):
+    for para in paragraphs:
         text = para["text"]
-        meta = para.get("metadata", {})
-        if _is_list_item(meta, text):
-            kind = _list_kind(meta, text)
+        meta = para.get("metadata") or _EMPTY_META
+        key_id = -1
+        kind = _list_kind(meta, text)
+        if kind is not None:
             key = (
                 kind,
                 meta.get("indent_level", 0),
@@ -126,33 +213,34 @@ def _compute_list_positions(paragraphs: list[dict]) -> dict[int, dict]:
                 meta.get("table_index"),
                 meta.get("box_type"),
             )
-            list_indices.append((idx, para["id"], key))
-        else:
-            list_indices.append((idx, para["id"], None))
-
-    # Walk through and identify runs of list items with same key
-    i = 0
-    while i < len(list_indices):
-        idx, para_id, key = list_indices[i]
-        if key is None:
-            i += 1
-            continue
-        run = [para_id]
-        j = i + 1
-        while j < len(list_indices) and list_indices[j][2] == key:
-            run.append(list_indices[j][1])
-            j += 1
-
-        if len(run) == 1:
-            pos = "FIRST"
-            positions[run[0]] = {"list_position": pos, "list_kind": key[0], "list_level": key[1]}
-        else:
-            positions[run[0]] = {"list_position": "FIRST", "list_kind": key[0], "list_level": key[1]}
-            for mid_id in run[1:-1]:
-                positions[mid_id] = {"list_position": "MID", "list_kind": key[0], "list_level": key[1]}
-            positions[run[-1]] = {"list_position": "LAST", "list_kind": key[0], "list_level": key[1]}
-
-        i = j
+            key_id = key_ids.get(key)
+            if key_id is None:
+                key_id = key_ids[key] = len(key_tuples)
+                key_tuples.append(key)
+        ids.append(para["id"])
+        keys.append(key_id)
+
+    def _flush_run(start: int, stop: int) -> None:
+        kind, level = key_tuples[keys[start]][:2]
+        positions[ids[start]] = {"list_position": "FIRST", "list_kind": kind, "list_level": level}
+        last = stop - 1
+        if last == start:
+            return
+        for mid_id in ids[start + 1:last]:
+            positions[mid_id] = {"list_position": "MID", "list_kind": kind, "list_level": level}
+        positions[ids[last]] = {"list_position": "LAST", "list_kind": kind, "list_level": level}
+
+    # Single forward pass: emit each run of equal list keys on key transition
+    run_start = 0
+    prev_key = -1
+    for idx, key_id in enumerate(keys):
+        if key_id != prev_key:
+            if prev_key >= 0:
+                _flush_run(run_start, idx)
+            run_start = idx
+            prev_key = key_id
+    if prev_key >= 0:
+        _flush_run(run_start, len(keys))
 
     return positions
 
@@ -165,42 +253,34 @@ def extract_blocks(docx_path: str | Path) -> tuple[list[dict], list[dict], dict]
     paragraphs, stats = extract_document(docx_path)
     list_positions = _compute_list_positions(paragraphs)
 
-    blocks: list[dict] = []
+    # The per-paragraph pass stays serial: CPython's re holds the GIL while
+    # matching, so a thread pool would only add scheduling overhead, and the
+    # memoized detector makes each paragraph a few dict operations.
+    blocks: list[dict] = [None] * len(paragraphs)
 
-    for para in paragraphs:
+    for i, para in enumerate(paragraphs):
         para_id = para["id"]
         text = para["text"]
-        meta = dict(para.get("metadata", {}))
-
-        caption_type = _detect_caption_type(text)
-        source_line = _detect_source_line(text)
-        box_marker = _is_box_marker(text)
-        box_label = _detect_box_label(text)
-        box_title = _detect_box_title(text)
-
+        features = _classify_paragraph(text.lower().strip())
         list_info = list_positions.get(para_id, {})
 
-        meta.update(
-            {
-                "caption_type": caption_type,
-                "source_line": source_line,
-                "box_marker": box_marker,
-                "box_label": box_label,
-                "box_title": box_title,
+        blocks[i] = {
+            "id": para_id,
+            "para_ids": [para_id],
+            "text": text,
+            "text_truncated": para["text_truncated"],
+            # Single dict build: copy source metadata (left unmutated) + features
+            "metadata": {
+                **(para.get("metadata") or _EMPTY_META),
+                "caption_type": features.caption_type,
+                "source_line": features.source_line,
+                "box_marker": features.box_marker,
+                "box_label": features.box_label,
+                "box_title": features.box_title,
                 "list_kind": list_info.get("list_kind"),
                 "list_position": list_info.get("list_position"),
                 "list_level": list_info.get("list_level"),
-            }
-        )
-
-        blocks.append(
-            {
-                "id": para_id,
-                "para_ids": [para_id],
-                "text": text,
-                "text_truncated": para["text_truncated"],
-                "metadata": meta,
-            }
-        )
+            },
+        }
 
     return blocks, paragraphs, stats
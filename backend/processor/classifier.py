@@ -1,20 +1,35 @@
 """
 STAGE 2: Gemini Classification (model set via env/config)
 - Prompt Builder
-- Gemini API (Single Call or Chunked)
+- Gemini API (Single Call, Chunked, or Batch Mode for multiple documents)
 - Response Parser with robust JSON handling
 
 Sends entire document in one API call and extracts tags + confidence scores.
 """
 
 import json
-import re
+import os
 import logging
+import random
+import statistics
+import sys
+import threading
 import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Callable, Iterable, Literal, Optional
 
-from .llm_client import GeminiClient
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+from .llm_client import GeminiClient, get_http_client, take_last_attempt_seconds
+from .regex_registry import compile_pattern
 from .style_list import ALLOWED_STYLES
 from app.services.style_normalizer import normalize_style, normalize_tag
 from app.services.grounded_retriever import get_retriever
@@ -23,15 +38,43 @@ from .rule_learner import RuleLearner
 
 logger = logging.getLogger(__name__)
 
-REF_NUMBER_RE = re.compile(
+REF_NUMBER_RE = compile_pattern(
     r"^\s*(?:[•●\-–—]\s*)?(?:\[\s*\d+\s*\]|\(\s*\d+\s*\)|\d+\s*[.)]|\d+\s+)"
 )
-REF_BULLET_RE = re.compile(r"^\s*[\u2022\u25CF\-\*\u2013\u2014]\s+")
+REF_BULLET_RE = compile_pattern(r"^\s*[\u2022\u25CF\-\*\u2013\u2014]\s+")
+
+
+# strict parsing helper for model tag outputs; a raw tag is "strict" when
+# this finds exactly one token spanning the whole string
+EXTRACT_TAG_RE = compile_pattern(r"[A-Z0-9]+(?:[_-][A-Z0-9]+)*")
+
+# Model response recovery (_parse_json_response and helpers)
+_JSON_ARRAY_RE = compile_pattern(r"\[[\s\S]*\]")
+_JSON_FENCE_RE = compile_pattern(r"```(?:json)?\s*")
+_RESULT_OBJ_RE = compile_pattern(
+    r'\{\s*"id"\s*:\s*(\d+)\s*,\s*"tag"\s*:\s*"([^"]+)"\s*,\s*"confidence"\s*:\s*(\d+)'
+)
+
+
+def _loads_json(text: str):
+    """Parse JSON text, using orjson when available (its errors subclass json.JSONDecodeError)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
 
+# Shared read-only stand-in for paragraphs without metadata
+_EMPTY_META = MappingProxyType({})
 
-# strict parsing helpers for model tag outputs
-STRICT_TAG_RE = re.compile(r"^[A-Z0-9]+(?:[_-][A-Z0-9]+)*$")
-EXTRACT_TAG_RE = re.compile(r"[A-Z0-9]+(?:[_-][A-Z0-9]+)*")
+# Sort key for result lists (paragraph order)
+_BY_ID = itemgetter('id')
+
+# Prompt list cues and alias-mapping shapes
+_BULLET_CHARS = ('•', '-', '*', '●', '○', '▪')
+_NUMBERED_RE = compile_pattern(r'^\s*[\d\w]+\.')
+_TBL_LIST_RE = compile_pattern(r"TBL-(BL|NL|UL)-(FIRST|MID|LAST)")
+_SHORT_NUM_RE = compile_pattern(r"\d+-([A-Z0-9-]+)")
+_NUM_BX_RE = compile_pattern(r"(\d+)-([A-Z0-9-]+)")
 
 # Load system prompt
 PROMPT_DIR = Path(__file__).parent.parent / 'prompts'
@@ -52,7 +95,7 @@ RETRY_DELAY = 5  # seconds between retries
 # 4. Nesting levels: TAG + level number (e.g., TBL2-MID, TBL3-MID for level 2, 3)
 # 5. Table variants: T + column type (T2, T21, T22, T5, T6 for different column types)
 #
-VALID_TAGS = {
+_FALLBACK_VALID_TAGS = (
     # Document Structure
     "CN",           # Chapter Number
     "CT",           # Chapter Title
@@ -119,7 +162,6 @@ VALID_TAGS = {
     "T4",           # Table Row Header (first column)
     "T5",           # Table Body Cell (data values)
     "T6",           # Table Body Cell variant (specific data)
-    "T",            # Generic Table Cell
     
     # Tables - Lists inside cells
     "TBL-FIRST",    # Table Bulleted List First
@@ -228,9 +270,7 @@ VALID_TAGS = {
     "NBX-UL-FIRST", # Numbered Box Unnumbered List First
     "NBX-UL-MID",   # Numbered Box Unnumbered List Middle
     "NBX-UL-LAST",  # Numbered Box Unnumbered List Last
-    "NBX1-TTL",     # Numbered Box 1 Title
     "BX1-TTL",      # Box 1 Title
-    "BX1-TXT-FIRST",# Box 1 Text First
     "BX1-TXT",      # Box 1 Text
     "BX1-BL-FIRST", # Box 1 Bullet First
     "BX1-BL-MID",   # Box 1 Bullet Middle
@@ -276,25 +316,32 @@ VALID_TAGS = {
     "QUES-TXT-FLUSH",# Question Text Flush
     "QUES-LL2-MID", # Question List Level 2 Middle
     "ANS-TXT",      # Answer Text
-    "T4",           # Table Row Header
     "UL-FL2",       # Unordered List Flush Level 2
     "EOC_REF",      # End of Chapter Reference
     "EOC_NL",       # End of Chapter Numbered List
     "EOC_NLLL",     # End of Chapter Numbered List Last Level
     "BL2-MID",      # Bullet List Level 2 Middle
     "BL3-MID",      # Bullet List Level 3 Middle
-    "TUL-MID",      # Table Unordered List Middle
     "CHAP-BM",      # Chapter Back Matter
     
     # System/Default
     "Normal",       # Normal paragraph
     "ListParagraph",# List Paragraph
     "TableList",    # Table List
-}
+)
 
-# Prefer the official StyleList if available
-if ALLOWED_STYLES:
-    VALID_TAGS = ALLOWED_STYLES
+# Prefer the official StyleList if available.  The fallback above is a tuple
+# literal (a single constant in the compiled module), so the set is only
+# built when no StyleList is configured.
+VALID_TAGS = frozenset(ALLOWED_STYLES) if ALLOWED_STYLES else frozenset(_FALLBACK_VALID_TAGS)
+
+# Valid tags that raw-tag sanitizing returns unchanged (upper-case, single token)
+_CANONICAL_VALID_TAGS = frozenset(
+    t for t in VALID_TAGS if t == t.upper() and EXTRACT_TAG_RE.fullmatch(t)
+)
+
+# Valid tags that _validate_results keeps unchanged (normalize_style leaves them valid)
+_VALIDATED_TAGS = frozenset(t for t in VALID_TAGS if normalize_style(t) in VALID_TAGS)
 
 # =============================================================================
 # ZONE-BASED STYLE CONSTRAINTS
@@ -343,9 +390,21 @@ ZONE_STYLE_CONSTRAINTS = {
 }
 
 
+# Per-zone (exact styles, wildcard prefixes), compiled once from the table above
+_ZONE_COMPILED = {
+    zone: (
+        frozenset(s for s in styles if not s.endswith('*')),
+        tuple(s[:-1] for s in styles if s.endswith('*')),
+    )
+    for zone, styles in ZONE_STYLE_CONSTRAINTS.items()
+    if styles is not None
+}
+
+
+@lru_cache(maxsize=4096)
 def validate_style_for_zone(style: str, zone: str) -> bool:
     """
-    Check if a style is valid for a given zone.
+    Check if a style is valid for a given zone (memoized per (style, zone)).
     
     Args:
         style: The style tag to validate
@@ -354,27 +413,601 @@ def validate_style_for_zone(style: str, zone: str) -> bool:
     Returns:
         True if style is valid for zone, False otherwise
     """
-    valid_styles = ZONE_STYLE_CONSTRAINTS.get(zone)
-    if valid_styles is None:
+    entry = _ZONE_COMPILED.get(zone)
+    if entry is None:
         return True  # BODY or unknown zone has no constraints
-    
-    # Check exact match or wildcard match
-    for valid in valid_styles:
-        if valid.endswith('*'):
-            # Wildcard match (e.g. 'NBX-BL-*' matches 'NBX-BL-MID')
-            prefix = valid[:-1]
-            if style.startswith(prefix):
-                return True
-        elif style == valid:
-            return True
-            
-    return False
+
+    # Exact match or wildcard prefix match (e.g. 'NBX-*' matches 'NBX-BL-MID')
+    exact, prefixes = entry
+    return style in exact or style.startswith(prefixes)
+
+
+# Deterministic zone-violation fallback for zones that need no text cues
+# (TABLE and BACK_MATTER are decided from the paragraph text)
+_ZONE_FALLBACK_STYLES = {'METADATA': 'PMI'}
+
+
+def _allow_any_style(style: str) -> bool:
+    return True
+
+
+@lru_cache(maxsize=None)
+def make_zone_validator(zone: str) -> Callable[[str], bool]:
+    """
+    Return a style validator specialized for one zone.
+
+    Equivalent to ``lambda style: validate_style_for_zone(style, zone)`` but
+    with the zone's exact set and wildcard prefixes bound once, for loops
+    that check many styles against the same zone.
+    """
+    entry = _ZONE_COMPILED.get(zone)
+    if entry is None:
+        return _allow_any_style
+
+    exact, prefixes = entry
+
+    def validate(style: str) -> bool:
+        return style in exact or style.startswith(prefixes)
+
+    return validate
 
 # Maximum paragraphs per API call to avoid token limits
 MAX_PARAGRAPHS_PER_CHUNK = 75  # Reduced from 100 for faster, more reliable processing
 
+# Character budget per chunk; consecutive chunks share ~10% trailing paragraphs
+# so boundary items keep their context.  Chunks are classified in parallel.
+CHUNK_CHARS = 12000
+CHUNK_OVERLAP_RATIO = 0.1
+# Concurrent primary-model calls; lower it to stay within the project's Gemini QPM
+MAX_PARALLEL_CHUNKS = int(os.getenv("GEMINI_MAX_PARALLEL_CHUNKS", "4"))
+
+# Adaptive chunk sizing: per-call latency is tracked for these paragraph-count
+# buckets and classify() picks the size with the lowest predicted wall-clock
+CHUNK_SIZE_CANDIDATES = (25, 50, MAX_PARAGRAPHS_PER_CHUNK)
+CHUNK_LATENCY_SMOOTHING = 0.3  # weight of the newest sample in the running average
+CHUNK_BUCKET_MIN_FILL = 0.8  # calls below this fraction of their bucket's size are not measured
+CHUNK_SIZE_EXPLORE_RATE = 0.1  # chance a document tries a size that has no measurement yet
+
+# Distinct (tag, zone, list-cue) combinations memoized by alias mapping
+ALIAS_CACHE_SIZE = 4096
+
 # Confidence threshold for Flash fallback
 FLASH_FALLBACK_THRESHOLD = 75  # Items below this confidence get re-evaluated by Flash
+MAX_PARALLEL_FALLBACK = int(os.getenv("GEMINI_MAX_PARALLEL_FALLBACK", "8"))  # Concurrent Flash calls during the fallback stage
+# Items the primary model already re-checked in the same call ("recheck": true)
+# skip the fallback round when they land this close below the threshold
+SELF_VERIFY_BAND = 10
+FALLBACK_TIMEOUT = 60
+
+# Adaptive per-call timeout: once enough calls of a kind have completed, a call
+# gets ADAPTIVE_TIMEOUT_FACTOR x their median latency and is re-issued when it
+# overruns (a long-tail request is usually quick the second time).  After
+# TIMEOUT_RETRIES overruns the call runs once more with the full timeout.
+ADAPTIVE_TIMEOUT_WINDOW = 64
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = 8
+ADAPTIVE_TIMEOUT_FACTOR = 1.5
+ADAPTIVE_TIMEOUT_FLOOR = 5.0
+TIMEOUT_RETRIES = 2
+# Guards the process-wide latency state below (shared by every classifier
+# instance and by parallel chunk/fallback workers)
+_LATENCY_LOCK = threading.Lock()
+# Recent successful call latencies per call kind ("primary", "fallback")
+_CALL_LATENCIES: dict[str, deque] = {}
+# Smoothed seconds per primary call, keyed by CHUNK_SIZE_CANDIDATES bucket
+_CHUNK_SIZE_CURVE: dict[int, float] = {}
+# Successful request duration of the calling thread's last model call
+_CALL_TIMING = threading.local()
+
+
+def _is_timeout_error(error: Exception) -> bool:
+    """True for client/SDK errors raised because a request overran its timeout."""
+    if isinstance(error, TimeoutError) or "Timeout" in type(error).__name__:
+        return True
+    message = str(error)
+    return "DeadlineExceeded" in message or "DEADLINE_EXCEEDED" in message or "timed out" in message
+
+
+def _greedy_chunks(
+    paragraphs: list[dict],
+    max_paragraphs: int,
+    char_budget: int,
+) -> list[list[dict]]:
+    """Fill chunks in document order up to the paragraph and character budgets."""
+    chunks: list[list[dict]] = []
+    total = len(paragraphs)
+    start = 0
+    while start < total:
+        end = start
+        chars = 0
+        while end < total and end - start < max_paragraphs:
+            length = len(paragraphs[end].get('text', ''))
+            if end > start and chars + length > char_budget:
+                break
+            chars += length
+            end += 1
+        chunks.append(paragraphs[start:end])
+        if end >= total:
+            break
+        overlap = int((end - start) * CHUNK_OVERLAP_RATIO)
+        start = end - overlap
+    return chunks
+
+
+def _smallest_passing(low: int, high: int, passes) -> int:
+    """Smallest value in [low, high] for which passes() holds (high if none lower)."""
+    while low < high:
+        mid = (low + high) // 2
+        if passes(mid):
+            high = mid
+        else:
+            low = mid + 1
+    return high
+
+
+def _chunk_paragraphs(
+    paragraphs: list[dict],
+    max_paragraphs: int = MAX_PARAGRAPHS_PER_CHUNK,
+) -> list[list[dict]]:
+    """
+    Split paragraphs into chunks bounded by CHUNK_CHARS and max_paragraphs.
+
+    Each chunk after the first starts with the trailing CHUNK_OVERLAP_RATIO of
+    the previous chunk, so paragraphs at a boundary are seen with context.
+
+    Chunks stay contiguous (neighbouring paragraphs are the model's context),
+    but their sizes are evened out: the budgets are lowered as far as possible
+    without needing more calls or losing boundary overlap, so no request is
+    much larger than the others and the last one is not a small straggler.
+    """
+    chunks = _greedy_chunks(paragraphs, max_paragraphs, CHUNK_CHARS)
+    count = len(chunks)
+    if count <= 1:
+        return chunks
+
+    def shared_boundaries(candidate: list[list[dict]]) -> int:
+        return sum(1 for prev, nxt in zip(candidate, candidate[1:]) if any(p is nxt[0] for p in prev))
+
+    shared = shared_boundaries(chunks)
+
+    def fits(para_budget: int, char_budget: int) -> bool:
+        candidate = _greedy_chunks(paragraphs, para_budget, char_budget)
+        return len(candidate) <= count and shared_boundaries(candidate) >= shared
+
+    para_budget = _smallest_passing(1, max_paragraphs, lambda n: fits(n, CHUNK_CHARS))
+    longest = max(len(p.get('text', '')) for p in paragraphs)
+    char_budget = _smallest_passing(
+        min(longest, CHUNK_CHARS), CHUNK_CHARS, lambda c: fits(para_budget, c)
+    )
+    if not fits(para_budget, char_budget):
+        return chunks
+    return _greedy_chunks(paragraphs, para_budget, char_budget)
+
+
+def _dedupe_paragraphs(paragraphs: list[dict]) -> tuple[list[dict], dict[int, list[int]]]:
+    """
+    Collapse paragraphs with identical text and list/zone signature.
+
+    Uses the same signature as the content cache (zone, bullet/numbering/table
+    flags, list position), so two paragraphs are only merged when a cached
+    prediction for one would be served for the other.
+
+    Returns:
+        (representatives in original order, {representative id: duplicate ids})
+    """
+    representatives: list[dict] = []
+    duplicates: dict[int, list[int]] = {}
+    first_by_signature: dict[tuple, int] = {}
+    for para in paragraphs:
+        text = para.get('text', '')
+        if not text.strip():
+            representatives.append(para)
+            continue
+        meta = para.get('metadata') or _EMPTY_META
+        signature = (
+            text,
+            meta.get('context_zone', 'BODY'),
+            bool(meta.get('has_bullet')),
+            bool(meta.get('has_numbering')),
+            bool(meta.get('is_table')),
+            meta.get('list_position'),
+        )
+        rep_id = first_by_signature.get(signature)
+        if rep_id is None:
+            first_by_signature[signature] = para['id']
+            representatives.append(para)
+        else:
+            duplicates.setdefault(rep_id, []).append(para['id'])
+    return representatives, duplicates
+
+
+def _broadcast_duplicates(results: list[dict], duplicates: dict[int, list[int]]) -> list[dict]:
+    """Copy each representative's result to its duplicates, sorted by id."""
+    expanded = list(results)
+    for result in results:
+        for dup_id in duplicates.get(result['id'], ()):
+            expanded.append({**result, 'id': dup_id})
+    expanded.sort(key=_BY_ID)
+    return expanded
+
+
+def _recheck_tags(results: list) -> dict:
+    """Return id -> model tag for parsed results the model marked ``"recheck": true``."""
+    return {
+        r.get("id"): str(r.get("tag") or "").strip().upper()
+        for r in results
+        if isinstance(r, dict) and r.get("recheck") is True
+    }
+
+
+def _strip_recheck(results: list[dict]) -> list[dict]:
+    """Drop the model's ``recheck`` marker; it only steers the fallback stage."""
+    for r in results:
+        r.pop("recheck", None)
+    return results
+
+
+# Comprehensive style mapping from common source formats to WK Template
+_STYLE_MAP_SOURCE = {
+    # Chapter openers
+    "CHAPTERNUMBER": "CN", "CHAPTER NUMBER": "CN", "CHAP-NUM": "CN",
+    "CHAPTERTITLE": "CT", "CHAPTER TITLE": "CT", "CHAP-TITLE": "CT",
+    "CHAPTERAUTHOR": "CAU", "CHAPTER AUTHOR": "CAU",
+    "CHAPTERTITLEFOOTNOTE": "TFN",
+
+    # Headings - various source formats
+    "HEAD1": "H1", "HEAD-1": "H1", "HEADING1": "H1", "HEADING 1": "H1",
+    "HEAD2": "H2", "HEAD-2": "H2", "HEADING2": "H2", "HEADING 2": "H2",
+    "HEAD3": "H3", "HEAD-3": "H3", "HEADING3": "H3", "HEADING 3": "H3",
+    "HEAD4": "H4", "HEAD-4": "H4", "HEADING4": "H4", "HEADING 4": "H4",
+    "HEAD5": "H5", "HEAD-5": "H5", "HEADING5": "H5", "HEADING 5": "H5",
+    "BHEAD AFTER HEAD": "H2",
+    "SPECIALHEADING2": "H2",
+
+    # Body text variations
+    "PARA-FL": "TXT-FLUSH", "PARAFL": "TXT-FLUSH", "PARA FL": "TXT-FLUSH",
+    "PARAFIRSTLINE-IND": "TXT", "PARA-FIRSTLINE-IND": "TXT",
+    "TX": "TXT", "TXFL": "TXT-FLUSH", "TXL": "TXT",
+    "BODYTEXT": "TXT", "BODY TEXT": "TXT", "BODY-TEXT": "TXT",
+    "PARAGRAPH": "TXT", "PARA": "TXT", "TEXT": "TXT",
+
+    # Lists - unordered/bullet
+    "UC-ALPHATLIST1": "UL-FIRST", "UC-ALPHALIST1": "UL-MID",
+    "BULLETLIST1": "BL-MID", "BULLET LIST 1": "BL-MID",
+    "BULLETLIST1_FIRST": "BL-FIRST", "BULLETLIST1_LAST": "BL-LAST",
+    "BULLETLIST2": "BL2-MID",
+    "LC-ALPHALIST3": "UL-MID", "LC-ROMANLIST4": "UL-MID",
+
+    # Lists - numbered
+    "NUMBERLIST1": "NL-MID", "NUMBER LIST 1": "NL-MID",
+    "NUMBERLIST2": "NL-MID", "NUMBER LIST 2": "NL-MID",
+
+    # References
+    "REFERENCE-ALPHABETICAL": "REF-N", "REFERENCEALPHABETICAL": "REF-N",
+    "REFERENCE-NUMBERED": "REF-N", "REFERENCENUMBERED": "REF-N",
+    "REF-U": "REF-N", "EOC_REF": "REF-N",
+
+    # Figures and tables
+    "FIGURELEGEND": "FIG-LEG", "FIGURE LEGEND": "FIG-LEG",
+    "FIGURECAPTION": "FIG-LEG", "FIGURE CAPTION": "FIG-LEG",
+    "FIGURESOURCE": "TSN", "FIG-SRC": "TSN", "UNFIG-SRC": "TSN",
+    "TABLECAPTION": "T1", "TABLE CAPTION": "T1", "TABLECAPTIONS": "PMI",
+    "TABLEFOOTNOTE": "TFN", "TABLE FOOTNOTE": "TFN",
+    "UNT-T1": "T1",  # Unnumbered table title
+    "TABLETITLE": "T1", "TABLE TITLE": "T1",
+    "TABLEHEADER": "T2", "TABLE HEADER": "T2",
+    "TABLEBODY": "T", "TABLE BODY": "T",
+    "TABLESOURCE": "TSN", "TABLE SOURCE": "TSN",
+    "TABLECELL": "T", "TABLE CELL": "T",
+    # Table cell content styles from training data
+    "GT": "T",  # Generic table cell
+    "UNT": "T",  # Unnumbered table text
+    "UNT-T2": "T2",  # Unnumbered table header
+    "UNT-BL-MID": "TBL-MID",  # Unnumbered table bullet
+    "TABLECOLUMNHEAD1": "T2",  # Table column header
+
+    # Box/special content - NBX styles (keep in NBX format)
+    "NBX-BL-MID": "NBX-BL-MID", "NBX-BL-FIRST": "NBX-BL-FIRST", "NBX-BL-LAST": "NBX-BL-LAST",
+    "NBX-H1": "H1", "NBX-H2": "H2",
+    "NBX-UL-MID": "NBX-UL-MID", "NBX-UL-FIRST": "NBX-UL-FIRST", "NBX-UL-LAST": "NBX-UL-LAST",
+    "BOX-01-BULLETLIST1": "BX1-BL-MID",
+
+    # Box type mappings
+    "NOTE": "NBX-TTL", "CLINICAL PEARL": "BX1-TTL", "RED FLAG": "BX2-TTL",
+    "TIP": "BX1-TTL", "WARNING": "BX2-TTL", "ALERT": "BX2-TTL",
+
+    # Source/citation mappings
+    "CITATION": "TSN", "SOURCE": "TSN", "FIG-SRC": "TSN",
+
+    # Case study and special
+    "CASESTUDY-DIALOGUE": "TXT", "CASESTUDY-UL-FL1": "UL-FIRST",
+
+    # End of chapter
+    "EOC_NL": "EOC-NL-MID", "EOC_NLLL": "EOC-NL-MID",
+    "EOC-NUMBERLIST1": "EOC-NL-MID", "EOC-BULLETLIST2": "EOC-NL-MID",
+    "EOC-PARA-FL": "TXT-FLUSH",
+
+    # Metadata/instructions and markers
+    "METADATA": "PMI", "<METADATA>": "PMI", "</METADATA>": "PMI",
+    "<NOTE>": "PMI", "</NOTE>": "PMI",
+    "<CLINICAL PEARL>": "PMI", "</CLINICAL PEARL>": "PMI",
+    "<RED FLAG>": "PMI", "</RED FLAG>": "PMI",
+    "<BOX>": "PMI", "</BOX>": "PMI",
+    "<TIP>": "PMI", "</TIP>": "PMI",
+
+    # Normal/default
+    "NORMAL": "TXT", "DEFAULT": "TXT", "STANDARD": "TXT",
+}
+
+# Style map values are returned as result tags; interned so every result
+# carrying the same tag shares one string
+STYLE_MAP = {key: sys.intern(value) for key, value in _STYLE_MAP_SOURCE.items()}
+del _STYLE_MAP_SOURCE
+
+# Common underscore spellings of list/body tags (last resort in _validate_results)
+_TAG_UNDERSCORE_FIXES = {
+    "TXT_FLUSH": "TXT-FLUSH",
+    "BL_FIRST": "BL-FIRST",
+    "BL_MID": "BL-MID",
+    "BL_LAST": "BL-LAST",
+    "NL_FIRST": "NL-FIRST",
+    "NL_MID": "NL-MID",
+    "NL_LAST": "NL-LAST",
+    "UL_FIRST": "UL-FIRST",
+    "UL_MID": "UL-MID",
+    "UL_LAST": "UL-LAST",
+}
+
+
+def _intern_tags(results: list) -> list:
+    """Intern the tag strings of freshly parsed results (one shared object per tag)."""
+    for r in results:
+        if isinstance(r, dict):
+            tag = r.get("tag")
+            if type(tag) is str:
+                r["tag"] = sys.intern(tag)
+    return results
+
+
+@lru_cache(maxsize=ALIAS_CACHE_SIZE)
+def _text_bulleted(text: str) -> bool:
+    """
+    Whether a paragraph text starts with a bullet (reference-list cue).
+
+    Alias mapping runs several times per result (first mapping, invalid-tag
+    check, post-validation check) with the same paragraph text; memoizing on
+    the text keeps the regex scan to once per paragraph.
+    """
+    return bool(REF_BULLET_RE.match(text.strip()))
+
+
+@lru_cache(maxsize=ALIAS_CACHE_SIZE)
+def _text_numbered(text: str) -> bool:
+    """Whether a paragraph text starts with a list number (only the zone fallback asks)."""
+    return bool(REF_NUMBER_RE.match(text.strip()))
+
+
+def _alias_context(meta: dict | None, text: str) -> tuple:
+    """
+    Paragraph-dependent inputs of the alias mapping:
+    (zone, in_ref_zone, bulleted, box_prefix).
+    """
+    meta = meta or _EMPTY_META
+    zone = meta.get("context_zone", "")
+    in_ref_zone = bool(meta.get("is_reference_zone")) or zone == "REFERENCE"
+    return zone, in_ref_zone, _text_bulleted(text or ""), meta.get("box_prefix")
+
+
+class _AliasContexts(dict):
+    """Alias context per paragraph id, computed on first use from the id lookups."""
+
+    def __init__(self, meta_by_id: dict, text_by_id: dict):
+        super().__init__()
+        self.meta_by_id = meta_by_id
+        self.text_by_id = text_by_id
+
+    def __missing__(self, pid):
+        context = self[pid] = _alias_context(self.meta_by_id.get(pid), self.text_by_id.get(pid, ""))
+        return context
+
+
+@lru_cache(maxsize=1)
+def _read_system_prompt_file() -> Optional[str]:
+    """Read the system prompt file once per process (None if it is missing)."""
+    if not SYSTEM_PROMPT_PATH.exists():
+        return None
+    with open(SYSTEM_PROMPT_PATH, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _alias_for_mapped(mapped: str, zone: str, in_ref_zone: bool, bulleted: bool) -> str:
+    """
+    Map a sanitized, normalized model tag to an allowed canonical tag using
+    zone and reference-list cues.
+    """
+    original_mapped = mapped
+
+    table_heading_map = {
+        "SK_H1": "TH1", "SK_H2": "TH2", "SK_H3": "TH3", "SK_H4": "TH4",
+        "TBL-H1": "TH1", "TBL-H2": "TH2", "TBL-H3": "TH3", "TBL-H4": "TH4",
+    }
+    if zone == "TABLE" and mapped in table_heading_map:
+        candidate = table_heading_map[mapped]
+        if candidate in VALID_TAGS:
+            return candidate
+
+    if in_ref_zone and (mapped.startswith("UL-") or mapped.startswith("BL-") or mapped.startswith("NL-")):
+        candidate = "REF-U" if bulleted else "REF-N"
+        if candidate in VALID_TAGS:
+            return candidate
+
+    if mapped == "BIBITEM":
+        if in_ref_zone:
+            candidate = "REF-U" if bulleted else "REF-N"
+            if candidate in VALID_TAGS:
+                return candidate
+        for candidate in ("REF-U", "REF-N", "TXT"):
+            if candidate in VALID_TAGS:
+                return candidate
+
+    if mapped == "COUT":
+        for candidate in ("COUT-1", "COUT-2", "TXT"):
+            if candidate in VALID_TAGS:
+                return candidate
+
+    # Common shorthand / malformed aliases.
+    if mapped == "HH":
+        return "H1" if "H1" in VALID_TAGS else "TXT"
+    if mapped == "REF":
+        candidate = "REF-U" if bulleted else "REF-N"
+        if candidate in VALID_TAGS:
+            return candidate
+    if mapped == "TYPE":
+        if zone.startswith("BOX_"):
+            zone_prefix = zone[len("BOX_"):]
+            candidate = f"{zone_prefix}-TYPE"
+            if candidate in VALID_TAGS:
+                return candidate
+        if zone == "TABLE":
+            return "T" if "T" in VALID_TAGS else mapped
+    if mapped == "TTL":
+        if zone.startswith("BOX_"):
+            zone_prefix = zone[len("BOX_"):]
+            candidate = f"{zone_prefix}-TTL"
+            if candidate in VALID_TAGS:
+                return candidate
+        if zone == "TABLE":
+            for candidate in ("T1", "T2", "T"):
+                if candidate in VALID_TAGS:
+                    return candidate
+
+    # Normalize table list spellings sometimes produced by models.
+    tbl_list = _TBL_LIST_RE.fullmatch(mapped)
+    if tbl_list:
+        list_kind, pos = tbl_list.groups()
+        if list_kind == "BL":
+            candidate = f"TBL-{pos}"
+        elif list_kind == "NL":
+            candidate = f"TNL-{pos}"
+        else:
+            candidate = f"TUL-{pos}"
+        if candidate in VALID_TAGS:
+            return candidate
+        if list_kind == "BL" and "TBL-MID" in VALID_TAGS:
+            return "TBL-MID"
+        if list_kind == "NL" and "TNL-MID" in VALID_TAGS:
+            return "TNL-MID"
+        if list_kind == "UL" and "TUL-MID" in VALID_TAGS:
+            return "TUL-MID"
+    if mapped == "TBL-TXT":
+        for candidate in ("T", "TD", "TXT"):
+            if candidate in VALID_TAGS:
+                return candidate
+    if mapped == "BL-TXT":
+        for candidate in ("BL-MID", "TXT"):
+            if candidate in VALID_TAGS:
+                return candidate
+
+    for vendor_prefix in ("EFP-", "EYU-"):
+        if mapped.startswith(vendor_prefix):
+            remainder = mapped[len(vendor_prefix):]
+            if remainder.startswith("BX-"):
+                candidate = f"BX4-{remainder[3:]}"
+                if candidate in VALID_TAGS:
+                    return candidate
+            if remainder in VALID_TAGS:
+                return remainder
+            # Bare box name without subtype (e.g., EFP-BX → TXT)
+            if remainder == "BX":
+                for candidate in ("TXT",):
+                    if candidate in VALID_TAGS:
+                        return candidate
+
+    # Numeric-prefixed shorthand from model output (e.g., 1-TTL, 2-TXT-FLUSH).
+    # If we are in a box zone, use that zone's prefix as the canonical family.
+    m_short = _SHORT_NUM_RE.fullmatch(mapped)
+    if m_short:
+        mapped = m_short.group(1)
+        if zone.startswith("BOX_"):
+            zone_prefix = zone[len("BOX_"):]
+            candidate = f"{zone_prefix}-{mapped}"
+            if candidate in VALID_TAGS:
+                return candidate
+
+    # When a model emits bare subtype tokens inside a box zone (e.g., TTL),
+    # map to that zone family (e.g., BOX_BX2 + TTL -> BX2-TTL).
+    if zone.startswith("BOX_"):
+        zone_prefix = zone[len("BOX_"):]
+        candidate = f"{zone_prefix}-{mapped}"
+        if candidate in VALID_TAGS:
+            return candidate
+
+    # No zone hint available: try numeric prefix directly as BX family.
+    m_num = _NUM_BX_RE.fullmatch(original_mapped)
+    if m_num:
+        candidate = f"BX{m_num.group(1)}-{m_num.group(2)}"
+        if candidate in VALID_TAGS:
+            return candidate
+    if mapped.isdigit() and zone.startswith("BOX_"):
+        zone_prefix = zone[len("BOX_"):]
+        for suffix in ("TTL", "TYPE", "TXT"):
+            candidate = f"{zone_prefix}-{suffix}"
+            if candidate in VALID_TAGS:
+                return candidate
+
+    # Zone-aware coercion to avoid invalid/non-actionable tags.
+    if zone == "TABLE":
+        if mapped.startswith(("BX", "NBX", "KT-", "KP-", "OBJ-")):
+            if mapped.endswith("-FIRST") and "TBL-FIRST" in VALID_TAGS:
+                return "TBL-FIRST"
+            if mapped.endswith("-LAST") and "TBL-LAST" in VALID_TAGS:
+                return "TBL-LAST"
+            if mapped.endswith("-MID") and "TBL-MID" in VALID_TAGS:
+                return "TBL-MID"
+            return "T" if "T" in VALID_TAGS else mapped
+        if mapped.startswith("H") and mapped[1:].isdigit():
+            for candidate in ("TH1", "T2", "T"):
+                if candidate in VALID_TAGS:
+                    return candidate
+
+    if zone == "BACK_MATTER" and mapped not in {"SR", "SRH1"}:
+        if mapped.startswith(("FIG-", "T", "TFN", "TSN", "REF", "H")):
+            candidate = "REF-U" if bulleted else "REF-N"
+            if candidate in VALID_TAGS:
+                return candidate
+
+    if mapped in VALID_TAGS:
+        return mapped
+
+    return mapped
+
+
+# Known model aliases and the zones they show up in.  Their mapping outside
+# reference zones does not depend on paragraph text, so it is materialized
+# once here; _alias_for_mapped only runs for the remaining cases.
+_ALIAS_SOURCE_TAGS = (
+    "HH", "REF", "BIBITEM", "COUT", "TYPE", "TTL", "BL-TXT", "TBL-TXT",
+    "SK_H1", "SK_H2", "SK_H3", "SK_H4", "TBL-H1", "TBL-H2", "TBL-H3", "TBL-H4",
+    *(f"TBL-{kind}-{pos}" for kind in ("BL", "NL", "UL") for pos in ("FIRST", "MID", "LAST")),
+    "EFP-BX", "EYU-BX",
+    *(f"{n}-{suffix}" for n in "1234" for suffix in ("TTL", "TYPE", "TXT", "TXT-FLUSH")),
+)
+_ALIAS_ZONES = (
+    "", "BODY", "METADATA", "FRONT_MATTER", "TABLE", "BACK_MATTER",
+    "BOX_NBX", "BOX_BX1", "BOX_BX2", "BOX_BX3", "BOX_BX4",
+)
+
+
+def _build_alias_map() -> dict[tuple[str, str], str]:
+    alias_map = {}
+    for tag in _ALIAS_SOURCE_TAGS:
+        for zone in _ALIAS_ZONES:
+            outcomes = {_alias_for_mapped(tag, zone, False, bulleted) for bulleted in (False, True)}
+            if len(outcomes) == 1:
+                alias_map[(tag, zone)] = outcomes.pop()
+    return alias_map
+
+
+_ALIAS_MAP = _build_alias_map()
 
 
 class GeminiClassifier:
@@ -397,6 +1030,7 @@ class GeminiClassifier:
         enable_fallback: bool = True,
         system_prompt_override: str | None = None,
         fallback_prompt_override: str | None = None,
+        fallback_mode: Literal["sync", "batch"] = "sync",
     ):
         """
         Initialize the classifier with optional Flash fallback.
@@ -407,10 +1041,17 @@ class GeminiClassifier:
             fallback_model_name: Fallback model for low-confidence items (default: gemini-2.5-flash)
             fallback_threshold: Confidence threshold below which to use fallback
             enable_fallback: Whether to enable the fallback system
+            fallback_mode: "sync" re-evaluates each fallback group with its own call;
+                "batch" submits all groups of a document as one Batch Mode job
+                (discounted, asynchronous - for offline runs)
         """
         # Load system prompt
         system_prompt = system_prompt_override or self._load_system_prompt()
 
+        # Process-wide pooled HTTP connections, shared by the primary and
+        # fallback clients and by every classifier built for later documents
+        self.http_client = get_http_client(API_TIMEOUT)
+
         # Primary model (gemini-2.5-pro - high quality)
         self.model = GeminiClient(
             api_key=api_key,
@@ -422,6 +1063,7 @@ class GeminiClassifier:
             max_retries=MAX_RETRIES,
             retry_delay=RETRY_DELAY,
             timeout=API_TIMEOUT,
+            http_client=self.http_client,
         )
         self.primary_model_name = model_name
 
@@ -430,6 +1072,7 @@ class GeminiClassifier:
         self.fallback_model_name = fallback_model_name
         self.fallback_threshold = fallback_threshold
         self.enable_fallback = enable_fallback
+        self.fallback_mode = fallback_mode
 
         if enable_fallback:
             # Load fallback-specific system prompt (more detailed for difficult cases)
@@ -444,6 +1087,7 @@ class GeminiClassifier:
                 max_retries=MAX_RETRIES,
                 retry_delay=RETRY_DELAY,
                 timeout=60,  # Shorter timeout for fallback
+                http_client=self.http_client,
             )
             logger.info(f"Fallback model enabled: {fallback_model_name} (threshold: {fallback_threshold}%)")
 
@@ -492,13 +1136,14 @@ class GeminiClassifier:
         self.rule_predictions = 0
         self.llm_predictions = 0
 
+
         logger.info(f"Initialized Gemini classifier with model: {model_name}, timeout: {API_TIMEOUT}s")
     
     def _apply_rules(
         self,
         paragraphs: list[dict],
         min_confidence: float = 0.80
-    ) -> tuple[list[dict], list[dict], list[dict]]:
+    ) -> tuple[list[dict], list[dict], list[int]]:
         """
         Apply learned deterministic rules to paragraphs before LLM classification.
 
@@ -507,37 +1152,28 @@ class GeminiClassifier:
             min_confidence: Minimum confidence threshold for rule prediction
 
         Returns:
-            Tuple of (rule_predictions, llm_needed, all_results_so_far)
+            Tuple of (rule_predictions, llm_needed, llm_needed_indices)
             - rule_predictions: List of predictions made by rules
             - llm_needed: List of paragraphs that still need LLM classification
-            - all_results_so_far: Combined list with rule predictions filled in
+            - llm_needed_indices: Position in ``paragraphs`` of each llm_needed item
         """
         if not self.rule_learner or not self.rule_learner.rules:
             # No rules available, all paragraphs need LLM
-            return [], paragraphs, []
+            return [], paragraphs, list(range(len(paragraphs)))
 
         rule_predictions = []
         llm_needed = []
-        all_results = []
+        llm_needed_indices = []
 
-        for para in paragraphs:
+        for index, para in enumerate(paragraphs):
             para_id = para.get('id')
             text = para.get('text', '')
-            metadata = para.get('metadata', {})
+            metadata = para.get('metadata') or _EMPTY_META
 
-            # Try to predict using rules
-            predicted_tag = self.rule_learner.apply_rules(text, metadata)
+            # Try to predict using rules (one feature extraction per paragraph)
+            predicted_tag, matched_rule = self.rule_learner.apply_rules_with_rule(text, metadata)
 
             if predicted_tag:
-                # Find the rule that matched to get its confidence
-                features = self.rule_learner.feature_extractor.extract_features(text, metadata)
-                matched_rule = None
-
-                for rule in self.rule_learner.rules:
-                    if self.rule_learner._feature_matches(features, rule["condition"]):
-                        matched_rule = rule
-                        break
-
                 rule_confidence = matched_rule["confidence"] if matched_rule else 0.8
 
                 # Only use rule if confidence is high enough
@@ -550,19 +1186,12 @@ class GeminiClassifier:
                         "rule_based": True,
                     }
                     rule_predictions.append(result)
-                    all_results.append(result)
                     self.rule_predictions += 1
                     continue
 
             # No high-confidence rule match, needs LLM
             llm_needed.append(para)
-            # Placeholder for LLM result (will be filled later)
-            all_results.append({
-                "id": para_id,
-                "tag": "TXT",  # Temporary placeholder
-                "confidence": 0,
-                "rule_based": False,
-            })
+            llm_needed_indices.append(index)
 
         if rule_predictions:
             logger.info(
@@ -570,7 +1199,7 @@ class GeminiClassifier:
                 f"({len(rule_predictions)/len(paragraphs)*100:.1f}% coverage)"
             )
 
-        return rule_predictions, llm_needed, all_results
+        return rule_predictions, llm_needed, llm_needed_indices
 
     def _get_fallback_system_prompt(self) -> str:
         """Get specialized system prompt for fallback model - focused on difficult cases."""
@@ -602,12 +1231,11 @@ IMPORTANT:
     
     def _load_system_prompt(self) -> str:
         """Load system prompt from file or use embedded default."""
-        if SYSTEM_PROMPT_PATH.exists():
-            with open(SYSTEM_PROMPT_PATH, 'r', encoding='utf-8') as f:
-                return f.read()
-        else:
-            # Embedded minimal prompt as fallback
-            return self._get_default_prompt()
+        prompt = _read_system_prompt_file()
+        if prompt is not None:
+            return prompt
+        # Embedded minimal prompt as fallback
+        return self._get_default_prompt()
     
     def _get_default_prompt(self) -> str:
         """Return default system prompt."""
@@ -626,6 +1254,68 @@ TXT (body text), TXT-FLUSH (first para after heading), BL-FIRST/MID/LAST (bullet
 NL-FIRST/MID/LAST (numbered lists), REF-N (references), T1 (table title),
 T2 (table header), T4 (row header), T (table cell), TBL-MID (table bullet), TFN (table footnote), FIG-LEG (figure legend)."""
     
+    @staticmethod
+    def _format_paragraph(para: dict) -> str:
+        """Format one paragraph as ``[id] [context | hints] text`` for the prompt."""
+        text = para.get('text', '')
+        mget = (para.get('metadata') or _EMPTY_META).get
+
+        # Prepend visual cue for LLM if metadata indicates list but text doesn't show it
+        # This helps detection of automatic Word lists that don't have bullets in .text
+        if mget('has_bullet') and not text.lstrip().startswith(_BULLET_CHARS):
+            text = f"• {text}"
+        elif mget('has_numbering') and not _NUMBERED_RE.match(text):
+            text = f"1. {text}"
+
+        parts: list[str] = []
+
+        # Context zone hint (primary identifier)
+        context_zone = mget('context_zone', 'BODY')
+        if context_zone != 'BODY':
+            parts.append(context_zone)
+
+        # Table-specific context
+        if mget('is_table'):
+            if mget('is_header_row', False):
+                position = "HEADER_ROW"
+            elif mget('is_first_column', False):
+                position = "FIRST_COL"
+            else:
+                position = f"R{mget('row_index', 0)}C{mget('cell_index', 0)}"
+            inferred = mget('inferred_style', '')
+            table_hint = f"TABLE{mget('table_index', 0)+1},{position}"
+            parts.append(f"{table_hint},likely:{inferred}" if inferred else table_hint)
+
+        box_type = mget('box_type')
+        if box_type:
+            parts.append(f"box:{box_type}")
+
+        # Generic XML list items are ambiguous: hint only, text is left alone
+        # so the model is not biased toward NL/BL
+        if mget('has_xml_list'):
+            parts.append("LIST_ITEM")
+
+        # List/caption/source hints from block extraction
+        list_kind = mget('list_kind')
+        if list_kind:
+            list_pos = mget('list_position')
+            parts.append(f"LIST:{list_kind},{list_pos}" if list_pos else f"LIST:{list_kind}")
+
+        caption_type = mget('caption_type')
+        if caption_type:
+            parts.append(f"CAPTION:{caption_type}")
+
+        if mget('source_line'):
+            parts.append("SOURCE_LINE")
+
+        box_marker = mget('box_marker')
+        if box_marker:
+            parts.append(f"BOX_MARKER:{box_marker}")
+
+        if parts:
+            return f"[{para['id']}] [{' | '.join(parts)}] {text}"
+        return f"[{para['id']}] {text}"
+
     def build_user_prompt(
         self,
         paragraphs: list[dict],
@@ -636,102 +1326,11 @@ T2 (table header), T4 (row header), T (table cell), TBL-MID (table bullet), TFN
         """
         Build the user prompt for classification with context zone hints.
         """
-        # Import zone validation functions
-        # from .ingestion import ZONE_VALID_STYLES, get_zone_style_summary  <-- REMOVED per zone constraints plan
-
-        
         # Format paragraphs with zone context hints
-        lines = []
-        for para in paragraphs:
-            text = para.get('text', '')
-            metadata = para.get('metadata', {})
-            
-            # Prepend visual cue for LLM if metadata indicates list but text doesn't show it
-            # This helps detection of automatic Word lists that don't have bullets in .text
-            if metadata.get('has_bullet') and not text.lstrip().startswith(('•', '-', '*', '●', '○', '▪')):
-                text = f"• {text}"
-            elif metadata.get('has_numbering') and not re.match(r'^\s*[\d\w]+\.', text):
-                text = f"1. {text}"
-            
-            # Handle generic XML list items (ambiguous type)
-            if metadata.get('has_xml_list'):
-                # Don't modify text, just add to context
-                # This prevents forcing NL/BL bias
-                # But we'll add it to context_parts below
-                pass
-            context_parts = []
-            
-            # Add context zone hint (primary identifier)
-            context_zone = metadata.get('context_zone', 'BODY')
-            if context_zone != 'BODY':
-                context_parts.append(context_zone)
-            
-            # Add table-specific context
-            if metadata.get('is_table'):
-                table_idx = metadata.get('table_index', 0)
-                row_idx = metadata.get('row_index', 0)
-                cell_idx = metadata.get('cell_index', 0)
-                is_header = metadata.get('is_header_row', False)
-                is_first_col = metadata.get('is_first_column', False)
-                inferred = metadata.get('inferred_style', '')
-                
-                # Build table hint
-                table_hints = [f"TABLE{table_idx+1}"]
-                if is_header:
-                    table_hints.append("HEADER_ROW")
-                elif is_first_col:
-                    table_hints.append("FIRST_COL")
-                else:
-                    table_hints.append(f"R{row_idx}C{cell_idx}")
-                
-                if inferred:
-                    table_hints.append(f"likely:{inferred}")
-                
-                context_parts.append(",".join(table_hints))
-            
-            # Add box type if present
-            box_type = metadata.get('box_type')
-            if box_type:
-                context_parts.append(f"box:{box_type}")
-            
-            # Add generic list hint
-            if metadata.get('has_xml_list'):
-                context_parts.append("LIST_ITEM")
-
-            # Add list/caption/source hints from block extraction
-            list_kind = metadata.get('list_kind')
-            list_pos = metadata.get('list_position')
-            if list_kind:
-                if list_pos:
-                    context_parts.append(f"LIST:{list_kind},{list_pos}")
-                else:
-                    context_parts.append(f"LIST:{list_kind}")
-
-            caption_type = metadata.get('caption_type')
-            if caption_type:
-                context_parts.append(f"CAPTION:{caption_type}")
-
-            if metadata.get('source_line'):
-                context_parts.append("SOURCE_LINE")
-
-            if metadata.get('box_marker'):
-                context_parts.append(f"BOX_MARKER:{metadata['box_marker']}")
-            
-            # Build context hint string
-            if context_parts:
-                context_hint = f" [{' | '.join(context_parts)}]"
-            else:
-                context_hint = ""
-            
-            lines.append(f"[{para['id']}]{context_hint} {text}")
-        
-        formatted_paragraphs = "\n".join(lines)
+        formatted_paragraphs = "\n".join(self._format_paragraph(para) for para in paragraphs)
         
         # Count zones and collect unique zones
-        zone_counts = {}
-        for p in paragraphs:
-            zone = p.get('metadata', {}).get('context_zone', 'BODY')
-            zone_counts[zone] = zone_counts.get(zone, 0) + 1
+        zone_counts = Counter((p.get('metadata') or _EMPTY_META).get('context_zone', 'BODY') for p in paragraphs)
         
         # Build enhanced zone instructions with specific valid styles
         zone_notes = []
@@ -793,7 +1392,7 @@ T2 (table header), T4 (row header), T (table cell), TBL-MID (table bullet), TFN
                 examples = self.retriever.retrieve_examples(
                     text=sample_text,
                     k=10,  # Get 10 diverse examples
-                    zone=paragraphs[0].get('metadata', {}).get('context_zone') if paragraphs else None
+                    zone=(paragraphs[0].get('metadata') or _EMPTY_META).get('context_zone') if paragraphs else None
                 )
 
                 if examples:
@@ -803,6 +1402,7 @@ T2 (table header), T4 (row header), T (table cell), TBL-MID (table bullet), TFN
                 logger.warning(f"Failed to retrieve grounded examples: {e}")
 
         allowed_tags = ", ".join(sorted(VALID_TAGS))
+        threshold = getattr(self, "fallback_threshold", FLASH_FALLBACK_THRESHOLD)
         prompt = f"""Document: {document_name}
 Document Type: {document_type}
 Total Paragraphs in this batch: {len(paragraphs)}
@@ -812,6 +1412,7 @@ IMPORTANT: Return ONLY one of these tags exactly (case-sensitive): {allowed_tags
 IMPORTANT: The `tag` value must be only the exact style token, with no punctuation, labels, or commentary.
 IMPORTANT: Learn from the GROUND TRUTH EXAMPLES above - they show real manual-tagged patterns from similar books.
 IMPORTANT: If unsure, choose TXT.
+IMPORTANT: Before answering, re-check every paragraph you would give confidence below {threshold} (re-read its zone hint and neighbours), then give your final tag and add "recheck": true to that item.
 
 ---
 
@@ -821,18 +1422,23 @@ Classify each paragraph below:
 
         return prompt
 
-    def _sanitize_raw_tag(self, tag: str) -> str:
+    @staticmethod
+    def _sanitize_raw_tag(tag: str) -> str:
         """
         Strictly sanitize raw model tag output before canonical normalization.
         """
+        # Fast path: a clean tag from the allowed set sanitizes to itself
+        if isinstance(tag, str) and tag in _CANONICAL_VALID_TAGS:
+            return tag
         raw = str(tag or "").strip()
         if not raw:
             return "TXT"
         upper = raw.upper()
-        if STRICT_TAG_RE.fullmatch(upper):
+        # One scan serves both the strict check and candidate extraction
+        candidates = EXTRACT_TAG_RE.findall(upper)
+        if len(candidates) == 1 and candidates[0] == upper:
             return upper
 
-        candidates = EXTRACT_TAG_RE.findall(upper)
         if candidates:
             for candidate in candidates:
                 normalized = normalize_style(candidate)
@@ -845,175 +1451,92 @@ Classify each paragraph below:
         """
         Map known model aliases/invalid variants to allowed canonical tags.
         """
-        mapped = normalize_style(self._sanitize_raw_tag(tag), meta=meta)
-        original_mapped = mapped
-
-        zone = (meta or {}).get("context_zone", "")
-        in_ref_zone = bool((meta or {}).get("is_reference_zone")) or zone == "REFERENCE"
-        numbered = bool(REF_NUMBER_RE.match((text or "").strip()))
-        bulleted = bool(REF_BULLET_RE.match((text or "").strip()))
-
-        table_heading_map = {
-            "SK_H1": "TH1", "SK_H2": "TH2", "SK_H3": "TH3", "SK_H4": "TH4",
-            "TBL-H1": "TH1", "TBL-H2": "TH2", "TBL-H3": "TH3", "TBL-H4": "TH4",
-        }
-        if zone == "TABLE" and mapped in table_heading_map:
-            candidate = table_heading_map[mapped]
-            if candidate in VALID_TAGS:
-                return candidate
-
-        if in_ref_zone and (mapped.startswith("UL-") or mapped.startswith("BL-") or mapped.startswith("NL-")):
-            candidate = "REF-U" if bulleted else "REF-N"
-            if candidate in VALID_TAGS:
-                return candidate
-
-        if mapped == "BIBITEM":
-            if in_ref_zone:
-                candidate = "REF-U" if bulleted else "REF-N"
-                if candidate in VALID_TAGS:
-                    return candidate
-            for candidate in ("REF-U", "REF-N", "TXT"):
-                if candidate in VALID_TAGS:
-                    return candidate
-
-        if mapped == "COUT":
-            for candidate in ("COUT-1", "COUT-2", "TXT"):
-                if candidate in VALID_TAGS:
-                    return candidate
-
-        # Common shorthand / malformed aliases.
-        if mapped == "HH":
-            return "H1" if "H1" in VALID_TAGS else "TXT"
-        if mapped == "REF":
-            candidate = "REF-U" if bulleted else "REF-N"
-            if candidate in VALID_TAGS:
-                return candidate
-        if mapped == "TYPE":
-            if zone.startswith("BOX_"):
-                zone_prefix = zone[len("BOX_"):]
-                candidate = f"{zone_prefix}-TYPE"
-                if candidate in VALID_TAGS:
-                    return candidate
-            if zone == "TABLE":
-                return "T" if "T" in VALID_TAGS else mapped
-        if mapped == "TTL":
-            if zone.startswith("BOX_"):
-                zone_prefix = zone[len("BOX_"):]
-                candidate = f"{zone_prefix}-TTL"
-                if candidate in VALID_TAGS:
-                    return candidate
-            if zone == "TABLE":
-                for candidate in ("T1", "T2", "T"):
-                    if candidate in VALID_TAGS:
-                        return candidate
-
-        # Normalize table list spellings sometimes produced by models.
-        tbl_list = re.fullmatch(r"TBL-(BL|NL|UL)-(FIRST|MID|LAST)", mapped)
-        if tbl_list:
-            list_kind, pos = tbl_list.groups()
-            if list_kind == "BL":
-                candidate = f"TBL-{pos}"
-            elif list_kind == "NL":
-                candidate = f"TNL-{pos}"
-            else:
-                candidate = f"TUL-{pos}"
-            if candidate in VALID_TAGS:
-                return candidate
-            if list_kind == "BL" and "TBL-MID" in VALID_TAGS:
-                return "TBL-MID"
-            if list_kind == "NL" and "TNL-MID" in VALID_TAGS:
-                return "TNL-MID"
-            if list_kind == "UL" and "TUL-MID" in VALID_TAGS:
-                return "TUL-MID"
-        if mapped == "TBL-TXT":
-            for candidate in ("T", "TD", "TXT"):
-                if candidate in VALID_TAGS:
-                    return candidate
-        if mapped == "BL-TXT":
-            for candidate in ("BL-MID", "TXT"):
-                if candidate in VALID_TAGS:
-                    return candidate
-
-        for vendor_prefix in ("EFP-", "EYU-"):
-            if mapped.startswith(vendor_prefix):
-                remainder = mapped[len(vendor_prefix):]
-                if remainder.startswith("BX-"):
-                    candidate = f"BX4-{remainder[3:]}"
-                    if candidate in VALID_TAGS:
-                        return candidate
-                if remainder in VALID_TAGS:
-                    return remainder
-                # Bare box name without subtype (e.g., EFP-BX → TXT)
-                if remainder == "BX":
-                    for candidate in ("TXT",):
-                        if candidate in VALID_TAGS:
-                            return candidate
-
-        # Numeric-prefixed shorthand from model output (e.g., 1-TTL, 2-TXT-FLUSH).
-        # If we are in a box zone, use that zone's prefix as the canonical family.
-        m_short = re.fullmatch(r"\d+-([A-Z0-9-]+)", mapped)
-        if m_short:
-            mapped = m_short.group(1)
-            if zone.startswith("BOX_"):
-                zone_prefix = zone[len("BOX_"):]
-                candidate = f"{zone_prefix}-{mapped}"
-                if candidate in VALID_TAGS:
-                    return candidate
-
-        # When a model emits bare subtype tokens inside a box zone (e.g., TTL),
-        # map to that zone family (e.g., BOX_BX2 + TTL -> BX2-TTL).
-        if zone.startswith("BOX_"):
-            zone_prefix = zone[len("BOX_"):]
-            candidate = f"{zone_prefix}-{mapped}"
-            if candidate in VALID_TAGS:
-                return candidate
-
-        # No zone hint available: try numeric prefix directly as BX family.
-        m_num = re.fullmatch(r"(\d+)-([A-Z0-9-]+)", original_mapped)
-        if m_num:
-            candidate = f"BX{m_num.group(1)}-{m_num.group(2)}"
-            if candidate in VALID_TAGS:
-                return candidate
-        if mapped.isdigit() and zone.startswith("BOX_"):
-            zone_prefix = zone[len("BOX_"):]
-            for suffix in ("TTL", "TYPE", "TXT"):
-                candidate = f"{zone_prefix}-{suffix}"
-                if candidate in VALID_TAGS:
-                    return candidate
-
-        # Zone-aware coercion to avoid invalid/non-actionable tags.
-        if zone == "TABLE":
-            if mapped.startswith(("BX", "NBX", "KT-", "KP-", "OBJ-")):
-                if mapped.endswith("-FIRST") and "TBL-FIRST" in VALID_TAGS:
-                    return "TBL-FIRST"
-                if mapped.endswith("-LAST") and "TBL-LAST" in VALID_TAGS:
-                    return "TBL-LAST"
-                if mapped.endswith("-MID") and "TBL-MID" in VALID_TAGS:
-                    return "TBL-MID"
-                return "T" if "T" in VALID_TAGS else mapped
-            if mapped.startswith("H") and mapped[1:].isdigit():
-                for candidate in ("TH1", "T2", "T"):
-                    if candidate in VALID_TAGS:
-                        return candidate
-
-        if zone == "BACK_MATTER" and mapped not in {"SR", "SRH1"}:
-            if mapped.startswith(("FIG-", "T", "TFN", "TSN", "REF", "H")):
-                candidate = "REF-U" if bulleted else "REF-N"
-                if candidate in VALID_TAGS:
-                    return candidate
-
-        if mapped in VALID_TAGS:
-            return mapped
+        return self._resolve_tag_alias(str(tag or ""), *_alias_context(meta, text))
+
+    @staticmethod
+    @lru_cache(maxsize=ALIAS_CACHE_SIZE)
+    def _resolve_tag_alias(
+        tag: str,
+        zone: str,
+        in_ref_zone: bool,
+        bulleted: bool,
+        box_prefix: Optional[str],
+    ) -> str:
+        """
+        Alias mapping proper.  Depends only on its arguments and module
+        constants, so results are memoized per distinct combination.
+        """
+        meta = {"box_prefix": box_prefix} if box_prefix else None
+        mapped = normalize_style(GeminiClassifier._sanitize_raw_tag(tag), meta=meta)
+        if not in_ref_zone:
+            hit = _ALIAS_MAP.get((mapped, zone))
+            if hit is not None:
+                return hit
+        return _alias_for_mapped(mapped, zone, in_ref_zone, bulleted)
+
+    @staticmethod
+    @lru_cache(maxsize=ALIAS_CACHE_SIZE)
+    def _resolve_normalized_tag(
+        tag: str,
+        zone: str,
+        in_ref_zone: bool,
+        bulleted: bool,
+        box_prefix: Optional[str],
+    ) -> tuple[str, str]:
+        """
+        (alias-mapped tag, normalize_tag() of it) for one alias context.
+        normalize_tag() only reads box_prefix from the metadata, so the pair is
+        memoized on the same key as _resolve_tag_alias.
+        """
+        mapped = GeminiClassifier._resolve_tag_alias(tag, zone, in_ref_zone, bulleted, box_prefix)
+        meta = {"box_prefix": box_prefix} if box_prefix else None
+        return mapped, normalize_tag(mapped, meta=meta)
 
-        return mapped
+    @staticmethod
+    @lru_cache(maxsize=ALIAS_CACHE_SIZE)
+    def _resolve_result_tag(tag: str) -> tuple[str, bool]:
+        """
+        Canonical tag for a raw model tag in _validate_results, and whether it
+        was recognised (False means it fell through to the underscore fixes/TXT).
 
-    def _apply_alias_mappings(self, results: list[dict], meta_by_id: dict | None = None, text_by_id: dict | None = None) -> list[dict]:
+        Depends only on the tag, so the cascade below runs once per distinct
+        tag; models emit a few dozen.
+        """
+        if normalize_style(tag) not in VALID_TAGS:
+            tag = GeminiClassifier._resolve_tag_alias(str(tag or ""), *_alias_context(None, ""))
+        if normalize_style(tag) in VALID_TAGS:
+            return tag, True
+
+        # Try uppercase
+        tag_upper = tag.upper().replace(" ", "").replace("_", "-")
+        if normalize_style(tag_upper) in VALID_TAGS:
+            return tag_upper, True
+
+        # Check style map
+        upper = tag.upper()
+        for lookup in (
+            upper.replace("-", " ").replace("_", " "),
+            upper.replace(" ", "-").replace("_", "-"),
+            upper,
+        ):
+            mapped = STYLE_MAP.get(lookup)
+            if mapped is not None:
+                return mapped, True
+
+        # Try common underscore fixes
+        return _TAG_UNDERSCORE_FIXES.get(upper, "TXT"), False
+
+    @staticmethod
+    def _paragraph_lookups(para_by_id: dict) -> tuple[dict, dict]:
+        """Build the (meta_by_id, text_by_id) lookups used while post-processing model output."""
+        meta_by_id = {pid: p.get("metadata") or _EMPTY_META for pid, p in para_by_id.items()}
+        text_by_id = {pid: p.get("text", "") for pid, p in para_by_id.items()}
+        return meta_by_id, text_by_id
+
+    def _apply_alias_mappings(self, results: list[dict], contexts: _AliasContexts) -> list[dict]:
+        resolve = self._resolve_tag_alias
         for r in results:
-            rid = r.get("id")
-            meta = meta_by_id.get(rid) if meta_by_id else None
-            text = text_by_id.get(rid, "") if text_by_id else ""
-            mapped = self._map_tag_alias(r.get("tag", ""), meta=meta, text=text)
-            r["tag"] = mapped
+            r["tag"] = resolve(str(r.get("tag") or ""), *contexts[r.get("id")])
         return results
     
     def classify(
@@ -1038,22 +1561,43 @@ Classify each paragraph below:
         # Check cache for already classified paragraphs
         cached_results: dict[int, dict] = {}
         uncached_paragraphs: list[dict] = []
+        # Chunk checkpoints left by an interrupted run: these paragraphs skip
+        # the model call but still go through validation, zone checks and fallback
+        checkpointed: dict[int, dict] = {}
+        # Normalized-text digest per paragraph id, reused when storing results
+        text_hashes: dict[int, str] = {}
 
         if self.cache:
+            # One lookup call per document for each cache layer
+            keys = []
             for para in paragraphs:
                 para_id = para.get('id')
-                text = para.get('text', '')
-                zone = para.get('metadata', {}).get('context_zone', 'BODY')
-
-                cached = self.cache.get(
-                    doc_id=document_name,
-                    para_index=para_id,
-                    text=text,
-                    zone=zone
-                )
-
-                if cached:
-                    cached_results[para_id] = cached
+                text_hash = text_hashes[para_id] = self.cache.text_hash(para.get('text', ''))
+                keys.append((
+                    document_name,
+                    para_id,
+                    text_hash,
+                    (para.get('metadata') or _EMPTY_META).get('context_zone', 'BODY'),
+                ))
+            misses: list[dict] = []
+            miss_keys: list[tuple] = []
+            for para, key, cached in zip(paragraphs, keys, self.cache.get_many(keys)):
+                if cached and not cached.get('checkpoint'):
+                    cached_results[para.get('id')] = cached
+                else:
+                    if cached:
+                        checkpointed[para.get('id')] = {k: v for k, v in cached.items() if k != 'checkpoint'}
+                    misses.append(para)
+                    miss_keys.append(key)
+
+            # Identical content seen in any earlier document/run
+            by_content_hits = self.cache.get_many_by_content(
+                [(text_hash, zone, para.get('metadata')) for para, (_, _, text_hash, zone) in zip(misses, miss_keys)]
+            ) if misses else []
+            for para, by_content in zip(misses, by_content_hits):
+                if by_content:
+                    para_id = para.get('id')
+                    cached_results[para_id] = {'id': para_id, **by_content, 'rule_based': False, 'cached': True}
                 else:
                     uncached_paragraphs.append(para)
 
@@ -1063,7 +1607,7 @@ Classify each paragraph below:
             # If all cached, return immediately
             if not uncached_paragraphs:
                 logger.info("All paragraphs found in cache, skipping API call")
-                return sorted(cached_results.values(), key=lambda x: x['id'])
+                return sorted(cached_results.values(), key=_BY_ID)
 
             # Use uncached paragraphs for classification
             paragraphs = uncached_paragraphs
@@ -1071,10 +1615,13 @@ Classify each paragraph below:
 
         # === RULE-BASED CLASSIFICATION (GROUNDED-FIRST) ===
         # Apply deterministic rules before calling LLM
-        rule_predictions, llm_needed, partial_results = self._apply_rules(paragraphs, min_confidence=0.80)
+        rule_predictions, llm_needed, llm_needed_indices = self._apply_rules(paragraphs, min_confidence=0.80)
+        rule_paragraph_count = len(paragraphs)
 
-        # Keep reference to all original paragraphs for caching later
+        # Id lookups built once per document and shared by every later phase
+        # (chunk post-processing, zone validation, fallback, caching)
         all_original_paragraphs = {p['id']: p for p in paragraphs}
+        lookups = self._paragraph_lookups(all_original_paragraphs)
 
         # If all paragraphs handled by rules, return early
         if not llm_needed:
@@ -1082,74 +1629,116 @@ Classify each paragraph below:
             self.llm_predictions += 0
 
             # Still need to validate and cache
-            results = self.validate_zone_constraints(rule_predictions, paragraphs)
+            results = self.validate_zone_constraints(rule_predictions, paragraphs, all_original_paragraphs)
 
             # Cache rule predictions
             if self.cache:
-                for result in results:
-                    para_id = result.get('id')
-                    para = all_original_paragraphs.get(para_id)
-                    if para:
-                        self.cache.set(
-                            doc_id=document_name,
-                            para_index=para_id,
-                            text=para.get('text', ''),
-                            prediction=result,
-                            zone=para.get('metadata', {}).get('context_zone', 'BODY')
-                        )
+                self._cache_results(document_name, results, all_original_paragraphs, text_hashes)
 
             # Merge with cached results if any
             if cached_results:
                 all_results = list(cached_results.values()) + results
-                all_results.sort(key=lambda x: x['id'])
+                all_results.sort(key=_BY_ID)
                 return all_results
 
             return results
 
         # Some paragraphs still need LLM classification
         logger.info(f"LLM needed for {len(llm_needed)}/{total_paragraphs} paragraphs after rule filtering")
-        paragraphs = llm_needed  # Only classify these with LLM
-        total_paragraphs = len(paragraphs)
+        # Repeated boilerplate (running heads, "Continued", table labels) goes
+        # to the LLM once; duplicates receive the representative's result
+        paragraphs, duplicates = _dedupe_paragraphs(llm_needed)
+        if duplicates:
+            logger.info(
+                f"De-duplicated {len(llm_needed) - len(paragraphs)} repeated paragraphs "
+                f"({len(paragraphs)} sent to LLM)"
+            )
+        resumed = [checkpointed[p['id']] for p in paragraphs if p['id'] in checkpointed]
+        if resumed:
+            logger.info(f"Resuming {len(resumed)} paragraphs from an interrupted run's checkpoints")
+            paragraphs_to_send = [p for p in paragraphs if p['id'] not in checkpointed]
+        else:
+            paragraphs_to_send = paragraphs
+        total_paragraphs = len(paragraphs_to_send)
         
         # Check if we need to chunk
-        if total_paragraphs <= MAX_PARAGRAPHS_PER_CHUNK:
+        chunks = (
+            _chunk_paragraphs(paragraphs_to_send, self._pick_chunk_size(total_paragraphs))
+            if paragraphs_to_send else []
+        )
+        if not chunks:
+            results = []
+        elif len(chunks) == 1:
             # Single API call
-            results = self._classify_chunk(paragraphs, document_name, document_type)
+            results = self._classify_chunk(paragraphs_to_send, document_name, document_type, lookups=lookups)
         else:
-            # Chunk the document
-            logger.info(f"Large document ({total_paragraphs} paragraphs), processing in chunks")
-            all_results = []
-            
-            for i in range(0, total_paragraphs, MAX_PARAGRAPHS_PER_CHUNK):
-                chunk = paragraphs[i:i + MAX_PARAGRAPHS_PER_CHUNK]
-                chunk_num = i // MAX_PARAGRAPHS_PER_CHUNK + 1
-                total_chunks = (total_paragraphs + MAX_PARAGRAPHS_PER_CHUNK - 1) // MAX_PARAGRAPHS_PER_CHUNK
-                
+            # Chunk the document and classify chunks in parallel
+            total_chunks = len(chunks)
+            logger.info(
+                f"Large document ({total_paragraphs} paragraphs), processing {total_chunks} chunks "
+                f"with up to {MAX_PARALLEL_CHUNKS} workers"
+            )
+
+            def _run_chunk(chunk_num: int, chunk: list[dict]) -> list[dict]:
                 chunk_info = f"Chunk {chunk_num} of {total_chunks} (paragraphs {chunk[0]['id']} to {chunk[-1]['id']})"
                 logger.info(f"Processing {chunk_info}")
-                
-                chunk_results = self._classify_chunk(
-                    chunk, 
-                    document_name, 
-                    document_type,
-                    chunk_info
-                )
-                all_results.extend(chunk_results)
-            
+                chunk_result = self._classify_chunk(chunk, document_name, document_type, chunk_info, lookups=lookups)
+                if self.cache:
+                    # Checkpoint: if a later chunk fails, a re-run reuses these
+                    # instead of calling the model again.  Marked as checkpoints
+                    # so they are post-processed like fresh model output; the
+                    # final _cache_results overwrites them
+                    try:
+                        self._cache_results(
+                            document_name,
+                            [{**r, 'checkpoint': True} for r in chunk_result if r.get('confidence', 0) > 0],
+                            all_original_paragraphs,
+                            text_hashes,
+                            content=False,
+                        )
+                    except Exception as e:
+                        logger.warning(f"Could not checkpoint {chunk_info}: {e}")
+                logger.info(f"Finished {chunk_info}")
+                return chunk_result
+
+            with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_CHUNKS, total_chunks)) as executor:
+                chunk_results = list(executor.map(_run_chunk, range(1, total_chunks + 1), chunks))
+
+            # Merge on paragraph id; overlapping items keep the most confident result
+            merged: dict[int, dict] = {}
+            for chunk_result in chunk_results:
+                for r in chunk_result:
+                    prev = merged.get(r['id'])
+                    if prev is None or r.get('confidence', 0) > prev.get('confidence', 0):
+                        merged[r['id']] = r
+
             # Validate all results
-            results = self._validate_results(all_results, total_paragraphs)
+            results = self._validate_results(
+                list(merged.values()), total_paragraphs, expected_ids=[p['id'] for p in paragraphs_to_send]
+            )
+
+        if resumed:
+            results = self._validate_results(
+                results + resumed, len(paragraphs), expected_ids=[p['id'] for p in paragraphs]
+            )
+
+        if duplicates:
+            results = _broadcast_duplicates(results, duplicates)
         
         # Post-validate against zone constraints
-        results = self.validate_zone_constraints(results, paragraphs)
+        results = self.validate_zone_constraints(results, paragraphs, all_original_paragraphs)
         
         # Log zone violation summary
         violations = [r for r in results if r.get('zone_violation')]
         if violations:
-            logger.warning(f"Zone validation: {len(violations)} violations detected out of {len(results)} paragraphs")
-            for v in violations[:5]:  # Show first 5
-                logger.warning(f"  Para {v['id']}: '{v['tag']}' not valid for zone '{v.get('expected_zone')}'")
-            if len(violations) > 5:
-                logger.warning(f"  ... and {len(violations) - 5} more")
+            # One line: first 5 as (id, tag, expected zone) plus the remainder count
+            logger.warning(
+                "Zone validation: %d violations detected out of %d paragraphs: %r (+%d more)",
+                len(violations),
+                len(results),
+                [(v['id'], v['tag'], v.get('expected_zone')) for v in violations[:5]],
+                max(0, len(violations) - 5),
+            )
         else:
             logger.info("Zone validation: All styles valid for their zones")
         
@@ -1159,23 +1748,31 @@ Classify each paragraph below:
 
         # Merge LLM results with rule predictions
         if rule_predictions:
-            # Build lookup for LLM results by ID
-            llm_results_by_id = {r['id']: r for r in results}
-
-            # Combine: use rule predictions where available, LLM results for the rest
-            combined_results = []
-            for rule_pred in rule_predictions:
-                combined_results.append(rule_pred)
-
-            # Add LLM results for paragraphs not covered by rules
+            # One slot per rule-filtered paragraph: rule predictions fill the
+            # slots not sent to the LLM, LLM results land at their paragraph's slot
+            combined_results: list = [None] * rule_paragraph_count
+            needed = set(llm_needed_indices)
+            rule_iter = iter(rule_predictions)
+            for index in range(rule_paragraph_count):
+                if index not in needed:
+                    combined_results[index] = next(rule_iter)
+
+            index_by_id = {para['id']: index for para, index in zip(llm_needed, llm_needed_indices)}
+            extra_results = []
             for llm_result in results:
-                # Only add if not already present in rule predictions
-                if not any(r['id'] == llm_result['id'] for r in rule_predictions):
-                    combined_results.append(llm_result)
+                index = index_by_id.get(llm_result['id'])
+                if index is None:
+                    extra_results.append(llm_result)
+                else:
+                    combined_results[index] = llm_result
+            if extra_results:
+                # Ids outside the LLM batch (e.g. "missing" fill-ins) never replace a rule prediction
+                rule_ids = {r['id'] for r in rule_predictions}
+                extra_results = [r for r in extra_results if r['id'] not in rule_ids]
 
             # Sort by ID
-            combined_results.sort(key=lambda x: x['id'])
-            results = combined_results
+            results = [r for r in combined_results if r is not None] + extra_results
+            results.sort(key=_BY_ID)
 
             logger.info(
                 f"Classification complete: {len(rule_predictions)} by rules, "
@@ -1184,43 +1781,156 @@ Classify each paragraph below:
 
         # === FLASH FALLBACK FOR LOW-CONFIDENCE ITEMS ===
         if self.enable_fallback and self.fallback_model:
-            # Build complete paragraph list for fallback processing
-            all_paras_for_fallback = [all_original_paragraphs[r['id']] for r in results if r['id'] in all_original_paragraphs]
-            results = self._process_fallback(results, all_paras_for_fallback, document_name)
+            results = self._process_fallback(results, [], document_name, para_by_id=all_original_paragraphs)
+        results = _strip_recheck(results)
 
         # === CACHE PREDICTIONS ===
         # Save new predictions to cache (both rule and LLM predictions)
         if self.cache:
-            for result in results:
-                para_id = result.get('id')
-                para = all_original_paragraphs.get(para_id)
-
-                if para:
-                    self.cache.set(
-                        doc_id=document_name,
-                        para_index=para_id,
-                        text=para.get('text', ''),
-                        prediction=result,
-                        zone=para.get('metadata', {}).get('context_zone', 'BODY')
-                    )
+            self._cache_results(document_name, results, all_original_paragraphs, text_hashes)
 
             cache_stats = self.cache.get_stats()
             logger.info(f"Cache stats: {cache_stats}")
 
         # === MERGE WITH CACHED RESULTS ===
-        # Combine newly classified with cached results
+        # Combine newly classified with cached results; both halves are already
+        # in id order, so the sort is a single linear merge of two runs
         if cached_results:
             all_results = list(cached_results.values()) + results
-            all_results.sort(key=lambda x: x['id'])
+            all_results.sort(key=_BY_ID)
             return all_results
 
         return results
     
+    def classify_batch(
+        self,
+        documents: list[dict],
+        document_type: str = "Academic Document",
+    ) -> list[list[dict]]:
+        """
+        Classify several documents through one Gemini Batch Mode job.
+
+        Each document is a dict with ``paragraphs`` and ``document_name``.
+        Rules are applied first as in classify(); every remaining chunk of
+        every document becomes one request in a single batch job.  Chunks
+        whose batch request failed are retried through the interactive
+        single-call path.  The prediction cache is not consulted.
+
+        Returns:
+            One result list per document, in input order
+        """
+        # (doc index, chunk paragraphs, user prompt) for every LLM request
+        jobs: list[tuple[int, list[dict], str]] = []
+        per_doc: list[dict] = []
+
+        for doc_idx, doc in enumerate(documents):
+            paragraphs = doc["paragraphs"]
+            document_name = doc["document_name"]
+            rule_predictions, llm_needed, _ = self._apply_rules(paragraphs, min_confidence=0.80)
+            para_by_id = {p['id']: p for p in paragraphs}
+            per_doc.append({
+                "rule_predictions": rule_predictions,
+                "llm_needed": llm_needed,
+                "llm_results": [],
+                "para_by_id": para_by_id,
+                "lookups": self._paragraph_lookups(para_by_id),
+            })
+
+            total = len(llm_needed)
+            total_chunks = (total + MAX_PARAGRAPHS_PER_CHUNK - 1) // MAX_PARAGRAPHS_PER_CHUNK
+            for i in range(0, total, MAX_PARAGRAPHS_PER_CHUNK):
+                chunk = llm_needed[i:i + MAX_PARAGRAPHS_PER_CHUNK]
+                chunk_info = ""
+                if total_chunks > 1:
+                    chunk_num = i // MAX_PARAGRAPHS_PER_CHUNK + 1
+                    chunk_info = f"Chunk {chunk_num} of {total_chunks} (paragraphs {chunk[0]['id']} to {chunk[-1]['id']})"
+                prompt = self.build_user_prompt(chunk, document_name, document_type, chunk_info)
+                jobs.append((doc_idx, chunk, prompt))
+
+        logger.info(f"Batch classification: {len(documents)} documents, {len(jobs)} requests")
+        responses = self.model.generate_content_batch(
+            [prompt for _, _, prompt in jobs],
+            display_name=f"classify-{len(documents)}-docs",
+        )
+
+        for (doc_idx, chunk, prompt), response in zip(jobs, responses):
+            if response is None:
+                logger.warning(f"Batch request failed for document {doc_idx}; retrying interactively")
+                response = self._generate_content(prompt)
+            state = per_doc[doc_idx]
+            state["llm_results"].extend(self._finish_chunk(response.text, chunk, prompt, state["lookups"]))
+
+        all_doc_results: list[list[dict]] = []
+        for doc, state in zip(documents, per_doc):
+            llm_needed = state["llm_needed"]
+            results = state["llm_results"]
+            if len(llm_needed) > MAX_PARAGRAPHS_PER_CHUNK:
+                results = self._validate_results(
+                    results, len(llm_needed), expected_ids=[p['id'] for p in llm_needed]
+                )
+            results = self.validate_zone_constraints(results, llm_needed, state["para_by_id"])
+            self.llm_predictions += len(results)
+
+            results = state["rule_predictions"] + results
+            results.sort(key=_BY_ID)
+            all_doc_results.append(results)
+
+        if self.enable_fallback and self.fallback_model:
+            # Every document's low-confidence groups in one submission
+            all_doc_results = self._process_fallback_many([
+                (results, state["para_by_id"], doc["document_name"])
+                for doc, state, results in zip(documents, per_doc, all_doc_results)
+            ])
+
+        return [_strip_recheck(results) for results in all_doc_results]
+
+    def _cache_results(
+        self,
+        document_name: str,
+        results: list[dict],
+        para_by_id: dict,
+        text_hashes: dict | None = None,
+        content: bool = True
+    ) -> None:
+        """
+        Store predictions in the per-document and content caches (one call each).
+
+        ``text_hashes`` holds the text digests already computed for the
+        cache lookup; paragraphs missing from it are hashed here.  With
+        ``content=False`` only the per-document layer is written (chunk
+        checkpoints, which are not final predictions).
+
+        Content hits in later documents skip both the LLM and the Flash
+        fallback, so only confident predictions go to the content layer:
+        at or above the fallback threshold and without a zone violation
+        (which also excludes confidence-0 "missing" placeholders).
+        """
+        text_hashes = text_hashes or {}
+        threshold = getattr(self, "fallback_threshold", FLASH_FALLBACK_THRESHOLD)
+        entries = []
+        content_entries = []
+        for result in results:
+            para_id = result.get('id')
+            para = para_by_id.get(para_id)
+            if para:
+                text_hash = text_hashes.get(para_id)
+                if text_hash is None:
+                    text_hash = self.cache.text_hash(para.get('text', ''))
+                metadata = para.get('metadata') or _EMPTY_META
+                zone = metadata.get('context_zone', 'BODY')
+                entries.append((document_name, para_id, text_hash, result, zone))
+                if result.get('confidence', 0) >= threshold and not result.get('zone_violation'):
+                    content_entries.append((text_hash, result, zone, metadata))
+        self.cache.set_many(entries)
+        if content:
+            self.cache.set_many_by_content(content_entries)
+
     def _process_fallback(
         self,
         results: list[dict],
         paragraphs: list[dict],
-        document_name: str
+        document_name: str,
+        para_by_id: dict | None = None
     ) -> list[dict]:
         """
         Process low-confidence items through Flash fallback model.
@@ -1229,78 +1939,183 @@ Classify each paragraph below:
             results: Initial classification results
             paragraphs: Original paragraphs with metadata
             document_name: Document name for logging
+            para_by_id: Prebuilt id -> paragraph lookup (replaces ``paragraphs``)
             
         Returns:
             Updated results with fallback improvements
         """
-        # Find low-confidence items
-        low_confidence = [
-            (i, r) for i, r in enumerate(results) 
-            if r.get('confidence', 100) < self.fallback_threshold
-        ]
-        
-        if not low_confidence:
-            logger.info("Flash fallback: No low-confidence items to process")
-            return results
-        
-        logger.info(f"Flash fallback: Processing {len(low_confidence)} low-confidence items (threshold: {self.fallback_threshold}%)")
-        
-        # Build paragraph lookup
-        para_by_id = {p['id']: p for p in paragraphs}
-        
+        if para_by_id is None:
+            para_by_id = {p['id']: p for p in paragraphs}
+        return self._process_fallback_many([(results, para_by_id, document_name)])[0]
+
+    def _process_fallback_many(self, documents: list[tuple[list[dict], dict, str]]) -> list[list[dict]]:
+        """
+        Flash fallback for several documents with a single submission.
+
+        ``documents`` holds (results, para_by_id, document_name) per document.
+        Each document's low-confidence items are grouped and prompted on their
+        own; every group of every document then goes out together, as one
+        Batch Mode job in batch mode or through the concurrent sync path.
+
+        Returns:
+            The updated results of each document, in input order
+        """
+        # (results, low-confidence items, number of groups) per document
+        plans = []
+        groups: list[list[tuple]] = []
+        prompts: list[str] = []
         # Group items for batch processing (max 30 items per call for focused analysis)
         batch_size = 30
-        improved_count = 0
-        
-        for batch_start in range(0, len(low_confidence), batch_size):
-            batch = low_confidence[batch_start:batch_start + batch_size]
+        for results, para_by_id, document_name in documents:
+            # Find low-confidence items; near-threshold items the primary model
+            # already re-checked in its own call are kept as they are
+            self_verified_floor = self.fallback_threshold - SELF_VERIFY_BAND
+            low_confidence = []
+            self_verified = 0
+            for i, r in enumerate(results):
+                confidence = r.get('confidence', 100)
+                if confidence >= self.fallback_threshold:
+                    continue
+                if r.get('recheck') and confidence >= self_verified_floor:
+                    self_verified += 1
+                    continue
+                low_confidence.append((i, r))
+
+            if self_verified:
+                logger.info(f"Flash fallback: {self_verified} near-threshold items already self-verified by the primary model")
             
-            # Build focused prompt for these specific items
-            fallback_prompt = self._build_fallback_prompt(batch, results, para_by_id, document_name)
+            if not low_confidence:
+                logger.info(f"Flash fallback: No low-confidence items to process in {document_name}")
+                plans.append((results, low_confidence, 0))
+                continue
             
-            try:
-                # Call Flash model
-                fallback_results = self._call_fallback_model(fallback_prompt, len(batch))
-                
-                # Merge improved results
-                for fb_result in fallback_results:
-                    item_id = fb_result.get('id')
-                    
-                    # Find original result index
-                    for orig_idx, orig_result in low_confidence:
-                        if results[orig_idx].get('id') == item_id:
-                            old_conf = results[orig_idx].get('confidence', 0)
-                            new_conf = fb_result.get('confidence', 0)
-                            old_tag = results[orig_idx].get('tag', '')
-                            new_tag = fb_result.get('tag', '')
-                            
-                            # Update if fallback has higher confidence or different tag
-                            if new_conf > old_conf or new_tag != old_tag:
-                                results[orig_idx]['tag'] = new_tag
-                                results[orig_idx]['confidence'] = new_conf
-                                results[orig_idx]['fallback_used'] = True
-                                results[orig_idx]['original_tag'] = old_tag
-                                results[orig_idx]['original_confidence'] = old_conf
-                                
-                                if fb_result.get('reasoning'):
-                                    results[orig_idx]['reasoning'] = f"[Flash] {fb_result['reasoning']}"
-                                
-                                if new_tag != old_tag:
-                                    improved_count += 1
-                                    logger.debug(f"  Para {item_id}: {old_tag} ({old_conf}%) → {new_tag} ({new_conf}%)")
-                            break
-                
-            except Exception as e:
-                logger.warning(f"Flash fallback batch failed: {e}")
+            logger.info(f"Flash fallback: Processing {len(low_confidence)} low-confidence items in {document_name} (threshold: {self.fallback_threshold}%)")
+            
+            doc_groups = [
+                low_confidence[batch_start:batch_start + batch_size]
+                for batch_start in range(0, len(low_confidence), batch_size)
+            ]
+            # Groups are re-evaluated concurrently (or as one Batch Mode job), so
+            # every prompt sees the primary-pass tags as neighbour context.
+            prompts.extend(
+                self._build_fallback_prompt(batch, results, para_by_id, document_name)
+                for batch in doc_groups
+            )
+            groups.extend(doc_groups)
+            plans.append((results, low_confidence, len(doc_groups)))
+
+        if not prompts:
+            return [results for results, _, _ in plans]
+
+        # Track fallback token usage (the client accumulates it thread-safely)
+        usage_before = self.fallback_model.get_token_usage()
+        if getattr(self, "fallback_mode", "sync") == "batch":
+            job_name = documents[0][2] if len(documents) == 1 else f"{len(documents)}-docs"
+            group_results = self._call_fallback_model_batch(prompts, groups, job_name)
+        else:
+            group_results = self._call_fallback_groups(prompts, groups)
+        usage_after = self.fallback_model.get_token_usage()
+        self.fallback_input_tokens += usage_after['total_input_tokens'] - usage_before['total_input_tokens']
+        self.fallback_output_tokens += usage_after['total_output_tokens'] - usage_before['total_output_tokens']
+
+        offset = 0
+        for results, low_confidence, group_count in plans:
+            if not low_confidence:
                 continue
+            doc_group_results = group_results[offset:offset + group_count]
+            offset += group_count
+
+            # Paragraph id -> index in results (first low-confidence occurrence)
+            index_by_id: dict = {}
+            for orig_idx, orig_result in low_confidence:
+                index_by_id.setdefault(orig_result.get('id'), orig_idx)
+
+            improved_count = 0
+            for fallback_results in doc_group_results:
+                if fallback_results is not None:
+                    improved_count += self._merge_fallback_results(results, index_by_id, fallback_results)
+            
+            self.fallback_calls += 1
+            self.items_improved += improved_count
+            
+            logger.info(f"Flash fallback complete: {improved_count} items improved out of {len(low_confidence)} processed")
         
-        self.fallback_calls += 1
-        self.items_improved += improved_count
-        
-        logger.info(f"Flash fallback complete: {improved_count} items improved out of {len(low_confidence)} processed")
-        
-        return results
+        return [results for results, _, _ in plans]
     
+    def _merge_fallback_results(
+        self,
+        results: list[dict],
+        index_by_id: dict,
+        fallback_results: list[dict],
+    ) -> int:
+        """
+        Merge one group of fallback results in place; returns the number of changed tags.
+
+        ``index_by_id`` maps each low-confidence paragraph id to its index in
+        ``results``; fallback items for any other id are ignored.
+        """
+        improved_count = 0
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for fb_result in fallback_results:
+            item_id = fb_result.get('id')
+            orig_idx = index_by_id.get(item_id)
+            if orig_idx is None:
+                continue
+
+            old_conf = results[orig_idx].get('confidence', 0)
+            new_conf = fb_result.get('confidence', 0)
+            old_tag = results[orig_idx].get('tag', '')
+            new_tag = fb_result.get('tag', '')
+            
+            # Update if fallback has higher confidence or different tag
+            if new_conf > old_conf or new_tag != old_tag:
+                results[orig_idx]['tag'] = new_tag
+                results[orig_idx]['confidence'] = new_conf
+                results[orig_idx]['fallback_used'] = True
+                results[orig_idx]['original_tag'] = old_tag
+                results[orig_idx]['original_confidence'] = old_conf
+                
+                if fb_result.get('reasoning'):
+                    results[orig_idx]['reasoning'] = f"[Flash] {fb_result['reasoning']}"
+                
+                if new_tag != old_tag:
+                    improved_count += 1
+                    if debug:
+                        logger.debug(f"  Para {item_id}: {old_tag} ({old_conf}%) → {new_tag} ({new_conf}%)")
+        return improved_count
+
+    def _call_fallback_model_batch(
+        self,
+        prompts: list[str],
+        groups: list[list[tuple]],
+        document_name: str,
+    ) -> list[Optional[list[dict]]]:
+        """
+        Send all fallback prompts (of one or several documents) as one Batch Mode job.
+
+        Returns parsed results per group (None for a failed request).  If the
+        job itself fails, the groups are re-evaluated synchronously.
+        """
+        try:
+            responses = self.fallback_model.generate_content_batch(
+                prompts, display_name=f"fallback-{document_name}"
+            )
+        except Exception as e:
+            logger.warning(f"Flash fallback batch job failed, re-evaluating synchronously: {e}")
+            return self._call_fallback_groups(prompts, groups)
+
+        group_results = []
+        for response, batch in zip(responses, groups):
+            if response is None:
+                group_results.append(None)
+                continue
+            try:
+                group_results.append(self._parse_json_response(response.text, len(batch)))
+            except Exception as e:
+                logger.warning(f"Flash fallback batch response unparseable: {e}")
+                group_results.append(None)
+        return group_results
+
     def _build_fallback_prompt(
         self,
         batch: list[tuple],
@@ -1309,6 +2124,7 @@ Classify each paragraph below:
         document_name: str
     ) -> str:
         """Build focused prompt for Flash fallback model."""
+        # One line per field; Reason/Context lines are left out when empty
         lines = []
         
         for orig_idx, result in batch:
@@ -1316,31 +2132,30 @@ Classify each paragraph below:
             para = para_by_id.get(item_id, {})
             
             text = para.get('text', '')
-            zone = para.get('metadata', {}).get('context_zone', 'BODY')
+            zone = (para.get('metadata') or _EMPTY_META).get('context_zone', 'BODY')
             current_tag = result.get('tag', 'TXT')
             current_conf = result.get('confidence', 0)
             reasoning = result.get('reasoning', '')
             
-            # Get context (previous and next paragraphs)
-            prev_result = results[orig_idx - 1] if orig_idx > 0 else None
-            next_result = results[orig_idx + 1] if orig_idx < len(results) - 1 else None
-            
-            context_info = ""
-            if prev_result:
-                context_info += f"BEFORE: [{prev_result.get('tag')}] "
-            if next_result:
-                context_info += f"AFTER: [{next_result.get('tag')}]"
+            # Neighbour tags; the Context line is only built when one exists
+            context = []
+            if orig_idx > 0:
+                context.append(f"BEFORE: [{results[orig_idx - 1].get('tag')}]")
+            if orig_idx + 1 < len(results):
+                context.append(f"AFTER: [{results[orig_idx + 1].get('tag')}]")
             
-            # Build item entry
-            lines.append(f"""
-[ID: {item_id}]
-Zone: {zone}
-Current: {current_tag} ({current_conf}%)
-{f'Reason: {reasoning}' if reasoning else ''}
-{f'Context: {context_info}' if context_info else ''}
-Text: {text}
-""")
+            # Build item entry (blank separator line first)
+            lines.append("")
+            lines.append(f"[ID: {item_id}]")
+            lines.append(f"Zone: {zone}")
+            lines.append(f"Current: {current_tag} ({current_conf}%)")
+            if reasoning:
+                lines.append(f"Reason: {reasoning}")
+            if context:
+                lines.append("Context: " + " ".join(context))
+            lines.append(f"Text: {text}")
         
+        items = "\n".join(lines)
         prompt = f"""Document: {document_name}
 
 The following {len(batch)} paragraphs received LOW CONFIDENCE scores from the primary classifier.
@@ -1352,7 +2167,8 @@ Focus on:
 3. Text patterns (bullets, numbers, headings, etc.)
 
 ---
-{''.join(lines)}
+{items}
+
 ---
 
 Return a JSON array with your classifications for all {len(batch)} items:
@@ -1360,20 +2176,39 @@ Return a JSON array with your classifications for all {len(batch)} items:
         
         return prompt
     
+    def _call_fallback_groups(
+        self,
+        prompts: list[str],
+        groups: list[list[tuple]],
+    ) -> list[Optional[list[dict]]]:
+        """
+        Re-evaluate fallback groups with synchronous calls, up to
+        MAX_PARALLEL_FALLBACK at a time.
+
+        Returns parsed results per group (None for a failed call).
+        """
+        def _run_group(prompt: str, batch: list[tuple]) -> Optional[list[dict]]:
+            try:
+                # Call Flash model
+                return self._call_fallback_model(prompt, len(batch))
+            except Exception as e:
+                logger.warning(f"Flash fallback batch failed: {e}")
+                return None
+
+        if len(prompts) <= 1:
+            return [_run_group(p, b) for p, b in zip(prompts, groups)]
+
+        workers = min(MAX_PARALLEL_FALLBACK, len(prompts))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_run_group, prompts, groups))
+
     def _call_fallback_model(self, prompt: str, expected_count: int) -> list[dict]:
         """Call the Flash fallback model."""
         logger.debug(f"Calling Flash fallback model for {expected_count} items")
 
-        response = self.fallback_model.generate_content(prompt, timeout=60)
-
-        # Track fallback token usage (accumulate across calls)
-        last_usage = self.fallback_model.get_last_usage()
-        if last_usage:
-            input_tokens = last_usage.get('input_tokens', 0)
-            output_tokens = last_usage.get('output_tokens', 0)
-            self.fallback_input_tokens += input_tokens
-            self.fallback_output_tokens += output_tokens
-            logger.debug(f"Flash fallback tokens - Input: {input_tokens}, Output: {output_tokens}")
+        response = self._call_with_adaptive_timeout(
+            "fallback", self.fallback_model.generate_content, prompt, FALLBACK_TIMEOUT
+        )
 
         # Parse response
         results = self._parse_json_response(response.text, expected_count)
@@ -1383,20 +2218,77 @@ Return a JSON array with your classifications for all {len(batch)} items:
         """
         Wrapper for model generation (allows test mocking).
         """
-        return self.model.generate_content(prompt, timeout=self.api_timeout)
+        return self._call_with_adaptive_timeout(
+            "primary", self.model.generate_content, prompt, self.api_timeout
+        )
 
-    def _find_invalid_tags(
+    def _call_with_adaptive_timeout(
         self,
-        results: list[dict],
-        meta_by_id: dict | None = None,
-        text_by_id: dict | None = None
-    ) -> set[str]:
+        kind: str,
+        generate: Callable,
+        prompt: str,
+        timeout: float,
+    ):
+        """
+        Call generate(prompt, timeout=...) with a latency-derived timeout.
+
+        Latencies are kept per process, so the history carries over from one
+        document's classifier to the next.  Until ADAPTIVE_TIMEOUT_MIN_SAMPLES
+        calls of this kind have succeeded, or when the adaptive limit is not
+        below ``timeout``, this is a plain call.  Adaptive attempts make a single request each (no client-side
+        backoff); any error other than a timeout is left to the final
+        full-timeout call and the client's own retry loop.
+        """
+        with _LATENCY_LOCK:
+            latencies = _CALL_LATENCIES.setdefault(kind, deque(maxlen=ADAPTIVE_TIMEOUT_WINDOW))
+            limit = None
+            if len(latencies) >= ADAPTIVE_TIMEOUT_MIN_SAMPLES:
+                limit = max(ADAPTIVE_TIMEOUT_FLOOR, ADAPTIVE_TIMEOUT_FACTOR * statistics.median(latencies))
+
+        if limit is not None and limit < timeout:
+            for attempt in range(1, TIMEOUT_RETRIES + 1):
+                take_last_attempt_seconds()
+                started = time.perf_counter()
+                try:
+                    response = generate(prompt, timeout=limit, max_retries=1)
+                except Exception as e:
+                    if not _is_timeout_error(e):
+                        break
+                    logger.warning(
+                        f"{kind} call exceeded adaptive timeout {limit:.1f}s "
+                        f"(attempt {attempt}/{TIMEOUT_RETRIES}), re-issuing"
+                    )
+                    continue
+                self._note_call_latency(latencies, started)
+                return response
+
+        take_last_attempt_seconds()
+        started = time.perf_counter()
+        response = generate(prompt, timeout=timeout)
+        self._note_call_latency(latencies, started)
+        return response
+
+    @staticmethod
+    def _note_call_latency(latencies: deque, started: float) -> None:
+        """
+        Record the successful request's duration for the adaptive timeout and
+        for the calling thread's chunk size measurement.
+
+        GeminiClient reports the attempt that succeeded, without 429 backoff
+        or failed attempts; other callables are timed from ``started``.
+        """
+        seconds = take_last_attempt_seconds()
+        if seconds is None:
+            seconds = time.perf_counter() - started
+        _CALL_TIMING.seconds = seconds
+        with _LATENCY_LOCK:
+            latencies.append(seconds)
+
+    def _find_invalid_tags(self, results: list[dict], contexts: _AliasContexts) -> set[str]:
+        resolve = self._resolve_tag_alias
         invalid = set()
         for r in results:
-            rid = r.get("id")
-            meta = meta_by_id.get(rid) if meta_by_id else None
-            text = text_by_id.get(rid, "") if text_by_id else ""
-            tag = self._map_tag_alias(r.get("tag", ""), meta=meta, text=text)
+            tag = resolve(str(r.get("tag") or ""), *contexts[r.get("id")])
             if tag and tag not in VALID_TAGS:
                 invalid.add(tag)
         return invalid
@@ -1405,47 +2297,59 @@ Return a JSON array with your classifications for all {len(batch)} items:
         self,
         results: list[dict],
         meta_by_id: dict | None = None,
-        text_by_id: dict | None = None
+        text_by_id: dict | None = None,
+        contexts: _AliasContexts | None = None
     ) -> list[dict]:
         """
         Normalize and validate tags using normalize_tag() with membership enforcement.
         Falls back to grounded retrieval if normalize_tag() returns a generic fallback.
         """
-        for r in results:
+        # Pass 1: normalize every tag, collecting the items that ended on a
+        # generic fallback so grounded retrieval runs once for all of them
+        normalized = []
+        grounded_candidates = []
+        for index, r in enumerate(results):
             rid = r.get("id")
             meta = meta_by_id.get(rid) if meta_by_id else None
             text = text_by_id.get(rid, "") if text_by_id else ""
             raw_tag = r.get("tag", "")
+            context = contexts[rid] if contexts is not None else _alias_context(meta, text)
 
-            # First, apply basic alias mapping
-            mapped_tag = self._map_tag_alias(raw_tag, meta=meta, text=text)
-
-            # Then, apply normalize_tag() which enforces membership in allowed_styles.json
-            normalized_tag = normalize_tag(mapped_tag, meta=meta)
+            # Basic alias mapping, then normalize_tag() which enforces
+            # membership in allowed_styles.json (one memoized step)
+            mapped_tag, normalized_tag = self._resolve_normalized_tag(str(raw_tag or ""), *context)
+            normalized.append(normalized_tag)
 
             # If normalize_tag() returned a generic fallback (TXT) and we have grounded retrieval,
             # try to find a better match from ground truth
             if normalized_tag in {"TXT", "TXT-FLUSH"} and self.retriever and text and mapped_tag not in VALID_TAGS:
-                try:
-                    # Retrieve most similar example from ground truth
-                    zone = (meta or {}).get("context_zone", "BODY")
-                    similar = self.retriever.retrieve_examples(
-                        text=text,
-                        k=1,  # Get top-1 most similar
-                        zone=zone
-                    )
-
-                    if similar and similar[0].get('similarity_score', 0) > 0.7:
-                        grounded_tag = similar[0].get("canonical_gold_tag", "TXT")
-                        # Validate grounded tag is in allowed_styles
-                        validated_grounded = normalize_tag(grounded_tag, meta=meta)
-                        if validated_grounded != "TXT" or grounded_tag == "TXT":
-                            normalized_tag = validated_grounded
-                            logger.debug(f"Invalid tag '{raw_tag}' -> grounded fallback '{normalized_tag}' (similarity: {similar[0].get('similarity_score', 0):.3f})")
-                except Exception as e:
-                    logger.warning(f"Grounded fallback failed: {e}")
+                grounded_candidates.append((index, text, meta))
 
-            # Update tag with normalized/validated version
+        # Pass 2: one batched retrieval for all candidates (top-1 most similar each)
+        if grounded_candidates:
+            try:
+                matches = self.retriever.retrieve_examples_batch(
+                    texts=[text for _, text, _ in grounded_candidates],
+                    zones=[(meta or {}).get("context_zone", "BODY") for _, _, meta in grounded_candidates],
+                    k=1,
+                )
+            except Exception as e:
+                logger.warning(f"Grounded fallback failed: {e}")
+                matches = []
+
+            for (index, _, meta), similar in zip(grounded_candidates, matches):
+                if similar and similar[0].get('similarity_score', 0) > 0.7:
+                    grounded_tag = similar[0].get("canonical_gold_tag", "TXT")
+                    # Validate grounded tag is in allowed_styles
+                    validated_grounded = normalize_tag(grounded_tag, meta=meta)
+                    if validated_grounded != "TXT" or grounded_tag == "TXT":
+                        normalized[index] = validated_grounded
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"Invalid tag '{results[index].get('tag', '')}' -> grounded fallback '{validated_grounded}' (similarity: {similar[0].get('similarity_score', 0):.3f})")
+
+        # Update tags with normalized/validated versions
+        for r, normalized_tag in zip(results, normalized):
+            raw_tag = r.get("tag", "")
             if normalized_tag != raw_tag:
                 r["tag"] = normalized_tag
                 r["confidence"] = min(int(r.get("confidence", 50)), 60)
@@ -1455,27 +2359,93 @@ Return a JSON array with your classifications for all {len(batch)} items:
 
         return results
     
+    def _record_chunk_latency(self, paragraph_count: int, seconds: float) -> None:
+        """
+        Fold one primary-call latency into the process-wide chunk size curve.
+
+        Calls well below their bucket's size (short tail chunks) are skipped;
+        they would make that size look faster than it is.
+        """
+        bucket = next(
+            (size for size in CHUNK_SIZE_CANDIDATES if paragraph_count <= size),
+            CHUNK_SIZE_CANDIDATES[-1],
+        )
+        if paragraph_count < CHUNK_BUCKET_MIN_FILL * bucket:
+            return
+        with _LATENCY_LOCK:
+            previous = _CHUNK_SIZE_CURVE.get(bucket)
+            _CHUNK_SIZE_CURVE[bucket] = seconds if previous is None else (
+                previous + CHUNK_LATENCY_SMOOTHING * (seconds - previous)
+            )
+
+    def _pick_chunk_size(self, total_paragraphs: int) -> int:
+        """
+        Pick the paragraphs-per-call limit for a document.
+
+        Predicted wall-clock for size k is the number of parallel waves,
+        ceil(ceil(n / k) / MAX_PARALLEL_CHUNKS), times the measured latency of
+        k-sized calls.  Only measured sizes are compared; with no
+        measurements yet the fixed MAX_PARAGRAPHS_PER_CHUNK is used.  With
+        probability CHUNK_SIZE_EXPLORE_RATE a document instead tries an
+        unmeasured size whose chunks it can fill, so a size measured early
+        cannot lock out the others.
+        """
+        if total_paragraphs <= 0:
+            return MAX_PARAGRAPHS_PER_CHUNK
+        with _LATENCY_LOCK:
+            curve = dict(_CHUNK_SIZE_CURVE)
+
+        untested = [
+            size for size in CHUNK_SIZE_CANDIDATES
+            if size not in curve
+            and total_paragraphs / -(-total_paragraphs // size) >= CHUNK_BUCKET_MIN_FILL * size
+        ]
+        if untested and random.random() < CHUNK_SIZE_EXPLORE_RATE:
+            return random.choice(untested)
+        if not curve:
+            return MAX_PARAGRAPHS_PER_CHUNK
+
+        best_size = MAX_PARAGRAPHS_PER_CHUNK
+        best_time = None
+        for size, latency in sorted(curve.items(), reverse=True):
+            calls = -(-total_paragraphs // size)
+            waves = -(-calls // MAX_PARALLEL_CHUNKS)
+            predicted = waves * latency
+            # Ties go to the larger size (fewer calls, fewer tokens of overhead)
+            if best_time is None or predicted < best_time:
+                best_size, best_time = size, predicted
+        return best_size
+
     def _classify_chunk(
         self,
         paragraphs: list[dict],
         document_name: str,
         document_type: str,
-        chunk_info: str = ""
+        chunk_info: str = "",
+        lookups: tuple[dict, dict] | None = None
     ) -> list[dict]:
         """
         Classify a chunk of paragraphs.
         Retries are handled by GeminiClient internally.
+
+        ``lookups`` is the document's (meta_by_id, text_by_id) pair, built
+        once by classify(); without it the chunk builds its own.
         """
         user_prompt = self.build_user_prompt(paragraphs, document_name, document_type, chunk_info)
 
         logger.info(f"Sending {len(paragraphs)} paragraphs to Gemini API")
 
         # Make API call (retries handled internally by GeminiClient)
+        _CALL_TIMING.seconds = None
         response = self._generate_content(user_prompt)
+        seconds = _CALL_TIMING.seconds
+        if seconds is not None:
+            self._record_chunk_latency(len(paragraphs), seconds)
         logger.info("Received response from Gemini API")
 
-        # Log token usage (tracked by GeminiClient)
-        last_usage = self.model.get_last_usage()
+        # Log this call's token usage; chunks run in parallel, so the client's
+        # "last call" could belong to another chunk
+        last_usage = GeminiClient.response_usage(response)
         total_usage = self.model.get_token_usage()
 
         if last_usage:
@@ -1492,14 +2462,29 @@ Return a JSON array with your classifications for all {len(batch)} items:
         else:
             logger.warning("Token usage metadata not available in response")
 
-        # Parse JSON response with robust handling
-        results = self._parse_json_response(response.text, len(paragraphs))
-        meta_by_id = {p.get("id"): p.get("metadata", {}) for p in paragraphs}
-        text_by_id = {p.get("id"): p.get("text", "") for p in paragraphs}
-        results = self._apply_alias_mappings(results, meta_by_id=meta_by_id, text_by_id=text_by_id)
+        return self._finish_chunk(response.text, paragraphs, user_prompt, lookups)
+
+    def _finish_chunk(
+        self,
+        response_text: str,
+        paragraphs: list[dict],
+        user_prompt: str,
+        lookups: tuple[dict, dict] | None = None,
+    ) -> list[dict]:
+        """
+        Parse, alias-map, self-heal and validate one chunk's model response.
+        """
+        results = self._parse_json_response(response_text, len(paragraphs))
+        model_tags = _recheck_tags(results)
+        if lookups is None:
+            lookups = self._paragraph_lookups({p.get("id"): p for p in paragraphs})
+        meta_by_id, text_by_id = lookups
+        # Shared by the alias, invalid-tag and post-validation passes below
+        contexts = _AliasContexts(meta_by_id, text_by_id)
+        results = self._apply_alias_mappings(results, contexts)
 
         # Self-heal if invalid tags detected
-        invalid = self._find_invalid_tags(results, meta_by_id, text_by_id)
+        invalid = self._find_invalid_tags(results, contexts)
         if invalid:
             logger.warning(f"Invalid tags detected: {sorted(invalid)}. Retrying once with correction.")
             correction_prompt = (
@@ -1510,26 +2495,31 @@ Return a JSON array with your classifications for all {len(batch)} items:
             )
             response = self._generate_content(correction_prompt)
             results = self._parse_json_response(response.text, len(paragraphs))
-            results = self._apply_alias_mappings(results, meta_by_id=meta_by_id, text_by_id=text_by_id)
-            invalid = self._find_invalid_tags(results, meta_by_id, text_by_id)
+            model_tags = _recheck_tags(results)
+            results = self._apply_alias_mappings(results, contexts)
+            invalid = self._find_invalid_tags(results, contexts)
             if invalid:
                 logger.warning(f"Invalid tags persist after retry: {sorted(invalid)}. Using grounded fallback.")
-                results = self._force_invalid_to_txt(results, meta_by_id, text_by_id)
+                results = self._force_invalid_to_txt(results, meta_by_id, text_by_id, contexts)
 
         # Validate results for this chunk
-        validated = self._validate_results(results, len(paragraphs), paragraphs[0]['id'])
+        validated = self._validate_results(
+            results, len(paragraphs), expected_ids=[p['id'] for p in paragraphs]
+        )
 
         # Ensure no invalid tags remain after validation
+        resolve = self._resolve_tag_alias
         for r in validated:
-            meta = meta_by_id.get(r.get("id")) if meta_by_id else None
-            text = text_by_id.get(r.get("id"), "") if text_by_id else ""
-            tag = self._map_tag_alias(r.get("tag", ""), meta=meta, text=text)
+            tag = resolve(str(r.get("tag") or ""), *contexts[r.get("id")])
             if tag and tag not in VALID_TAGS:
                 r["tag"] = "TXT"
                 r["confidence"] = min(int(r.get("confidence", 50)), 50)
                 r["reasoning"] = f"Invalid tag '{tag}' downgraded to TXT"
             else:
                 r["tag"] = tag
+            # The model's re-check vouches only for the tag it gave itself
+            if r.get("recheck") and model_tags.get(r.get("id")) != r["tag"]:
+                del r["recheck"]
 
         logger.info(f"Classified {len(validated)} paragraphs")
         return validated
@@ -1540,29 +2530,29 @@ Return a JSON array with your classifications for all {len(batch)} items:
         """
         # Strategy 1: Direct parse
         try:
-            results = json.loads(response_text)
+            results = _loads_json(response_text)
             if isinstance(results, list):
-                return results
+                return _intern_tags(results)
         except json.JSONDecodeError:
             pass
         
         # Strategy 2: Extract JSON array from text
         try:
-            json_match = re.search(r'\[[\s\S]*\]', response_text)
+            json_match = _JSON_ARRAY_RE.search(response_text)
             if json_match:
-                results = json.loads(json_match.group())
+                results = _loads_json(json_match.group())
                 if isinstance(results, list):
-                    return results
+                    return _intern_tags(results)
         except json.JSONDecodeError:
             pass
         
         # Strategy 3: Fix truncated JSON
         try:
             fixed = self._fix_truncated_json(response_text)
-            results = json.loads(fixed)
+            results = _loads_json(fixed)
             if isinstance(results, list):
                 logger.warning(f"Fixed truncated JSON, got {len(results)} items")
-                return results
+                return _intern_tags(results)
         except json.JSONDecodeError:
             pass
         
@@ -1571,7 +2561,7 @@ Return a JSON array with your classifications for all {len(batch)} items:
             results = self._parse_individual_objects(response_text)
             if results:
                 logger.warning(f"Parsed {len(results)} individual objects from malformed JSON")
-                return results
+                return _intern_tags(results)
         except Exception:
             pass
         
@@ -1584,8 +2574,8 @@ Return a JSON array with your classifications for all {len(batch)} items:
         Attempt to fix truncated JSON array.
         """
         # Remove any markdown code fences
-        text = re.sub(r'```json\s*', '', text)
-        text = re.sub(r'```\s*', '', text)
+        if '```' in text:
+            text = _JSON_FENCE_RE.sub('', text)
         text = text.strip()
         
         # Ensure it starts with [
@@ -1619,9 +2609,7 @@ Return a JSON array with your classifications for all {len(batch)} items:
         results = []
         
         # Find all JSON-like objects
-        pattern = r'\{\s*"id"\s*:\s*(\d+)\s*,\s*"tag"\s*:\s*"([^"]+)"\s*,\s*"confidence"\s*:\s*(\d+)'
-        
-        for match in re.finditer(pattern, text):
+        for match in _RESULT_OBJ_RE.finditer(text):
             results.append({
                 "id": int(match.group(1)),
                 "tag": match.group(2),
@@ -1634,179 +2622,83 @@ Return a JSON array with your classifications for all {len(batch)} items:
         self, 
         results: list[dict], 
         expected_count: int,
-        start_id: int = 1
+        start_id: int = 1,
+        expected_ids: Iterable[int] | None = None,
     ) -> list[dict]:
         """
         Validate and clean classification results.
+
+        Ids missing from the response get a TXT placeholder.  The expected ids
+        are ``expected_ids`` when given (paragraph ids need not be contiguous
+        after rule filtering and de-duplication), else ``expected_count`` ids
+        counting up from ``start_id``.
         """
         validated = []
         
-        # Comprehensive style mapping from common source formats to WK Template
-        STYLE_MAP = {
-            # Chapter openers
-            "CHAPTERNUMBER": "CN", "CHAPTER NUMBER": "CN", "CHAP-NUM": "CN",
-            "CHAPTERTITLE": "CT", "CHAPTER TITLE": "CT", "CHAP-TITLE": "CT",
-            "CHAPTERAUTHOR": "CAU", "CHAPTER AUTHOR": "CAU",
-            "CHAPTERTITLEFOOTNOTE": "TFN",
-            
-            # Headings - various source formats
-            "HEAD1": "H1", "HEAD-1": "H1", "HEADING1": "H1", "HEADING 1": "H1",
-            "HEAD2": "H2", "HEAD-2": "H2", "HEADING2": "H2", "HEADING 2": "H2",
-            "HEAD3": "H3", "HEAD-3": "H3", "HEADING3": "H3", "HEADING 3": "H3",
-            "HEAD4": "H4", "HEAD-4": "H4", "HEADING4": "H4", "HEADING 4": "H4",
-            "HEAD5": "H5", "HEAD-5": "H5", "HEADING5": "H5", "HEADING 5": "H5",
-            "BHEAD AFTER HEAD": "H2",
-            "SPECIALHEADING2": "H2",
-            
-            # Body text variations
-            "PARA-FL": "TXT-FLUSH", "PARAFL": "TXT-FLUSH", "PARA FL": "TXT-FLUSH",
-            "PARAFIRSTLINE-IND": "TXT", "PARA-FIRSTLINE-IND": "TXT",
-            "TX": "TXT", "TXFL": "TXT-FLUSH", "TXL": "TXT",
-            "BODYTEXT": "TXT", "BODY TEXT": "TXT", "BODY-TEXT": "TXT",
-            "PARAGRAPH": "TXT", "PARA": "TXT", "TEXT": "TXT",
-            
-            # Lists - unordered/bullet
-            "UC-ALPHATLIST1": "UL-FIRST", "UC-ALPHALIST1": "UL-MID",
-            "BULLETLIST1": "BL-MID", "BULLET LIST 1": "BL-MID",
-            "BULLETLIST1_FIRST": "BL-FIRST", "BULLETLIST1_LAST": "BL-LAST",
-            "BULLETLIST2": "BL2-MID",
-            "LC-ALPHALIST3": "UL-MID", "LC-ROMANLIST4": "UL-MID",
-            
-            # Lists - numbered
-            "NUMBERLIST1": "NL-MID", "NUMBER LIST 1": "NL-MID",
-            "NUMBERLIST2": "NL-MID", "NUMBER LIST 2": "NL-MID",
-            
-            # References
-            "REFERENCE-ALPHABETICAL": "REF-N", "REFERENCEALPHABETICAL": "REF-N",
-            "REFERENCE-NUMBERED": "REF-N", "REFERENCENUMBERED": "REF-N",
-            "REF-U": "REF-N", "EOC_REF": "REF-N",
-            
-            # Figures and tables
-            "FIGURELEGEND": "FIG-LEG", "FIGURE LEGEND": "FIG-LEG",
-            "FIGURECAPTION": "FIG-LEG", "FIGURE CAPTION": "FIG-LEG",
-            "FIGURESOURCE": "TSN", "FIG-SRC": "TSN", "UNFIG-SRC": "TSN",
-            "TABLECAPTION": "T1", "TABLE CAPTION": "T1", "TABLECAPTIONS": "PMI",
-            "TABLEFOOTNOTE": "TFN", "TABLE FOOTNOTE": "TFN",
-            "UNT-T1": "T1",  # Unnumbered table title
-            "TABLETITLE": "T1", "TABLE TITLE": "T1",
-            "TABLEHEADER": "T2", "TABLE HEADER": "T2",
-            "TABLEBODY": "T", "TABLE BODY": "T",
-            "TABLESOURCE": "TSN", "TABLE SOURCE": "TSN",
-            "TABLECELL": "T", "TABLE CELL": "T",
-            # Table cell content styles from training data
-            "GT": "T",  # Generic table cell
-            "UNT": "T",  # Unnumbered table text
-            "UNT-T2": "T2",  # Unnumbered table header
-            "UNT-BL-MID": "TBL-MID",  # Unnumbered table bullet
-            "TABLECOLUMNHEAD1": "T2",  # Table column header
-            
-            # Box/special content - NBX styles (keep in NBX format)
-            "NBX-BL-MID": "NBX-BL-MID", "NBX-BL-FIRST": "NBX-BL-FIRST", "NBX-BL-LAST": "NBX-BL-LAST",
-            "NBX-H1": "H1", "NBX-H2": "H2",
-            "NBX-UL-MID": "NBX-UL-MID", "NBX-UL-FIRST": "NBX-UL-FIRST", "NBX-UL-LAST": "NBX-UL-LAST",
-            "BOX-01-BULLETLIST1": "BX1-BL-MID",
-            
-            # Box type mappings
-            "NOTE": "NBX-TTL", "CLINICAL PEARL": "BX1-TTL", "RED FLAG": "BX2-TTL",
-            "TIP": "BX1-TTL", "WARNING": "BX2-TTL", "ALERT": "BX2-TTL",
-            
-            # Source/citation mappings
-            "CITATION": "TSN", "SOURCE": "TSN", "FIG-SRC": "TSN",
-            
-            # Case study and special
-            "CASESTUDY-DIALOGUE": "TXT", "CASESTUDY-UL-FL1": "UL-FIRST",
-            
-            # End of chapter
-            "EOC_NL": "EOC-NL-MID", "EOC_NLLL": "EOC-NL-MID",
-            "EOC-NUMBERLIST1": "EOC-NL-MID", "EOC-BULLETLIST2": "EOC-NL-MID",
-            "EOC-PARA-FL": "TXT-FLUSH",
-            
-            # Metadata/instructions and markers
-            "METADATA": "PMI", "<METADATA>": "PMI", "</METADATA>": "PMI",
-            "<NOTE>": "PMI", "</NOTE>": "PMI",
-            "<CLINICAL PEARL>": "PMI", "</CLINICAL PEARL>": "PMI",
-            "<RED FLAG>": "PMI", "</RED FLAG>": "PMI",
-            "<BOX>": "PMI", "</BOX>": "PMI",
-            "<TIP>": "PMI", "</TIP>": "PMI",
-            
-            # Normal/default
-            "NORMAL": "TXT", "DEFAULT": "TXT", "STANDARD": "TXT",
-        }
         
         for result in results:
             # Ensure required fields
             if "id" not in result or "tag" not in result:
                 continue
             
-            # Validate tag
-            tag = result["tag"]
-            original_tag = tag
+            # Validate tag: canonical tags (the common case) pass straight
+            # through; others get one memoized resolution per distinct tag
+            original_tag = result["tag"]
+            if original_tag in _VALIDATED_TAGS:
+                tag, recognised = original_tag, True
+            else:
+                tag, recognised = self._resolve_result_tag(original_tag)
+            if not recognised:
+                result["confidence"] = min(result.get("confidence", 50), 50)
+                result["reasoning"] = f"Unknown tag '{original_tag}' mapped to {tag}"
             
-            if normalize_style(tag) not in VALID_TAGS:
-                tag = self._map_tag_alias(tag)
-            if normalize_style(tag) not in VALID_TAGS:
-                # Try uppercase
-                tag_upper = tag.upper().replace(" ", "").replace("_", "-")
-                if normalize_style(tag_upper) in VALID_TAGS:
-                    tag = tag_upper
-                else:
-                    # Check style map
-                    tag_lookup = tag.upper().replace("-", " ").replace("_", " ")
-                    tag_lookup_dash = tag.upper().replace(" ", "-").replace("_", "-")
-                    
-                    if tag_lookup in STYLE_MAP:
-                        tag = STYLE_MAP[tag_lookup]
-                    elif tag_lookup_dash in STYLE_MAP:
-                        tag = STYLE_MAP[tag_lookup_dash]
-                    elif tag.upper() in STYLE_MAP:
-                        tag = STYLE_MAP[tag.upper()]
-                    else:
-                        # Try common underscore fixes
-                        tag_fixes = {
-                            "TXT_FLUSH": "TXT-FLUSH",
-                            "BL_FIRST": "BL-FIRST",
-                            "BL_MID": "BL-MID",
-                            "BL_LAST": "BL-LAST",
-                            "NL_FIRST": "NL-FIRST",
-                            "NL_MID": "NL-MID",
-                            "NL_LAST": "NL-LAST",
-                            "UL_FIRST": "UL-FIRST",
-                            "UL_MID": "UL-MID",
-                            "UL_LAST": "UL-LAST",
-                        }
-                        tag = tag_fixes.get(tag.upper(), "TXT")
-                        result["confidence"] = min(result.get("confidence", 50), 50)
-                        result["reasoning"] = f"Unknown tag '{original_tag}' mapped to {tag}"
+            recheck = result.get("recheck") is True
+            if len(result) == 2 + ("confidence" in result) + ("reasoning" in result) + recheck:
+                # Parsed dict already has the result shape: update it in place
+                result["tag"] = tag
+                if "confidence" not in result:
+                    result["confidence"] = 85
+                if "reasoning" not in result:
+                    result["reasoning"] = None
+                validated.append(result)
+                continue
             
-            validated.append({
+            item = {
                 "id": result["id"],
                 "tag": tag,
                 "confidence": result.get("confidence", 85),
                 "reasoning": result.get("reasoning")
-            })
+            }
+            if recheck:
+                item["recheck"] = True
+            validated.append(item)
         
-        # Check for missing paragraphs
+        # Check for missing paragraphs (set difference; usually empty)
         found_ids = {r["id"] for r in validated}
-        end_id = start_id + expected_count
-        
-        for i in range(start_id, end_id):
-            if i not in found_ids:
-                validated.append({
-                    "id": i,
-                    "tag": "TXT",
-                    "confidence": 0,
-                    "reasoning": "Missing from API response"
-                })
+        if expected_ids is None:
+            expected_ids = range(start_id, start_id + expected_count)
+        missing = set(expected_ids)
+        missing.difference_update(found_ids)
+        validated.extend(
+            {
+                "id": i,
+                "tag": "TXT",
+                "confidence": 0,
+                "reasoning": "Missing from API response"
+            }
+            for i in missing
+        )
         
         # Sort by ID
-        validated.sort(key=lambda x: x["id"])
+        validated.sort(key=_BY_ID)
         
         return validated
     
     def validate_zone_constraints(
         self,
         results: list[dict],
-        paragraphs: list[dict]
+        paragraphs: list[dict],
+        para_by_id: dict | None = None
     ) -> list[dict]:
         """
         Post-validate classification results against zone constraints.
@@ -1815,6 +2707,7 @@ Return a JSON array with your classifications for all {len(batch)} items:
         Args:
             results: Classification results from AI
             paragraphs: Original paragraphs with zone metadata
+            para_by_id: Prebuilt id -> paragraph lookup (replaces ``paragraphs``)
             
         Returns:
             Results with zone violation flags added
@@ -1823,7 +2716,8 @@ Return a JSON array with your classifications for all {len(batch)} items:
 
         
         # Build paragraph lookup by ID
-        para_by_id = {p['id']: p for p in paragraphs}
+        if para_by_id is None:
+            para_by_id = {p['id']: p for p in paragraphs}
         
         for result in results:
             para_id = result.get('id')
@@ -1832,46 +2726,48 @@ Return a JSON array with your classifications for all {len(batch)} items:
             if not para:
                 continue
             
-            zone = para.get('metadata', {}).get('context_zone', 'BODY')
-            style = result.get('tag', '')
-            text = para.get('text', '')
-            meta = para.get('metadata', {})
+            meta = para.get('metadata') or _EMPTY_META
+            zone = meta.get('context_zone', 'BODY')
             
             # Skip BODY zone (no restrictions)
             if zone == 'BODY':
                 continue
+
+            style = result.get('tag', '')
+            text = para.get('text', '')
             
             # Check if style is valid for zone
-            if not validate_style_for_zone(style, zone):
+            is_valid = make_zone_validator(zone)
+            if not is_valid(style):
                 # First try alias remap with zone/text context.
                 remapped = self._map_tag_alias(style, meta=meta, text=text)
-                if remapped and validate_style_for_zone(remapped, zone):
+                if remapped and is_valid(remapped):
                     result['tag'] = remapped
+                    result.pop('recheck', None)
                     continue
 
                 # Deterministic zone fallback to reduce noisy invalid outputs.
+                # The bullet cue comes from the same memoized scan the alias remap used
                 fallback = None
                 if zone == 'TABLE':
-                    text_lower = (text or "").strip().lower()
-                    if text_lower.startswith(("note", "source")):
+                    if (text or "").lstrip()[:6].lower().startswith(("note", "source")):
                         fallback = "TFN"
-                    elif bool(REF_BULLET_RE.match((text or "").strip())):
+                    elif _text_bulleted(text or ""):
                         fallback = "TBL-MID"
-                    elif bool(REF_NUMBER_RE.match((text or "").strip())):
+                    elif _text_numbered(text or ""):
                         fallback = "TNL-MID"
                     else:
                         fallback = "T"
                 elif zone == 'BACK_MATTER':
-                    fallback = "REF-U" if bool(REF_BULLET_RE.match((text or "").strip())) else "REF-N"
-                elif zone == 'METADATA':
-                    fallback = "PMI"
+                    fallback = "REF-U" if _text_bulleted(text or "") else "REF-N"
                 else:
-                    fallback = "TXT"
+                    fallback = _ZONE_FALLBACK_STYLES.get(zone, "TXT")
 
-                if fallback and validate_style_for_zone(fallback, zone):
+                if fallback and is_valid(fallback):
                     result['tag'] = fallback
-                    original_confidence = result.get('confidence', 85)
-                    result['confidence'] = min(original_confidence, 70)
+                    result.pop('recheck', None)
+                    if result.get('confidence', 85) > 70:
+                        result['confidence'] = 70
                     continue
 
                 # Flag as zone violation
@@ -1886,8 +2782,8 @@ Return a JSON array with your classifications for all {len(batch)} items:
                     result['zone_suggestions'] = suggestions
                 
                 # Reduce confidence to flag for review
-                original_confidence = result.get('confidence', 85)
-                result['confidence'] = min(original_confidence, 60)
+                if result.get('confidence', 85) > 60:
+                    result['confidence'] = 60
                 
                 # Add reasoning
                 existing_reason = result.get('reasoning', '')
@@ -1982,6 +2878,38 @@ def classify_document(
     return results, token_usage
 
 
+def classify_documents_batch(
+    documents: list[dict],
+    api_key: str,
+    document_type: str = "Academic Document",
+    enable_fallback: bool = True,
+    fallback_threshold: int = FLASH_FALLBACK_THRESHOLD
+) -> tuple[list[list[dict]], dict]:
+    """
+    Classify several documents through Gemini Batch Mode (non-interactive).
+
+    Args:
+        documents: List of dicts with ``paragraphs`` and ``document_name``
+        api_key: Google AI API key
+        document_type: Type of document
+        enable_fallback: Whether to use Flash fallback for low-confidence items
+            (re-evaluated through Batch Mode as well)
+        fallback_threshold: Confidence threshold for fallback (default: 75%)
+
+    Returns:
+        Tuple of (one result list per document, token usage dict)
+    """
+    classifier = GeminiClassifier(
+        api_key,
+        enable_fallback=enable_fallback,
+        fallback_threshold=fallback_threshold,
+        fallback_mode="batch",
+    )
+    results = classifier.classify_batch(documents, document_type)
+    token_usage = classifier.get_token_usage()
+    return results, token_usage
+
+
 def classify_blocks(
     blocks: list[dict],
     document_name: str,
@@ -7,15 +7,54 @@ Separates results into auto-apply and review queues.
 """
 
 import logging
+from operator import attrgetter
+from types import MappingProxyType
 from typing import Optional
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
+# Common alternatives for low-confidence results, by tag type (read-only)
+_ALTERNATIVES_MAP = MappingProxyType({
+    # Headings - could be different levels
+    "H1": ("H2", "CT", "SP-H1"),
+    "H2": ("H1", "H3", "REFH2"),
+    "H3": ("H2", "H4"),
+    "H4": ("H3", "H5"),
 
-@dataclass
+    # Text - could be flush or regular
+    "TXT": ("TXT-FLUSH", "BX1-TXT-FIRST", "CS-TXT"),
+    "TXT-FLUSH": ("TXT", "NBX1-TXT-FLUSH"),
+
+    # Lists - position confusion
+    "BL-FIRST": ("BL-MID", "NBX1-BL-FIRST"),
+    "BL-MID": ("BL-FIRST", "BL-LAST"),
+    "BL-LAST": ("BL-MID", "BL-FIRST"),
+    "NL-FIRST": ("NL-MID", "EOC-NL-FIRST"),
+    "NL-MID": ("NL-FIRST", "NL-LAST"),
+    "NL-LAST": ("NL-MID",),
+
+    # Tables
+    "T2": ("T3", "TBL-MID"),
+    "T3": ("T2", "TBL-MID"),
+    "TBL-MID": ("T2", "T3"),
+
+    # References
+    "REF-N": ("NL-FIRST", "NL-MID"),
+})
+
+
+# Paragraph text shown in results and review reports is cut to this length
+PREVIEW_CHARS = 100
+
+
+def _preview(text: str) -> str:
+    return text[:PREVIEW_CHARS] + "..." if len(text) > PREVIEW_CHARS else text
+
+
+@dataclass(slots=True)
 class ClassificationResult:
-    """Single paragraph classification result."""
+    """Single paragraph classification result (original_text is truncated on output)."""
     id: int
     tag: str
     confidence: int
@@ -34,7 +73,7 @@ class ClassificationResult:
             "id": self.id,
             "tag": self.tag,
             "confidence": self.confidence,
-            "original_text": self.original_text,
+            "original_text": _preview(self.original_text),
             "needs_review": self.needs_review,
         }
         if self.reasoning:
@@ -44,7 +83,7 @@ class ClassificationResult:
         return d
 
 
-@dataclass
+@dataclass(slots=True)
 class FilteredResults:
     """Container for filtered classification results."""
     auto_apply: list[ClassificationResult]
@@ -79,10 +118,14 @@ class FilteredResults:
         }
     
     def _avg_confidence(self) -> float:
-        all_results = self.auto_apply + self.needs_review
-        if not all_results:
+        # Summed per queue; no concatenated copy of both lists
+        total = self.total_count
+        if total == 0:
             return 0.0
-        return sum(r.confidence for r in all_results) / len(all_results)
+        return (
+            sum(r.confidence for r in self.auto_apply)
+            + sum(r.confidence for r in self.needs_review)
+        ) / total
     
     def to_dict(self) -> dict:
         """Convert to dictionary."""
@@ -122,39 +165,41 @@ class ConfidenceFilter:
         Returns:
             FilteredResults with separated queues
         """
-        # Create paragraph lookup
-        para_lookup = {p["id"]: p for p in paragraphs}
+        # Paragraph text lookup
+        text_by_id = {p["id"]: p.get("text", "") for p in paragraphs}
         
-        auto_apply = []
-        needs_review = []
+        # Queue chosen by indexing with the needs_review flag (False=0, True=1)
+        buckets: tuple[list[ClassificationResult], list[ClassificationResult]] = ([], [])
+        
+        threshold = self.threshold
+        suggest = self._suggest_alternatives
         
         for clf in classifications:
             para_id = clf["id"]
-            original_text = para_lookup.get(para_id, {}).get("text", "")
-            
+            confidence = clf.get("confidence", 85)
             result = ClassificationResult(
                 id=para_id,
                 tag=clf["tag"],
-                confidence=clf.get("confidence", 85),
+                confidence=confidence,
                 reasoning=clf.get("reasoning"),
-                original_text=original_text[:100] + "..." if len(original_text) > 100 else original_text,
-                alternatives=self._suggest_alternatives(clf)
+                original_text=text_by_id.get(para_id, ""),
+                # High-confidence results (the majority) never get alternatives
+                alternatives=suggest(clf) if confidence < threshold else []
             )
             
-            if result.needs_review:
-                needs_review.append(result)
-            else:
-                auto_apply.append(result)
+            buckets[result.needs_review].append(result)
         
+        auto_apply, needs_review = buckets
         logger.info(
             f"Filtered {len(classifications)} results: "
             f"{len(auto_apply)} auto-apply, {len(needs_review)} needs review"
         )
         
-        return FilteredResults(
-            auto_apply=sorted(auto_apply, key=lambda x: x.id),
-            needs_review=sorted(needs_review, key=lambda x: x.confidence)
-        )
+        # Sorted in place; classifications normally arrive in id order, where
+        # Timsort only confirms the single ascending run (n - 1 comparisons)
+        auto_apply.sort(key=attrgetter("id"))
+        needs_review.sort(key=attrgetter("confidence"))
+        return FilteredResults(auto_apply=auto_apply, needs_review=needs_review)
     
     def _suggest_alternatives(self, clf: dict) -> list[str]:
         """
@@ -173,36 +218,7 @@ class ConfidenceFilter:
         if confidence >= self.threshold:
             return []
         
-        # Common alternatives based on tag type
-        alternatives_map = {
-            # Headings - could be different levels
-            "H1": ["H2", "CT", "SP-H1"],
-            "H2": ["H1", "H3", "REFH2"],
-            "H3": ["H2", "H4"],
-            "H4": ["H3", "H5"],
-            
-            # Text - could be flush or regular
-            "TXT": ["TXT-FLUSH", "BX1-TXT-FIRST", "CS-TXT"],
-            "TXT-FLUSH": ["TXT", "NBX1-TXT-FLUSH"],
-            
-            # Lists - position confusion
-            "BL-FIRST": ["BL-MID", "NBX1-BL-FIRST"],
-            "BL-MID": ["BL-FIRST", "BL-LAST"],
-            "BL-LAST": ["BL-MID", "BL-FIRST"],
-            "NL-FIRST": ["NL-MID", "EOC-NL-FIRST"],
-            "NL-MID": ["NL-FIRST", "NL-LAST"],
-            "NL-LAST": ["NL-MID"],
-            
-            # Tables
-            "T2": ["T3", "TBL-MID"],
-            "T3": ["T2", "TBL-MID"],
-            "TBL-MID": ["T2", "T3"],
-            
-            # References
-            "REF-N": ["NL-FIRST", "NL-MID"],
-        }
-        
-        return alternatives_map.get(tag, [])
+        return list(_ALTERNATIVES_MAP.get(tag, ()))
     
     def get_review_report(self, filtered: FilteredResults) -> str:
         """
@@ -236,7 +252,7 @@ class ConfidenceFilter:
             for item in filtered.needs_review:
                 lines.extend([
                     f"Paragraph {item.id}:",
-                    f"  Text: \"{item.original_text}\"",
+                    f"  Text: \"{_preview(item.original_text)}\"",
                     f"  Suggested Tag: {item.tag} (Confidence: {item.confidence}%)",
                 ])
                 if item.reasoning:
@@ -19,9 +19,11 @@ CONTEXT ZONES:
 from docx import Document
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 import re
+import sys
 import logging
 
 logger = logging.getLogger(__name__)
@@ -493,9 +495,31 @@ ZONE_VALID_STYLES = {
 }
 
 
+# Low-cardinality metadata strings (zones, box types, Word style names).
+# Interning them at ingestion makes every paragraph share one object per
+# value, so the many downstream equality checks and dict lookups on them
+# short-circuit on identity.
+_INTERNED_METADATA_KEYS = (
+    'context_zone', 'document_section', 'table_cell_zone', 'box_type', 'style_name',
+)
+
+
+def _intern_metadata(metadata: dict) -> dict:
+    """Intern the low-cardinality string fields of *metadata* in place."""
+    for key in _INTERNED_METADATA_KEYS:
+        value = metadata.get(key)
+        if type(value) is str:
+            metadata[key] = sys.intern(value)
+    return metadata
+
+
+@lru_cache(maxsize=4096)
 def validate_style_for_zone(style: str, zone: str) -> bool:
     """
     Check if a style is valid for a given zone.
+
+    Memoized: the zone lists are scanned linearly and the same (style, zone)
+    pairs recur for most paragraphs of a document.
     
     Args:
         style: The style tag to validate
@@ -817,7 +841,7 @@ class DocumentIngestion:
                 'id': para_id,
                 'text': text,
                 'text_truncated': self._truncate(text),
-                'metadata': metadata
+                'metadata': _intern_metadata(metadata)
             })
             
             para_id += 1
@@ -967,7 +991,7 @@ class DocumentIngestion:
                             'id': para_id,
                             'text': text,
                             'text_truncated': self._truncate(text),
-                            'metadata': {
+                            'metadata': _intern_metadata({
                                 'style_name': cell_style or 'TableCell',
                                 'inferred_style': inferred_style,
                                 'is_table': True,
@@ -987,7 +1011,7 @@ class DocumentIngestion:
                                 'table_cell_zone': cell_zone,
                                 'box_type': box_type,
                                 'valid_styles': ZONE_VALID_STYLES.get(cell_zone),
-                            }
+                            })
                         })
                         para_id += 1
         
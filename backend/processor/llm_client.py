@@ -7,12 +7,16 @@ Provides:
 - Retry logic with exponential backoff
 - Rate limit (429) handling
 - Token usage tracking
+- Gemini Batch Mode submission for non-interactive jobs
 """
 
+import atexit
 import logging
+import random
+import threading
 import time
 import importlib
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 genai = None
 types = None
@@ -38,6 +42,98 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# Gemini Batch Mode polling (jobs typically finish well within 24h)
+BATCH_POLL_INTERVAL = 30  # seconds between job status checks
+BATCH_MAX_WAIT = 24 * 60 * 60  # seconds
+
+# Shared HTTPS connection pool (keep-alive across calls and clients)
+HTTP_MAX_KEEPALIVE = 32
+HTTP_MAX_CONNECTIONS = 64
+
+# Up to this fraction is added at random to rate-limit (429) backoff waits
+RATE_LIMIT_JITTER = 0.25
+
+
+def _batch_job_states() -> Optional[tuple]:
+    """
+    (succeeded, finished) batch job states, or None when the installed
+    google-genai release predates Batch Mode (no JobState/InlinedRequest).
+
+    Looked up on use rather than at import so older SDKs can still import
+    this module and make interactive calls.
+    """
+    job_state = getattr(types, "JobState", None)
+    if job_state is None or not hasattr(types, "InlinedRequest"):
+        return None
+    ok_states = frozenset({
+        job_state.JOB_STATE_SUCCEEDED,
+        job_state.JOB_STATE_PARTIALLY_SUCCEEDED,
+    })
+    done_states = ok_states | {
+        job_state.JOB_STATE_FAILED,
+        job_state.JOB_STATE_CANCELLED,
+        job_state.JOB_STATE_EXPIRED,
+    }
+    return ok_states, done_states
+
+
+# Duration of the request attempt that succeeded, per calling thread; failed
+# attempts and the retry loop's backoff sleeps are not included
+_attempt_timing = threading.local()
+
+
+def take_last_attempt_seconds() -> Optional[float]:
+    """
+    Return and clear this thread's last successful request duration
+    (None when no GeminiClient call has completed since the last take).
+    """
+    seconds = getattr(_attempt_timing, "seconds", None)
+    _attempt_timing.seconds = None
+    return seconds
+
+
+# Process-wide pooled client, created on first use (see get_http_client)
+_http_client_instance: Optional[Any] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client(timeout: int = 120) -> Optional[Any]:
+    """
+    Get or create the process-wide httpx client shared by every
+    GeminiClient, so calls reuse pooled keep-alive connections across
+    clients and documents instead of each classifier opening its own pool.
+
+    ``timeout`` applies when the client is first created.  HTTP/2 is
+    enabled when the optional ``h2`` package is installed.  Returns None
+    on the legacy SDK, which manages its own transport.
+    """
+    global _http_client_instance
+
+    if _sdk_mode != "google-genai":
+        return None
+
+    with _http_client_lock:
+        if _http_client_instance is None:
+            import httpx
+
+            try:
+                importlib.import_module("h2")
+                http2 = True
+            except ImportError:
+                http2 = False
+
+            _http_client_instance = httpx.Client(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                ),
+                timeout=httpx.Timeout(timeout),
+            )
+            atexit.register(_http_client_instance.close)
+
+    return _http_client_instance
+
 
 class GeminiClient:
     """
@@ -62,6 +158,7 @@ class GeminiClient:
         max_retries: int = 3,
         retry_delay: int = 5,
         timeout: int = 120,
+        http_client: Optional[Any] = None,
     ):
         """
         Initialize Gemini client.
@@ -76,6 +173,7 @@ class GeminiClient:
             max_retries: Maximum number of retry attempts
             retry_delay: Initial delay between retries (seconds)
             timeout: API call timeout (seconds)
+            http_client: Optional shared httpx.Client (see get_http_client)
         """
         self._sdk_mode = _sdk_mode
         self.model_name = model_name
@@ -85,7 +183,13 @@ class GeminiClient:
         self.timeout = timeout
 
         if self._sdk_mode == "google-genai":
-            self.client = genai.Client(api_key=api_key)
+            if http_client is not None:
+                self.client = genai.Client(
+                    api_key=api_key,
+                    http_options=types.HttpOptions(httpx_client=http_client),
+                )
+            else:
+                self.client = genai.Client(api_key=api_key)
             self.generation_config = types.GenerateContentConfig(
                 temperature=temperature,
                 top_p=top_p,
@@ -106,7 +210,8 @@ class GeminiClient:
             )
             self.generation_config = None
 
-        # Token usage tracking
+        # Token usage tracking (calls may run from several worker threads)
+        self._usage_lock = threading.Lock()
         self.total_input_tokens = 0
         self.total_output_tokens = 0
         self.total_tokens = 0
@@ -140,20 +245,13 @@ class GeminiClient:
 
         # Build request for the active SDK.
         if self._sdk_mode == "google-genai":
-            contents = []
-            if self.system_instruction:
-                contents.append(
-                    types.Content(
-                        role="user",
-                        parts=[types.Part(text=self.system_instruction)],
-                    )
-                )
-            contents.append(
-                types.Content(
-                    role="user",
-                    parts=[types.Part(text=prompt)],
+            contents = self._build_contents(prompt)
+            config = self.generation_config
+            if timeout:
+                # Per-request deadline; the shared HTTP client's timeout is only a default
+                config = config.model_copy(
+                    update={"http_options": types.HttpOptions(timeout=int(timeout * 1000))}
                 )
-            )
         else:
             full_prompt = (
                 f"{self.system_instruction}\n\n{prompt}"
@@ -164,11 +262,12 @@ class GeminiClient:
         for attempt in range(max_retries):
             try:
                 # Make API call
+                attempt_started = time.perf_counter()
                 if self._sdk_mode == "google-genai":
                     response = self.client.models.generate_content(
                         model=self.model_name,
                         contents=contents,
-                        config=self.generation_config,
+                        config=config,
                     )
                 else:
                     request_options = {"timeout": timeout} if timeout else None
@@ -177,25 +276,8 @@ class GeminiClient:
                         request_options=request_options,
                     )
 
-                # Track token usage
-                if hasattr(response, 'usage_metadata'):
-                    usage = response.usage_metadata
-                    input_tokens = getattr(usage, 'prompt_token_count', 0)
-                    output_tokens = getattr(usage, 'candidates_token_count', 0)
-                    total_tokens = getattr(usage, 'total_token_count', 0)
-
-                    self.total_input_tokens += input_tokens
-                    self.total_output_tokens += output_tokens
-                    self.total_tokens += total_tokens
-
-                    self._last_usage = {
-                        'input_tokens': input_tokens,
-                        'output_tokens': output_tokens,
-                        'total_tokens': total_tokens,
-                    }
-
-                    logger.debug(f"Token usage: {input_tokens} input, {output_tokens} output, {total_tokens} total")
-
+                _attempt_timing.seconds = time.perf_counter() - attempt_started
+                self._track_usage(response)
                 return response
 
             except Exception as e:
@@ -231,10 +313,12 @@ class GeminiClient:
                     wait_time = self.retry_delay * (2 ** attempt)
 
                     if is_rate_limit:
-                        # Longer wait for rate limits
+                        # Longer wait for rate limits, with jitter so parallel
+                        # chunk/fallback workers throttled together retry apart
                         wait_time = min(wait_time * 2, 60)
+                        wait_time += random.uniform(0, wait_time * RATE_LIMIT_JITTER)
 
-                    logger.info(f"Retrying in {wait_time} seconds... (exponential backoff)")
+                    logger.info(f"Retrying in {wait_time:.1f} seconds... (exponential backoff)")
                     time.sleep(wait_time)
                 else:
                     if is_rate_limit:
@@ -246,6 +330,134 @@ class GeminiClient:
         logger.error(f"All {max_retries} retries failed")
         raise last_error or Exception("API failed after all retries")
 
+    def generate_content_batch(
+        self,
+        prompts: List[str],
+        poll_interval: int = BATCH_POLL_INTERVAL,
+        max_wait: int = BATCH_MAX_WAIT,
+        display_name: Optional[str] = None,
+    ) -> List[Optional[Any]]:
+        """
+        Submit several prompts as one Gemini Batch Mode job and wait for it.
+
+        Batch Mode is asynchronous and billed at a discount, so it suits
+        non-interactive jobs.  On the legacy SDK, or a google-genai release
+        without Batch Mode, the prompts are sent one by one through
+        generate_content().
+
+        Args:
+            prompts: User prompts, one request each
+            poll_interval: Seconds between job status checks
+            max_wait: Give up (and cancel the job) after this many seconds
+            display_name: Optional job name shown in the Gemini console
+
+        Returns:
+            Responses in prompt order; an entry is None if that request failed
+
+        Raises:
+            TimeoutError: If the job does not finish within max_wait
+            RuntimeError: If the job ends in a failed/cancelled/expired state
+        """
+        if not prompts:
+            return []
+
+        states = _batch_job_states() if self._sdk_mode == "google-genai" else None
+        if states is None:
+            return [self.generate_content(p) for p in prompts]
+        ok_states, done_states = states
+
+        requests = [
+            types.InlinedRequest(contents=self._build_contents(p), config=self.generation_config)
+            for p in prompts
+        ]
+        config = types.CreateBatchJobConfig(display_name=display_name) if display_name else None
+        job = self.client.batches.create(model=self.model_name, src=requests, config=config)
+        logger.info(f"Submitted batch job {job.name} with {len(prompts)} requests")
+
+        deadline = time.monotonic() + max_wait
+        while job.state not in done_states:
+            if time.monotonic() > deadline:
+                try:
+                    self.client.batches.cancel(name=job.name)
+                except Exception as e:
+                    logger.warning(f"Failed to cancel batch job {job.name}: {e}")
+                raise TimeoutError(f"Batch job {job.name} did not finish within {max_wait}s")
+            time.sleep(poll_interval)
+            job = self.client.batches.get(name=job.name)
+
+        if job.state not in ok_states:
+            raise RuntimeError(f"Batch job {job.name} ended in state {job.state}: {job.error}")
+
+        inlined = (job.dest.inlined_responses if job.dest else None) or []
+        responses: List[Optional[Any]] = []
+        for item in inlined:
+            if item.error or item.response is None:
+                logger.warning(f"Batch request failed in job {job.name}: {item.error}")
+                responses.append(None)
+                continue
+            self._track_usage(item.response)
+            responses.append(item.response)
+
+        # Missing trailing entries count as failed requests
+        responses.extend([None] * (len(prompts) - len(responses)))
+        logger.info(
+            f"Batch job {job.name} finished ({job.state}): "
+            f"{sum(r is not None for r in responses)}/{len(prompts)} succeeded"
+        )
+        return responses
+
+    def _build_contents(self, prompt: str) -> list:
+        """Build google-genai request contents (system instruction + prompt)."""
+        contents = []
+        if self.system_instruction:
+            contents.append(
+                types.Content(
+                    role="user",
+                    parts=[types.Part(text=self.system_instruction)],
+                )
+            )
+        contents.append(
+            types.Content(
+                role="user",
+                parts=[types.Part(text=prompt)],
+            )
+        )
+        return contents
+
+    @staticmethod
+    def response_usage(response: Any) -> Dict[str, int]:
+        """
+        Token counts of one response (empty when it carries no usage metadata).
+
+        Safe to use from parallel workers, unlike get_last_usage(), which
+        reports whichever call on this client finished last.
+        """
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is None:
+            return {}
+        return {
+            'input_tokens': getattr(usage, 'prompt_token_count', 0) or 0,
+            'output_tokens': getattr(usage, 'candidates_token_count', 0) or 0,
+            'total_tokens': getattr(usage, 'total_token_count', 0) or 0,
+        }
+
+    def _track_usage(self, response: Any) -> None:
+        """Accumulate token usage from a response's usage metadata."""
+        last_usage = self.response_usage(response)
+        if not last_usage:
+            return
+
+        with self._usage_lock:
+            self.total_input_tokens += last_usage['input_tokens']
+            self.total_output_tokens += last_usage['output_tokens']
+            self.total_tokens += last_usage['total_tokens']
+            self._last_usage = last_usage
+
+        logger.debug(
+            f"Token usage: {last_usage['input_tokens']} input, "
+            f"{last_usage['output_tokens']} output, {last_usage['total_tokens']} total"
+        )
+
     def get_token_usage(self) -> Dict[str, int]:
         """
         Get cumulative token usage statistics.
@@ -154,6 +154,7 @@ def process_document(
     logger.info("Stage 4: Confidence Filtering")
     filter_service = ConfidenceFilter(threshold=85)
     filtered = filter_service.filter(classifications, paragraphs)
+    filtered_dict = filtered.to_dict()
     
     # Stage 5: Reconstruction
     logger.info("Stage 5: Document Reconstruction")
@@ -188,7 +189,7 @@ def process_document(
     # Generate review report
     review_path = reconstructor.generate_review_report(
         document_name=input_path.name,
-        filtered_results=filtered.to_dict(),
+        filtered_results=filtered_dict,
         output_name=review_name
     )
     
@@ -196,7 +197,7 @@ def process_document(
     json_path = reconstructor.generate_json_output(
         document_name=input_path.name,
         classifications=classifications,
-        filtered_results=filtered.to_dict(),
+        filtered_results=filtered_dict,
         output_name=json_name
     )
     
@@ -205,7 +206,7 @@ def process_document(
     html_path = reconstructor.generate_html_report(
         document_name=input_path.name,
         classifications=classifications,
-        filtered_results=filtered.to_dict(),
+        filtered_results=filtered_dict,
         output_name=html_name
     )
     
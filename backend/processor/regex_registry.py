@@ -0,0 +1,19 @@
+"""
+Process-wide registry of compiled regular expressions.
+
+Modules that scan paragraph text (block extraction, classification) compile
+their patterns through ``compile_pattern`` so each distinct pattern is
+compiled exactly once per process and the same object is shared by worker
+threads (and inherited by forked workers).
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def compile_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    """Return the shared compiled regex for *pattern* and *flags*."""
+    return re.compile(pattern, flags)
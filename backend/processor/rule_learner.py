@@ -24,6 +24,7 @@ from pathlib import Path
 from typing import Optional, Dict, List, Tuple, Any
 from difflib import SequenceMatcher
 from collections import Counter, defaultdict
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -219,6 +220,29 @@ class DocumentAligner:
         return text.lower()
 
 
+@lru_cache(maxsize=None)
+def _parse_condition(feature_key: str) -> Tuple[str, Optional[str]]:
+    """Split a rule condition into (feature name, expected value or None for flags)."""
+    if "=" in feature_key:
+        feature_name, feature_value = feature_key.split("=", 1)
+        return feature_name, feature_value
+    return feature_key, None
+
+
+def _satisfied_conditions(features: Dict[str, Any]) -> List[str]:
+    """
+    Condition keys the features satisfy: each truthy feature as a flag and
+    every feature as name=value ("name=" conditions for missing features
+    are not listed).
+    """
+    keys = []
+    for name, value in features.items():
+        if value:
+            keys.append(name)
+        keys.append(f"{name}={value}")
+    return keys
+
+
 class RuleLearner:
     """Learn deterministic if-then rules from aligned documents."""
 
@@ -227,6 +251,11 @@ class RuleLearner:
         self.aligner = DocumentAligner()
         self.rules: List[Dict[str, Any]] = []
         self.tag_stats: Dict[str, Counter] = defaultdict(Counter)
+        # Condition index over self.rules, rebuilt when the rule list changes
+        self._indexed_rules: Optional[List[Dict[str, Any]]] = None
+        self._indexed_count = 0
+        self._condition_index: Dict[str, int] = {}
+        self._absent_index: Dict[str, int] = {}
 
     def load_ground_truth(self) -> Dict[str, List[Dict]]:
         """
@@ -334,6 +363,12 @@ class RuleLearner:
         for ex in examples:
             examples_by_tag[ex["label"]].append(ex)
 
+        # Number of examples satisfying each condition key, counted in one
+        # pass (same semantics as _feature_matches on every example)
+        condition_totals = Counter()
+        for ex in examples:
+            condition_totals.update(_satisfied_conditions(ex["features"]))
+
         # For each tag, find discriminative feature combinations
         for tag, tag_examples in examples_by_tag.items():
             if len(tag_examples) < min_support:
@@ -354,10 +389,7 @@ class RuleLearner:
                     continue
 
                 # Calculate confidence: P(tag | feature)
-                total_with_feature = sum(
-                    1 for ex in examples
-                    if self._feature_matches(ex["features"], feature_key)
-                )
+                total_with_feature = condition_totals[feature_key]
 
                 if total_with_feature == 0:
                     continue
@@ -382,13 +414,57 @@ class RuleLearner:
 
     def _feature_matches(self, features: Dict[str, Any], feature_key: str) -> bool:
         """Check if a feature matches the given key."""
-        if "=" in feature_key:
+        feature_name, feature_value = _parse_condition(feature_key)
+        if feature_value is not None:
             # Handle feature=value pairs
-            feature_name, feature_value = feature_key.split("=", 1)
             return str(features.get(feature_name, "")) == feature_value
-        else:
-            # Handle boolean features
-            return bool(features.get(feature_key, False))
+        # Handle boolean features
+        return bool(features.get(feature_name, False))
+
+    def _rule_index(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Index rules by condition key (first/highest-priority rule wins).
+
+        Returns:
+            - condition key -> rule position ("flag" or "name=value")
+            - feature name -> rule position for "name=" conditions, which
+              also match when the feature is missing
+        """
+        if self._indexed_rules is not self.rules or self._indexed_count != len(self.rules):
+            condition_index: Dict[str, int] = {}
+            absent_index: Dict[str, int] = {}
+            for pos, rule in enumerate(self.rules):
+                condition = rule["condition"]
+                condition_index.setdefault(condition, pos)
+                if condition.endswith("=") and condition.count("=") == 1:
+                    absent_index.setdefault(condition[:-1], pos)
+            self._condition_index = condition_index
+            self._absent_index = absent_index
+            self._indexed_rules = self.rules
+            self._indexed_count = len(self.rules)
+        return self._condition_index, self._absent_index
+
+    def _match_rule(self, features: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Return the first rule (in priority order) whose condition the features
+        satisfy, or None.  Equivalent to scanning self.rules with
+        _feature_matches, but costs a few lookups per feature instead of one
+        comparison per rule.
+        """
+        condition_index, absent_index = self._rule_index()
+        best = len(self.rules)
+        for name, value in features.items():
+            if value:
+                pos = condition_index.get(name, best)
+                if pos < best:
+                    best = pos
+            pos = condition_index.get(f"{name}={value}", best)
+            if pos < best:
+                best = pos
+        for name, pos in absent_index.items():
+            if pos < best and name not in features:
+                best = pos
+        return self.rules[best] if best < len(self.rules) else None
 
     def apply_rules(self, text: str, metadata: Dict[str, Any] = None) -> Optional[str]:
         """
@@ -401,8 +477,23 @@ class RuleLearner:
         Returns:
             Predicted tag or None if no rule matches
         """
+        return self.apply_rules_with_rule(text, metadata)[0]
+
+    def apply_rules_with_rule(
+        self, text: str, metadata: Dict[str, Any] = None
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Apply learned rules and also return the rule that matched.
+
+        Args:
+            text: Paragraph text
+            metadata: Optional metadata dict
+
+        Returns:
+            (predicted tag, matched rule), or (None, None) if no rule matches
+        """
         if not self.rules:
-            return None
+            return None, None
 
         if metadata is None:
             metadata = {}
@@ -410,11 +501,10 @@ class RuleLearner:
         features = self.feature_extractor.extract_features(text, metadata)
 
         # Apply rules in order of confidence
-        for rule in self.rules:
-            if self._feature_matches(features, rule["condition"]):
-                return rule["predicted_tag"]
-
-        return None
+        rule = self._match_rule(features)
+        if rule is None:
+            return None, None
+        return rule["predicted_tag"], rule
 
     def save_rules(self, path: Optional[Path] = None):
         """Save learned rules to JSON file."""
@@ -0,0 +1,464 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from processor.classifier import GeminiClassifier
+
+
+class DummyResp:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+def _make_classifier(batch_responses):
+    clf = GeminiClassifier.__new__(GeminiClassifier)
+    clf.api_timeout = 1
+    clf.retriever = None
+    clf.cache = None
+    clf.rule_learner = None
+    clf.enable_fallback = False
+    clf.fallback_model = None
+    clf.rule_predictions = 0
+    clf.llm_predictions = 0
+    submitted = []
+
+    def _batch(prompts, **_kwargs):
+        submitted.extend(prompts)
+        return batch_responses
+
+    clf.model = type("DummyModel", (), {
+        "generate_content_batch": staticmethod(_batch),
+        "get_last_usage": staticmethod(lambda: {}),
+        "get_token_usage": staticmethod(lambda: {}),
+    })()
+    return clf, submitted
+
+
+def test_classify_batch_one_request_per_document():
+    clf, submitted = _make_classifier([
+        DummyResp('[{"id":1,"tag":"H1","confidence":95}]'),
+        DummyResp('[{"id":1,"tag":"TXT","confidence":90},{"id":2,"tag":"TXT","confidence":90}]'),
+    ])
+    docs = [
+        {"document_name": "a.docx", "paragraphs": [{"id": 1, "text": "Intro"}]},
+        {"document_name": "b.docx", "paragraphs": [{"id": 1, "text": "One"}, {"id": 2, "text": "Two"}]},
+    ]
+
+    results = clf.classify_batch(docs)
+
+    assert len(submitted) == 2
+    assert [r["tag"] for r in results[0]] == ["H1"]
+    assert [r["tag"] for r in results[1]] == ["TXT", "TXT"]
+
+
+def test_classify_batch_failed_request_retries_interactively():
+    clf, _ = _make_classifier([None])
+    calls = {"n": 0}
+
+    def _gen(_prompt):
+        calls["n"] += 1
+        return DummyResp('[{"id":1,"tag":"TXT","confidence":90}]')
+
+    clf._generate_content = _gen
+
+    results = clf.classify_batch([{"document_name": "a.docx", "paragraphs": [{"id": 1, "text": "Hello"}]}])
+
+    assert calls["n"] == 1
+    assert results[0][0]["tag"] == "TXT"
+
+
+def test_batch_fallback_submits_one_job_and_merges():
+    clf = GeminiClassifier.__new__(GeminiClassifier)
+    clf.fallback_threshold = 75
+    clf.fallback_mode = "batch"
+    clf.fallback_calls = 0
+    clf.items_improved = 0
+    clf.fallback_input_tokens = 0
+    clf.fallback_output_tokens = 0
+    submitted = []
+
+    class DummyFallback:
+        def get_token_usage(self):
+            return {"total_input_tokens": 0, "total_output_tokens": 0, "total_tokens": 0}
+
+        def generate_content_batch(self, prompts, **_kwargs):
+            submitted.extend(prompts)
+            return [DummyResp('[{"id":2,"tag":"H2","confidence":92}]')]
+
+        def generate_content(self, *_args, **_kwargs):
+            raise AssertionError("sync fallback must not be used in batch mode")
+
+    clf.fallback_model = DummyFallback()
+    results = [
+        {"id": 1, "tag": "TXT", "confidence": 95},
+        {"id": 2, "tag": "TXT", "confidence": 40},
+    ]
+    paragraphs = [{"id": 1, "text": "Body"}, {"id": 2, "text": "Heading"}]
+
+    merged = clf._process_fallback(results, paragraphs, "a.docx")
+
+    assert len(submitted) == 1
+    assert merged[1]["tag"] == "H2"
+    assert merged[1]["fallback_used"] is True
+    assert merged[0]["tag"] == "TXT"
+
+
+def test_sync_fallback_merges_every_group():
+    clf = GeminiClassifier.__new__(GeminiClassifier)
+    clf.fallback_threshold = 75
+    clf.fallback_calls = 0
+    clf.items_improved = 0
+    clf.fallback_input_tokens = 0
+    clf.fallback_output_tokens = 0
+    calls = []
+
+    class DummyFallback:
+        def get_token_usage(self):
+            return {"total_input_tokens": 0, "total_output_tokens": 0, "total_tokens": 0}
+
+        def generate_content(self, prompt, **_kwargs):
+            calls.append(prompt)
+            ids = [int(line[5:-1]) for line in prompt.splitlines() if line.startswith("[ID: ")]
+            return DummyResp("[" + ",".join(f'{{"id":{i},"tag":"H3","confidence":90}}' for i in ids) + "]")
+
+    clf.fallback_model = DummyFallback()
+    results = [{"id": i, "tag": "TXT", "confidence": 10} for i in range(1, 91)]
+    paragraphs = [{"id": i, "text": f"Para {i}"} for i in range(1, 91)]
+
+    merged = clf._process_fallback(results, paragraphs, "a.docx")
+
+    assert len(calls) == 3  # 90 items in groups of 30
+    assert all(r["tag"] == "H3" for r in merged)
+
+
+def test_fallback_skips_self_verified_near_threshold_items():
+    clf = GeminiClassifier.__new__(GeminiClassifier)
+    clf.fallback_threshold = 75
+    clf.fallback_calls = 0
+    clf.items_improved = 0
+    clf.fallback_input_tokens = 0
+    clf.fallback_output_tokens = 0
+    prompts = []
+
+    class DummyFallback:
+        def get_token_usage(self):
+            return {"total_input_tokens": 0, "total_output_tokens": 0, "total_tokens": 0}
+
+        def generate_content(self, prompt, **_kwargs):
+            prompts.append(prompt)
+            return DummyResp('[{"id":3,"tag":"H2","confidence":90}]')
+
+    clf.fallback_model = DummyFallback()
+    results = [
+        {"id": 1, "tag": "TXT", "confidence": 70, "recheck": True},  # within band: kept
+        {"id": 2, "tag": "TXT", "confidence": 60, "recheck": True},  # below band: re-evaluated
+        {"id": 3, "tag": "TXT", "confidence": 70},                   # not re-checked
+    ]
+    paragraphs = [{"id": i, "text": f"Para {i}"} for i in (1, 2, 3)]
+
+    merged = clf._process_fallback(results, paragraphs, "a.docx")
+
+    assert len(prompts) == 1
+    assert "[ID: 1]" not in prompts[0]
+    assert "[ID: 2]" in prompts[0] and "[ID: 3]" in prompts[0]
+    assert merged[0]["tag"] == "TXT" and merged[2]["tag"] == "H2"
+
+
+def test_classify_stitches_rule_and_llm_results_by_position():
+    class DummyCache:
+        def text_hash(self, text):
+            return text
+
+        def get_many(self, keys):
+            return [None] * len(keys)
+
+        def get_many_by_content(self, entries):
+            return [None] * len(entries)
+
+        def set_many(self, _entries):
+            pass
+
+        def set_many_by_content(self, _entries):
+            pass
+
+        def get_stats(self):
+            return {}
+
+    from processor.rule_learner import RuleLearner
+
+    clf, _ = _make_classifier([])
+    clf.cache = DummyCache()
+    clf.rule_learner = RuleLearner()
+    clf.rule_learner.rules = [
+        {"condition": "zone=TABLE", "predicted_tag": "T", "confidence": 0.9, "support": 10},
+    ]
+    sent = []
+
+    def _classify_chunk(chunk, *_args, **_kwargs):
+        sent.append([p["id"] for p in chunk])
+        return [
+            {"id": 2, "tag": "H1", "confidence": 95},
+            {"id": 3, "tag": "TXT", "confidence": 0, "reasoning": "Missing from API response"},
+            {"id": 4, "tag": "TXT", "confidence": 90},
+        ]
+
+    clf._classify_chunk = _classify_chunk
+    paragraphs = [
+        {"id": 1, "text": "Cell", "metadata": {"context_zone": "TABLE"}},
+        {"id": 2, "text": "Heading", "metadata": {"context_zone": "BODY"}},
+        {"id": 3, "text": "Cell", "metadata": {"context_zone": "TABLE"}},
+        {"id": 4, "text": "Body text", "metadata": {"context_zone": "BODY"}},
+    ]
+
+    rule_predictions, llm_needed, llm_needed_indices = clf._apply_rules(paragraphs)
+    assert [r["id"] for r in rule_predictions] == [1, 3]
+    assert [p["id"] for p in llm_needed] == [2, 4]
+    assert llm_needed_indices == [1, 3]
+
+    results = clf.classify(paragraphs, "doc.docx")
+
+    assert sent == [[2, 4]]
+    assert [(r["id"], r["tag"], r.get("rule_based", False)) for r in results] == [
+        (1, "T", True), (2, "H1", False), (3, "T", True), (4, "TXT", False),
+    ]
+
+
+def test_fallback_prompt_omits_empty_reason_and_context_lines():
+    clf, _ = _make_classifier([])
+    results = [{"id": 1, "tag": "TXT", "confidence": 40}]
+    para_by_id = {1: {"text": "Only paragraph", "metadata": {"context_zone": "BODY"}}}
+
+    prompt = clf._build_fallback_prompt([(0, results[0])], results, para_by_id, "a.docx")
+
+    assert "[ID: 1]\nZone: BODY\nCurrent: TXT (40%)\nText: Only paragraph\n" in prompt
+    assert "Reason:" not in prompt and "Context:" not in prompt
+    assert "\n\n\n" not in prompt
+
+
+def test_classify_sends_repeated_paragraphs_once():
+    clf, _ = _make_classifier([])
+    sent = []
+
+    def _classify_chunk(chunk, *_args, **_kwargs):
+        sent.append([p["id"] for p in chunk])
+        return [{"id": p["id"], "tag": "H1" if p["id"] == 1 else "TXT", "confidence": 90} for p in chunk]
+
+    clf._classify_chunk = _classify_chunk
+    body = {"context_zone": "BODY"}
+    paragraphs = [
+        {"id": 1, "text": "Continued", "metadata": body},
+        {"id": 2, "text": "Body text", "metadata": body},
+        {"id": 3, "text": "Continued", "metadata": body},
+        {"id": 4, "text": "Continued", "metadata": {"context_zone": "TABLE"}},
+        {"id": 5, "text": "Continued", "metadata": body},
+    ]
+
+    results = clf.classify(paragraphs, "doc.docx")
+
+    assert sent == [[1, 2, 4]]
+    assert [(r["id"], r["tag"]) for r in results] == [
+        (1, "H1"), (2, "TXT"), (3, "H1"), (4, "T"), (5, "H1"),
+    ]
+
+
+def test_failed_chunk_leaves_finished_chunks_cached(tmp_path, monkeypatch):
+    import pytest
+    from processor import classifier as classifier_mod
+    from app.services.prediction_cache import PredictionCache
+
+    monkeypatch.setattr(classifier_mod, "CHUNK_CHARS", 300)
+    paragraphs = [
+        {"id": i, "text": f"Paragraph {i} " + "x" * 90, "metadata": {"context_zone": "TABLE" if i == 1 else "BODY"}}
+        for i in range(1, 10)
+    ]
+
+    def _chunk_result(chunk):
+        # H1 is not allowed in a TABLE zone; zone validation must correct it
+        return [{"id": p["id"], "tag": "H1" if p["id"] == 1 else "TXT", "confidence": 90} for p in chunk]
+
+    reference, _ = _make_classifier([])
+    reference.cache = PredictionCache(cache_dir=tmp_path / "reference")
+    reference._classify_chunk = lambda chunk, *_args, **_kwargs: _chunk_result(chunk)
+    uninterrupted = reference.classify(paragraphs, "doc.docx")
+
+    clf, _ = _make_classifier([])
+    clf.cache = PredictionCache(cache_dir=tmp_path / "resumed")
+
+    def _flaky_chunk(chunk, *_args, **_kwargs):
+        if chunk[-1]["id"] == 9:
+            raise RuntimeError("API down")
+        return _chunk_result(chunk)
+
+    clf._classify_chunk = _flaky_chunk
+    with pytest.raises(RuntimeError):
+        clf.classify(paragraphs, "doc.docx")
+
+    # Re-run: checkpointed paragraphs skip the model, only the rest is sent
+    sent = []
+
+    def _classify_chunk(chunk, *_args, **_kwargs):
+        sent.extend(p["id"] for p in chunk)
+        return _chunk_result(chunk)
+
+    clf._classify_chunk = _classify_chunk
+    results = clf.classify(paragraphs, "doc.docx")
+
+    assert sent and 1 not in sent and 9 in sent
+    assert results == uninterrupted
+    assert results[0]["tag"] != "H1"
+    # The final results replaced the checkpoints
+    assert not any(r.get("checkpoint") for r in clf.classify(paragraphs, "doc.docx"))
+
+
+def test_fallback_prompt_context_lists_existing_neighbours_only():
+    clf, _ = _make_classifier([])
+    results = [
+        {"id": 1, "tag": "H1", "confidence": 95},
+        {"id": 2, "tag": "TXT", "confidence": 40},
+    ]
+    para_by_id = {
+        1: {"text": "Heading", "metadata": {"context_zone": "BODY"}},
+        2: {"text": "Last paragraph", "metadata": {"context_zone": "BODY"}},
+    }
+
+    prompt = clf._build_fallback_prompt([(1, results[1])], results, para_by_id, "a.docx")
+
+    assert "Context: BEFORE: [H1]\n" in prompt
+    assert "AFTER:" not in prompt
+
+
+def test_repeated_paragraphs_get_one_result_each_through_validation():
+    import re
+
+    clf, _ = _make_classifier([])
+
+    def _gen(prompt):
+        body = prompt.rsplit("Classify each paragraph below:", 1)[1]
+        ids = [int(i) for i in re.findall(r"^\[(\d+)\]", body, re.M)]
+        return DummyResp("[" + ",".join(f'{{"id":{i},"tag":"TXT","confidence":95}}' for i in ids) + "]")
+
+    clf._generate_content = _gen
+    paragraphs = [
+        {"id": i, "text": text, "metadata": {"context_zone": "BODY"}}
+        for i, text in enumerate(["Intro", "Continued", "Body", "Continued", "End"], start=1)
+    ]
+
+    results = clf.classify(paragraphs, "doc.docx")
+
+    assert [(r["id"], r["confidence"]) for r in results] == [(i, 95) for i in range(1, 6)]
+
+
+def test_only_confident_results_are_shared_across_documents(tmp_path):
+    import re
+    from app.services.prediction_cache import PredictionCache
+
+    clf, _ = _make_classifier([])
+    clf.cache = PredictionCache(cache_dir=tmp_path)
+    sent = []
+
+    def _gen(prompt):
+        body = prompt.rsplit("Classify each paragraph below:", 1)[1]
+        ids = [int(i) for i in re.findall(r"^\[(\d+)\]", body, re.M)]
+        sent.append(ids)
+        # The model drops paragraph 2 and is unsure about paragraph 3
+        return DummyResp("[" + ",".join(
+            f'{{"id":{i},"tag":"TXT","confidence":{60 if i == 3 else 95}}}' for i in ids if i != 2
+        ) + "]")
+
+    clf._generate_content = _gen
+    paragraphs = [
+        {"id": i, "text": text, "metadata": {"context_zone": "BODY"}}
+        for i, text in enumerate(["Sure thing", "Dropped line", "Unsure line"], start=1)
+    ]
+
+    first = clf.classify(paragraphs, "a.docx")
+    assert [r["confidence"] for r in first] == [95, 0, 60]
+
+    second = clf.classify(paragraphs, "b.docx")
+
+    # Only the confident result is served from the content cache
+    assert sent[-1] == [2, 3]
+    assert second[0].get("cached") is True
+    assert not second[1].get("cached") and not second[2].get("cached")
+
+
+def test_classify_batch_sends_one_fallback_job_for_all_documents():
+    clf, _ = _make_classifier([
+        DummyResp('[{"id":1,"tag":"TXT","confidence":40},{"id":2,"tag":"TXT","confidence":95}]'),
+        DummyResp('[{"id":1,"tag":"TXT","confidence":30}]'),
+    ])
+    clf.enable_fallback = True
+    clf.fallback_threshold = 75
+    clf.fallback_mode = "batch"
+    clf.fallback_calls = 0
+    clf.items_improved = 0
+    clf.fallback_input_tokens = 0
+    clf.fallback_output_tokens = 0
+    jobs = []
+
+    class DummyFallback:
+        def get_token_usage(self):
+            return {"total_input_tokens": 0, "total_output_tokens": 0, "total_tokens": 0}
+
+        def generate_content_batch(self, prompts, **_kwargs):
+            jobs.append(prompts)
+            return [
+                DummyResp('[{"id":1,"tag":"H1","confidence":90}]'),
+                DummyResp('[{"id":1,"tag":"H2","confidence":90}]'),
+            ]
+
+    clf.fallback_model = DummyFallback()
+    docs = [
+        {"document_name": "a.docx", "paragraphs": [{"id": 1, "text": "Intro"}, {"id": 2, "text": "Body"}]},
+        {"document_name": "b.docx", "paragraphs": [{"id": 1, "text": "Other"}]},
+    ]
+
+    results = clf.classify_batch(docs)
+
+    assert len(jobs) == 1 and len(jobs[0]) == 2
+    assert "a.docx" in jobs[0][0] and "b.docx" in jobs[0][1]
+    assert [r["tag"] for r in results[0]] == ["H1", "TXT"]
+    assert [r["tag"] for r in results[1]] == ["H2"]
+    assert clf.fallback_calls == 2
+
+
+def test_recheck_is_dropped_when_the_tag_is_remapped():
+    clf, _ = _make_classifier([
+        DummyResp(
+            '[{"id":1,"tag":"H1","confidence":72,"recheck":true},'
+            '{"id":2,"tag":"TXT","confidence":72,"recheck":true}]'
+        ),
+    ])
+    clf.enable_fallback = True
+    clf.fallback_threshold = 75
+    clf.fallback_mode = "sync"
+    clf.fallback_calls = 0
+    clf.items_improved = 0
+    clf.fallback_input_tokens = 0
+    clf.fallback_output_tokens = 0
+    prompts = []
+
+    class DummyFallback:
+        def get_token_usage(self):
+            return {"total_input_tokens": 0, "total_output_tokens": 0, "total_tokens": 0}
+
+        def generate_content(self, prompt, **_kwargs):
+            prompts.append(prompt)
+            return DummyResp('[{"id":1,"tag":"TH1","confidence":90}]')
+
+    clf.fallback_model = DummyFallback()
+    docs = [{"document_name": "a.docx", "paragraphs": [
+        {"id": 1, "text": "Results", "metadata": {"context_zone": "TABLE"}},
+        {"id": 2, "text": "Body"},
+    ]}]
+
+    results = clf.classify_batch(docs)[0]
+
+    # The model vouched for H1, not for the table tag it was remapped to
+    assert len(prompts) == 1
+    assert "[ID: 1]" in prompts[0] and "[ID: 2]" not in prompts[0]
+    assert [r["tag"] for r in results] == ["TH1", "TXT"]
+    assert not any("recheck" in r for r in results)
@@ -0,0 +1,161 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from processor import classifier, llm_client
+from processor.classifier import GeminiClassifier, MAX_PARAGRAPHS_PER_CHUNK, _chunk_paragraphs
+
+
+def test_chunks_respect_char_budget_and_overlap(monkeypatch):
+    monkeypatch.setattr(classifier, "CHUNK_CHARS", 1000)
+    paragraphs = [{"id": i, "text": "x" * 100} for i in range(1, 31)]
+
+    chunks = _chunk_paragraphs(paragraphs)
+
+    assert len(chunks) > 1
+    assert all(sum(len(p["text"]) for p in c) <= 1000 for c in chunks)
+    # Consecutive chunks share their boundary paragraph
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert prev[-1]["id"] == nxt[0]["id"]
+    assert {p["id"] for c in chunks for p in c} == set(range(1, 31))
+
+
+def test_single_chunk_for_small_documents():
+    paragraphs = [{"id": i, "text": "Short"} for i in range(1, 6)]
+    assert _chunk_paragraphs(paragraphs) == [paragraphs]
+
+
+def test_chunk_size_follows_measured_latency(monkeypatch):
+    monkeypatch.setattr(classifier, "MAX_PARALLEL_CHUNKS", 4)
+    monkeypatch.setattr(classifier, "CHUNK_SIZE_EXPLORE_RATE", 0)
+    monkeypatch.setattr(classifier, "_CHUNK_SIZE_CURVE", {})
+    clf = GeminiClassifier.__new__(GeminiClassifier)
+
+    # No measurements yet: fixed default
+    assert clf._pick_chunk_size(600) == MAX_PARAGRAPHS_PER_CHUNK
+
+    clf._record_chunk_latency(75, 30.0)
+    clf._record_chunk_latency(20, 4.0)
+    # A short tail chunk is not taken as the latency of its bucket
+    clf._record_chunk_latency(10, 1.0)
+    assert classifier._CHUNK_SIZE_CURVE == {25: 4.0, 75: 30.0}
+
+    # 600 paragraphs: 8 calls of 75 -> 2 waves x 30s; 24 calls of 25 -> 6 waves x 4s
+    assert clf._pick_chunk_size(600) == 25
+    # The curve is per process: the next document's classifier uses it too
+    assert GeminiClassifier.__new__(GeminiClassifier)._pick_chunk_size(100) == 25
+
+    # Smoothed, not replaced, by a new sample
+    clf._record_chunk_latency(25, 40.0)
+    assert 4.0 < classifier._CHUNK_SIZE_CURVE[25] < 40.0
+    assert clf._pick_chunk_size(600) == MAX_PARAGRAPHS_PER_CHUNK
+
+
+def test_unmeasured_chunk_sizes_are_tried_now_and_then(monkeypatch):
+    monkeypatch.setattr(classifier, "CHUNK_SIZE_EXPLORE_RATE", 1)
+    monkeypatch.setattr(classifier, "_CHUNK_SIZE_CURVE", {25: 4.0})
+    clf = GeminiClassifier.__new__(GeminiClassifier)
+
+    assert clf._pick_chunk_size(600) in (50, MAX_PARAGRAPHS_PER_CHUNK)
+    # 55 paragraphs cannot fill 50- or 75-paragraph chunks, so nothing to try
+    assert clf._pick_chunk_size(55) == 25
+
+
+def test_chunk_paragraph_limit_is_a_parameter():
+    paragraphs = [{"id": i, "text": "Short"} for i in range(1, 101)]
+    chunks = _chunk_paragraphs(paragraphs, 25)
+    assert max(len(c) for c in chunks) <= 25
+    assert {p["id"] for c in chunks for p in c} == set(range(1, 101))
+
+
+def test_chunks_are_balanced_without_extra_calls():
+    paragraphs = [{"id": i, "text": "x" * 100} for i in range(1, 81)]
+
+    chunks = _chunk_paragraphs(paragraphs)
+
+    # Greedy filling would give 75 + 12 paragraphs; balanced gives two halves
+    assert len(chunks) == 2
+    assert [len(c) for c in chunks] == [42, 42]
+    assert chunks[0][-1]["id"] >= chunks[1][0]["id"]
+    assert {p["id"] for c in chunks for p in c} == set(range(1, 81))
+
+
+def test_slow_calls_are_reissued_with_adaptive_timeout(monkeypatch):
+    monkeypatch.setattr(classifier, "_CALL_LATENCIES", {})
+    clf = GeminiClassifier.__new__(GeminiClassifier)
+    clf.api_timeout = 120
+    calls = []
+    overruns = [TimeoutError("read timed out")]
+
+    def generate(prompt, timeout=None, max_retries=None):
+        calls.append((timeout, max_retries))
+        if max_retries == 1 and overruns:
+            raise overruns.pop()
+        return prompt
+
+    clf.model = type("DummyModel", (), {"generate_content": staticmethod(generate)})()
+
+    # Not enough history yet: plain call with the configured timeout
+    assert clf._generate_content("a") == "a"
+    assert calls == [(120, None)]
+
+    classifier._CALL_LATENCIES["primary"].extend([2.0] * classifier.ADAPTIVE_TIMEOUT_MIN_SAMPLES)
+    calls.clear()
+    assert clf._generate_content("b") == "b"
+    # First try overruns 1.5 x median (floored at 5s) and is re-issued once
+    assert calls == [(5.0, 1), (5.0, 1)]
+
+    # History is per process: the classifier for the next document uses it too
+    next_doc = GeminiClassifier.__new__(GeminiClassifier)
+    next_doc.api_timeout = 120
+    next_doc.model = clf.model
+    calls.clear()
+    assert next_doc._generate_content("c") == "c"
+    assert calls == [(5.0, 1)]
+
+
+def test_chunk_curve_records_only_the_successful_attempt(monkeypatch):
+    monkeypatch.setattr(classifier, "_CALL_LATENCIES", {})
+    monkeypatch.setattr(classifier, "_CHUNK_SIZE_CURVE", {})
+    clf = GeminiClassifier.__new__(GeminiClassifier)
+    clf.api_timeout = 120
+
+    def generate(prompt, timeout=None, max_retries=None):
+        # As GeminiClient reports it: the attempt that succeeded took 4s
+        llm_client._attempt_timing.seconds = 4.0
+        return type("Resp", (), {"text": "[]", "usage_metadata": None})()
+
+    clf.model = type("DummyModel", (), {"generate_content": staticmethod(generate)})()
+    recorded = []
+    clf._record_chunk_latency = lambda count, seconds: recorded.append((count, seconds))
+    clf.build_user_prompt = lambda *args: "prompt"
+    clf._finish_chunk = lambda *args: []
+    clf.model.get_last_usage = lambda: {}
+    clf.model.get_token_usage = lambda: {}
+
+    clf._classify_chunk([{"id": 1, "text": "x"}], "a.docx", "Academic Document")
+
+    assert recorded == [(1, 4.0)]
+    assert classifier._CALL_LATENCIES["primary"] == classifier.deque([4.0])
+
+
+def test_chunk_logs_its_own_response_usage(caplog):
+    clf = GeminiClassifier.__new__(GeminiClassifier)
+    usage = type("Usage", (), {"prompt_token_count": 120, "candidates_token_count": 30, "total_token_count": 150})()
+    clf._generate_content = lambda prompt: type("Resp", (), {"text": "[]", "usage_metadata": usage})()
+    clf.build_user_prompt = lambda *args: "prompt"
+    clf._finish_chunk = lambda *args: []
+    # Another chunk finished last on the shared client
+    clf.model = type("DummyModel", (), {
+        "get_last_usage": staticmethod(lambda: {"input_tokens": 9, "output_tokens": 9, "total_tokens": 18}),
+        "get_token_usage": staticmethod(
+            lambda: {"total_input_tokens": 129, "total_output_tokens": 39, "total_tokens": 168}
+        ),
+    })()
+
+    with caplog.at_level("INFO", logger="processor.classifier"):
+        clf._classify_chunk([{"id": 1, "text": "x"}], "a.docx", "Academic Document")
+
+    assert "Token Usage - Input: 120, Output: 30, Total: 150" in caplog.text
@@ -312,3 +312,91 @@ def test_alias_mapping_hh_to_h1_no_retry():
     results = clf._classify_chunk(paragraphs, "doc", "Academic", "")
     assert calls["n"] == 1
     assert results[0]["tag"] == "H1"
+
+
+def test_parsed_tags_are_interned_and_style_map_applies():
+    clf = _make_classifier()
+    text = '[{"id": 1, "tag": "TXT-FLUSH", "confidence": 90}, {"id": 2, "tag": "TXT-FLUSH", "confidence": 80}]'
+
+    first, second = clf._parse_json_response(text, 2)
+    assert first["tag"] is second["tag"]
+
+    validated = clf._validate_results(
+        [{"id": 1, "tag": "HEAD1", "confidence": 90}, {"id": 2, "tag": "FIGURELEGEND", "confidence": 90}],
+        expected_count=2,
+    )
+    assert [r["tag"] for r in validated] == ["H1", "FIG-LEG"]
+
+
+def test_force_invalid_to_txt_matches_alias_then_normalize():
+    from app.services.style_normalizer import normalize_tag
+    from processor.classifier import _AliasContexts
+
+    clf = _make_classifier()
+    meta_by_id = {
+        1: {"context_zone": "BODY"},
+        2: {"context_zone": "TABLE"},
+        3: {"context_zone": "BOX_BX2", "box_prefix": "BX2"},
+        4: {"context_zone": "REFERENCE"},
+    }
+    text_by_id = {1: "Plain", 2: "Cell", 3: "Box text", 4: "1. Smith J."}
+    raw = {1: "HEAD1", 2: "TBL-H2", 3: "BX-TXT", 4: "NOT-A-TAG"}
+    expected = {
+        rid: normalize_tag(clf._map_tag_alias(tag, meta=meta_by_id[rid], text=text_by_id[rid]), meta=meta_by_id[rid])
+        for rid, tag in raw.items()
+    }
+
+    results = [{"id": rid, "tag": tag, "confidence": 90} for rid, tag in raw.items()]
+    contexts = _AliasContexts(meta_by_id, text_by_id)
+    clf._force_invalid_to_txt(results, meta_by_id, text_by_id, contexts)
+
+    assert {r["id"]: r["tag"] for r in results} == expected
+    assert set(contexts) == {1, 2, 3, 4}
+
+
+def test_validate_results_passes_canonical_tags_without_resolution(monkeypatch):
+    from processor.classifier import VALID_TAGS, _VALIDATED_TAGS
+
+    clf = _make_classifier()
+    resolved = []
+    resolve = GeminiClassifier._resolve_result_tag
+
+    def _counting_resolve(tag):
+        resolved.append(tag)
+        return resolve(tag)
+
+    monkeypatch.setattr(GeminiClassifier, "_resolve_result_tag", staticmethod(_counting_resolve))
+    validated = clf._validate_results(
+        [{"id": 1, "tag": "H1", "confidence": 90}, {"id": 2, "tag": "HEAD1", "confidence": 90}],
+        expected_count=2,
+    )
+
+    assert [r["tag"] for r in validated] == ["H1", "H1"]
+    assert resolved == ["HEAD1"]
+    # The fast path agrees with the full cascade
+    assert _VALIDATED_TAGS <= VALID_TAGS
+    assert all(resolve(t) == (t, True) for t in _VALIDATED_TAGS)
+
+
+def test_validate_results_reuses_result_shaped_dicts():
+    clf = _make_classifier()
+    shaped = {"id": 1, "tag": "H1", "confidence": 90}
+    extra = {"id": 2, "tag": "TXT", "confidence": 80, "note": "model chatter", "recheck": False}
+
+    validated = clf._validate_results([shaped, extra], expected_count=2)
+
+    assert validated[0] is shaped
+    assert validated[0] == {"id": 1, "tag": "H1", "confidence": 90, "reasoning": None}
+    assert validated[1] == {"id": 2, "tag": "TXT", "confidence": 80, "reasoning": None}
+
+
+def test_alias_mapping_shares_cache_entries_across_numbered_texts():
+    clf = _make_classifier()
+    meta = {"context_zone": "BACK_MATTER", "is_reference_zone": True}
+    GeminiClassifier._resolve_tag_alias.cache_clear()
+
+    first = clf._map_tag_alias("REF", meta=meta, text="1. Smith J. Title.")
+    second = clf._map_tag_alias("REF", meta=meta, text="Jones K. Title.")
+
+    assert first == second
+    assert GeminiClassifier._resolve_tag_alias.cache_info().hits == 1
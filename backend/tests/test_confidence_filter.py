@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from processor.confidence import ConfidenceFilter
+
+
+def test_low_confidence_results_get_fresh_alternative_lists():
+    flt = ConfidenceFilter(threshold=85)
+    filtered = flt.filter(
+        [
+            {"id": 1, "tag": "NL-LAST", "confidence": 60},
+            {"id": 2, "tag": "H1", "confidence": 70},
+            {"id": 3, "tag": "H1", "confidence": 95},
+        ],
+        [{"id": i, "text": f"Para {i}"} for i in (1, 2, 3)],
+    )
+
+    review = {r.id: r.alternatives for r in filtered.needs_review}
+    assert review == {1: ["NL-MID"], 2: ["H2", "CT", "SP-H1"]}
+    review[2].append("X")
+    assert flt._suggest_alternatives({"tag": "H1", "confidence": 70}) == ["H2", "CT", "SP-H1"]
+    assert filtered.auto_apply[0].alternatives == []
+
+
+def test_summary_averages_confidence_across_both_queues():
+    filtered = ConfidenceFilter(threshold=85).filter(
+        [{"id": 1, "tag": "TXT", "confidence": 90}, {"id": 2, "tag": "TXT", "confidence": 60}, {"id": 3, "tag": "H1"}],
+        [],
+    )
+
+    summary = filtered.get_summary()
+    assert summary["average_confidence"] == (90 + 60 + 85) / 3
+    assert ConfidenceFilter().filter([], []).get_summary()["average_confidence"] == 0.0
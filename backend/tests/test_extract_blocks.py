@@ -0,0 +1,24 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from processor import blocks as blocks_mod
+from processor.blocks import extract_blocks
+
+
+def test_extract_blocks_adds_features_without_mutating_paragraphs(monkeypatch):
+    paragraphs = [
+        {"id": 1, "text": "Figure 1 Overview", "text_truncated": "Figure 1 Overview", "metadata": {}},
+        {"id": 2, "text": "Body text.", "text_truncated": "Body text.", "metadata": {"has_bullet": True}},
+    ]
+    monkeypatch.setattr(blocks_mod, "extract_document", lambda path: (paragraphs, {}))
+
+    blocks, _, _ = extract_blocks("unused.docx")
+
+    assert type(blocks) is list
+    assert [b["id"] for b in blocks] == [1, 2]
+    assert blocks[0]["metadata"]["caption_type"] == "figure"
+    assert blocks[1]["metadata"]["list_kind"] == "bullet"
+    assert "caption_type" not in paragraphs[0]["metadata"]
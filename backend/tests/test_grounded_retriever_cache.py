@@ -0,0 +1,65 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from app.services.grounded_retriever import GroundedRetriever
+
+
+def _write_dataset(path: Path) -> None:
+    rows = [
+        {"doc_id": "a", "text": "Chapter 2 Anatomy", "canonical_gold_tag": "CN", "zone": "BODY", "alignment_score": 1.0},
+        {"doc_id": "a", "text": "The heart pumps blood", "canonical_gold_tag": "TXT", "zone": "BODY", "alignment_score": 1.0},
+        {"doc_id": "b", "text": "Smith J. Heart disease. 2019.", "canonical_gold_tag": "REF-N", "zone": "BACK_MATTER", "alignment_score": 1.0},
+    ]
+    path.write_text("\n".join(json.dumps(r) for r in rows), encoding="utf-8")
+
+
+def test_repeated_query_reuses_search_and_returns_fresh_copies(tmp_path, monkeypatch):
+    dataset = tmp_path / "gt.jsonl"
+    _write_dataset(dataset)
+    retriever = GroundedRetriever(ground_truth_path=dataset)
+    calls = {"n": 0}
+    search = retriever._search
+
+    def _counting_search(*args):
+        calls["n"] += 1
+        return search(*args)
+
+    monkeypatch.setattr(retriever, "_search", _counting_search)
+
+    first = retriever.retrieve_examples("heart blood", k=2)
+    first[0]["text"] = "mutated"
+    second = retriever.retrieve_examples("heart blood", k=2)
+
+    assert calls["n"] == 1
+    assert second[0]["text"] != "mutated"
+    retriever.retrieve_examples("heart blood", k=2, zone="BACK_MATTER")
+    assert calls["n"] == 2
+
+
+def test_batch_retrieval_matches_single_queries(tmp_path, monkeypatch):
+    dataset = tmp_path / "gt.jsonl"
+    _write_dataset(dataset)
+    retriever = GroundedRetriever(ground_truth_path=dataset)
+    texts = ["heart blood", "Chapter 2", "heart blood", "", "heart disease"]
+    zones = ["BODY", None, "BODY", None, "BACK_MATTER"]
+    expected = [retriever._search(t, 2, "a_1", z, None) for t, z in zip(texts, zones)]
+
+    calls = {"n": 0}
+    search_many = retriever._search_many
+
+    def _counting_search_many(queries, *args):
+        calls["n"] += 1
+        assert len(queries) == 4  # repeated (text, zone) searched once
+        return search_many(queries, *args)
+
+    monkeypatch.setattr(retriever, "_search_many", _counting_search_many)
+
+    assert retriever.retrieve_examples_batch(texts, zones, k=2, doc_id="a_1") == expected
+    # Now served from the query cache, shared with retrieve_examples
+    assert retriever.retrieve_examples_batch(texts, zones, k=2, doc_id="a_1") == expected
+    assert retriever.retrieve_examples("heart blood", k=2, doc_id="a_1", zone="BODY") == expected[0]
+    assert calls["n"] == 1
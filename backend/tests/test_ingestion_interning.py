@@ -0,0 +1,27 @@
+import sys
+from pathlib import Path
+
+from docx import Document
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from processor.ingestion import extract_document
+
+
+def test_box_zone_strings_are_shared_across_paragraphs(tmp_path):
+    doc = Document()
+    doc.add_paragraph("Introduction")
+    doc.add_paragraph("<note>")
+    doc.add_paragraph("First line inside the box.")
+    doc.add_paragraph("Second line inside the box.")
+    path = tmp_path / "boxes.docx"
+    doc.save(path)
+
+    paragraphs, _ = extract_document(path)
+
+    box_paras = [p for p in paragraphs if p["metadata"]["context_zone"].startswith("BOX_")]
+    assert len(box_paras) >= 2
+    first, second = box_paras[0]["metadata"], box_paras[1]["metadata"]
+    assert first["context_zone"] is second["context_zone"]
+    assert first["style_name"] is second["style_name"]
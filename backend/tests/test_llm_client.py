@@ -0,0 +1,98 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from processor import llm_client
+
+
+def test_http_client_is_created_once_per_process(monkeypatch):
+    if llm_client._sdk_mode != "google-genai":
+        return
+    registered = []
+    monkeypatch.setattr(llm_client, "_http_client_instance", None)
+    monkeypatch.setattr(llm_client.atexit, "register", registered.append)
+
+    first = llm_client.get_http_client(5)
+    second = llm_client.get_http_client(30)
+
+    assert first is second
+    assert registered == [first.close]
+    first.close()
+
+
+def test_generate_content_sends_timeout_as_request_deadline():
+    if llm_client._sdk_mode != "google-genai":
+        return
+    sent = []
+
+    class DummyModels:
+        def generate_content(self, model, contents, config):
+            sent.append(config)
+            return type("Resp", (), {"usage_metadata": None})()
+
+    client = llm_client.GeminiClient.__new__(llm_client.GeminiClient)
+    client._sdk_mode = "google-genai"
+    client.client = type("DummyClient", (), {"models": DummyModels()})()
+    client.model_name = "m"
+    client.timeout = 120
+    client.max_retries = 1
+    client.generation_config = llm_client.types.GenerateContentConfig(temperature=0.1)
+    client._build_contents = lambda prompt: prompt
+    client._track_usage = lambda response: None
+
+    client.generate_content("p", timeout=7.5)
+
+    assert sent[0].http_options.timeout == 7500
+    assert sent[0].temperature == 0.1
+    assert client.generation_config.http_options is None
+
+
+def test_batch_falls_back_to_single_calls_without_batch_mode(monkeypatch):
+    import types as pytypes
+
+    # An early google-genai release: no JobState / InlinedRequest
+    monkeypatch.setattr(llm_client, "types", pytypes.SimpleNamespace())
+    client = llm_client.GeminiClient.__new__(llm_client.GeminiClient)
+    client._sdk_mode = "google-genai"
+    client.generate_content = lambda prompt: f"response to {prompt}"
+
+    assert client.generate_content_batch(["a", "b"]) == ["response to a", "response to b"]
+
+
+def test_attempt_duration_excludes_rate_limit_backoff(monkeypatch):
+    import types as pytypes
+
+    clock = {"now": 0.0}
+
+    def sleep(seconds):
+        clock["now"] += seconds
+
+    monkeypatch.setattr(llm_client, "time", pytypes.SimpleNamespace(
+        perf_counter=lambda: clock["now"], sleep=sleep,
+    ))
+    outcomes = [RuntimeError("429 RESOURCE_EXHAUSTED"), None]
+
+    def call(prompt, request_options=None):
+        clock["now"] += 3.0
+        error = outcomes.pop(0)
+        if error:
+            raise error
+        return "ok"
+
+    client = llm_client.GeminiClient.__new__(llm_client.GeminiClient)
+    client._sdk_mode = "legacy"
+    client.client = pytypes.SimpleNamespace(generate_content=call)
+    client.system_instruction = None
+    client.timeout = 120
+    client.max_retries = 2
+    client.retry_delay = 5
+    client._track_usage = lambda response: None
+
+    assert client.generate_content("p") == "ok"
+    assert clock["now"] > 16.0
+    assert llm_client.take_last_attempt_seconds() == pytest.approx(3.0)
+    assert llm_client.take_last_attempt_seconds() is None
@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from app.services.prediction_cache import PredictionCache
+
+
+def test_content_cache_hits_across_documents_and_instances(tmp_path):
+    cache = PredictionCache(cache_dir=tmp_path)
+    meta = {"context_zone": "BODY", "has_bullet": True, "list_position": "MID"}
+    cache.set_by_content("Copyright  2024 Publisher", {"tag": "PMI", "confidence": 96}, "BODY", meta)
+
+    # Fresh instance (new process) with whitespace/case differences
+    reopened = PredictionCache(cache_dir=tmp_path)
+    hit = reopened.get_by_content("copyright 2024 publisher", "BODY", meta)
+
+    assert hit == {"tag": "PMI", "confidence": 96}
+    assert reopened.get_stats()["content_hits"] == 1
+
+
+def test_content_cache_key_includes_zone_and_list_signature(tmp_path):
+    cache = PredictionCache(cache_dir=tmp_path)
+    cache.set_many_by_content([
+        (cache.text_hash("Item text"), {"tag": "BL-FIRST", "confidence": 90}, "BODY",
+         {"has_bullet": True, "list_position": "FIRST"}),
+    ])
+
+    assert cache.get_by_content("Item text", "BODY", {"has_bullet": True, "list_position": "MID"}) is None
+    assert cache.get_by_content("Item text", "TABLE", {"has_bullet": True, "list_position": "FIRST"}) is None
+    assert cache.get_by_content("Item text", "BODY", {"has_bullet": True, "list_position": "FIRST"})["tag"] == "BL-FIRST"
+
+
+def test_batched_lookups_return_one_result_per_key_in_order(tmp_path, monkeypatch):
+    import app.services.prediction_cache as cache_mod
+
+    monkeypatch.setattr(cache_mod, "CONTENT_QUERY_BATCH", 2)
+    cache = PredictionCache(cache_dir=tmp_path)
+    h = cache.text_hash
+    cache.set_many([
+        ("doc", 1, h("First"), {"id": 1, "tag": "H1", "confidence": 95}, "BODY"),
+        ("doc", 3, h("Third"), {"id": 3, "tag": "TXT", "confidence": 90}, "BODY"),
+    ])
+    cache.set_many_by_content([
+        (h("Shared line"), {"tag": "PMI", "confidence": 96}, "BODY", None),
+        (h("Other line"), {"tag": "TXT", "confidence": 80}, "BODY", None),
+    ])
+
+    hits = cache.get_many([("doc", 1, h("First"), "BODY"), ("doc", 2, h("Second"), "BODY"), ("doc", 3, h("Third"), "BODY")])
+    assert [hit and hit["tag"] for hit in hits] == ["H1", None, "TXT"]
+    assert cache.get("doc", 1, "first") == {"id": 1, "tag": "H1", "confidence": 95}
+
+    content = cache.get_many_by_content([
+        (h("Other line"), "BODY", None),
+        (h("Missing"), "BODY", None),
+        (h("Shared line"), "BODY", None),
+        (h("shared  line"), "BODY", None),
+    ])
+    assert [c and c["tag"] for c in content] == ["TXT", None, "PMI", "PMI"]
+    assert cache.get_stats()["content_hits"] == 3
+
+
+def test_text_hash_is_fixed_size_and_normalized(tmp_path):
+    cache = PredictionCache(cache_dir=tmp_path)
+    long_text = "A long paragraph " * 500
+
+    assert len(cache.text_hash(long_text)) == 16
+    assert cache.text_hash("Hello  <b>World</b>") == cache.text_hash("hello world")
+    assert cache.text_hash("hello world") != cache.text_hash("hello there")
@@ -10,7 +10,9 @@ sys.path.insert(0, str(ROOT))
 from backend.app.services.review_bundle import create_review_bundle
 
 
-def test_review_bundle_contents(tmp_path):
+def test_review_bundle_contents(tmp_path, monkeypatch):
+    # Bundles land under ./outputs; keep them out of the working tree
+    monkeypatch.chdir(tmp_path)
     input_path = tmp_path / "input.docx"
     output_path = tmp_path / "output.docx"
 
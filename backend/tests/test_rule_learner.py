@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from processor.rule_learner import RuleLearner
+
+
+def _rule(condition, tag):
+    return {"condition": condition, "predicted_tag": tag, "confidence": 0.9, "support": 10}
+
+
+def test_apply_rules_uses_first_matching_rule_in_priority_order():
+    learner = RuleLearner()
+    learner.rules = [
+        _rule("zone=TABLE", "T"),
+        _rule("has_bullet", "BL-MID"),
+        _rule("zone=BODY", "TXT"),
+    ]
+
+    assert learner.apply_rules("• item", {"context_zone": "TABLE"}) == "T"
+    assert learner.apply_rules("• item", {"context_zone": "BODY"}) == "BL-MID"
+    assert learner.apply_rules("Plain text", {"context_zone": "BODY"}) == "TXT"
+    assert learner.apply_rules("Plain text", {"context_zone": "BACK_MATTER"}) is None
+
+
+def test_rule_index_follows_rule_list_changes():
+    learner = RuleLearner()
+    learner.rules = [_rule("zone=BODY", "TXT")]
+    assert learner.apply_rules("Text", {}) == "TXT"
+
+    learner.rules = [_rule("zone=TABLE", "T")]
+    assert learner.apply_rules("Text", {}) is None
+
+    learner.rules.append(_rule("is_short", "H1"))
+    assert learner.apply_rules("Text", {}) == "H1"
+
+
+def test_apply_rules_with_rule_returns_matched_rule():
+    learner = RuleLearner()
+    heading_rule = _rule("zone=FRONT_MATTER", "CT")
+    learner.rules = [heading_rule]
+
+    assert learner.apply_rules_with_rule("Title", {"context_zone": "FRONT_MATTER"}) == ("CT", heading_rule)
+    assert learner.apply_rules_with_rule("Title", {"context_zone": "BODY"}) == (None, None)
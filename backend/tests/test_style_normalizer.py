@@ -48,3 +48,14 @@ def test_normalize_style_vendor_bx_txt_without_meta():
 
 def test_normalize_style_strip_illegal_list_suffix():
     assert normalize_style("BX4-TXT-LAST") == "BX4-TXT"
+
+
+def test_normalize_style_is_memoized_per_membership_mode():
+    from backend.app.services.style_normalizer import _normalize_style_cached, normalize_tag
+
+    hits = _normalize_style_cached.cache_info().hits
+    assert normalize_style("Unknown Source Style") == "Unknown Source Style"
+    assert normalize_style("Unknown Source Style", meta={"context_zone": "BODY"}) == "Unknown Source Style"
+    assert _normalize_style_cached.cache_info().hits == hits + 1
+    # Membership enforcement is cached separately
+    assert normalize_tag("Unknown Source Style") != "Unknown Source Style"
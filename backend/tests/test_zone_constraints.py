@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from processor.classifier import make_zone_validator, validate_style_for_zone
+
+
+def test_exact_and_wildcard_styles_per_zone():
+    assert validate_style_for_zone("PMI", "METADATA")
+    assert not validate_style_for_zone("TXT", "METADATA")
+    assert validate_style_for_zone("NBX-BL-MID", "BOX_NBX")
+    assert validate_style_for_zone("TXT", "BOX_NBX")
+    assert not validate_style_for_zone("BX1-TXT", "BOX_NBX")
+    assert validate_style_for_zone("REFH1", "FRONT_MATTER")
+
+
+def test_unconstrained_zones_allow_everything():
+    assert validate_style_for_zone("ANYTHING", "BODY")
+    assert validate_style_for_zone("ANYTHING", "UNKNOWN_ZONE")
+
+
+def test_zone_validator_matches_generic_check():
+    styles = ["PMI", "TXT", "NBX-BL-MID", "BX1-TXT", "REFH1", "T", "TFN", "REF-N"]
+    for zone in ["METADATA", "BOX_NBX", "FRONT_MATTER", "TABLE", "BACK_MATTER", "BODY", "UNKNOWN_ZONE"]:
+        is_valid = make_zone_validator(zone)
+        assert is_valid is make_zone_validator(zone)
+        for style in styles:
+            assert is_valid(style) == validate_style_for_zone(style, zone)